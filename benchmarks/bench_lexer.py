@@ -0,0 +1,164 @@
+"""
+Compare the single-pass instruction lexer against the original
+token-by-token tokenizer with its per-operand regex cascade.
+
+Usage:
+    python benchmarks/bench_lexer.py [listing.asm ...]
+
+Without arguments a synthetic objdump listing (no repeated lines,
+see synthetic.generate_asm) is used. The full
+stage-by-stage suite is benchmarks/run.py, which also reports this
+reference tokenizer ("tokenize_instruction.reference").
+"""
+import sys
+import time
+from pathlib import Path
+
+import synthetic
+
+from disasm2vec.tokenizer import core, normalizer
+from disasm2vec.tokenizer.normalizer import (
+    IMMEDIATE_PATTERN,
+    MEMORY_PATTERN,
+    REGISTER_PATTERN,
+    SYMBOL_PATTERN,
+)
+
+
+# Edge cases checked against the reference on every run.
+SYNTHETIC = [
+    "    1149:\tf3 0f 1e fa          \tendbr64 ",
+    "    114d:\t55                   \tpush   %rbp",
+    "    114e:\t48 89 e5             \tmov    %rsp,%rbp",
+    "    1151:\t48 83 ec 20          \tsub    $0x20,%rsp",
+    "    1155:\t89 7d ec             \tmov    %edi,-0x14(%rbp)",
+    "    1158:\t64 48 8b 04 25 28 00 \tmov    %fs:0x28,%rax",
+    "    115f:\t00 00 ",
+    "    1161:\t8b 45 ec             \tmov    -0x14(%rbp),%eax",
+    "    1164:\t01 c0                \tadd    %eax,%eax",
+    "    1166:\te8 de ff ff ff       \tcall   1149 <helper>",
+    "    116b:\t85 c0                \ttest   %eax,%eax",
+    "    116d:\t74 07                \tje     1176 <main+0x2d>",
+    "    116f:\t48 8d 05 8e 0e 00 00 \tlea    0xe8e(%rip),%rax        # 2004 <_IO_stdin_used+0x4>",
+    "    1176:\tb8 00 00 00 00       \tmov    $0x0,%eax",
+    "    117b:\t83 c0 05             \tadd    $5,%eax",
+    "    117e:\tc9                   \tleave  ",
+    "    117f:\tc3                   \tret    ",
+]
+
+
+def reference_normalize_operand(operand: str, keep_register: bool = False) -> str:
+    operand = SYMBOL_PATTERN.sub("", operand)
+
+    if MEMORY_PATTERN.search(operand):
+        return "MEM"
+
+    if IMMEDIATE_PATTERN.search(operand):
+        return "IMM"
+
+    m = REGISTER_PATTERN.search(operand)
+    if m:
+        return m.group(1).lower() if keep_register else "REG"
+
+    return operand
+
+
+def reference_tokenize_instruction(line: str, keep_register: bool = False):
+    """
+    The tokenizer as it was before the single-pass lexer.
+    """
+    line = line.split("#", 1)[0]
+
+    if ":" not in line:
+        return None
+
+    _, rest = line.split(":", 1)
+    tokens = rest.strip().split()
+
+    if not tokens:
+        return None
+
+    i = 0
+    while i < len(tokens) and core.BYTE_PATTERN.match(tokens[i]):
+        i += 1
+
+    if i >= len(tokens):
+        return None
+
+    mnemonic = tokens[i].lower()
+    if not core.MNEMONIC_PATTERN.match(mnemonic):
+        return None
+
+    operand_str = " ".join(tokens[i + 1 :]).strip()
+    result = [mnemonic]
+
+    if mnemonic == "call":
+        result.append("FUNC")
+        return result
+
+    if mnemonic.startswith("j"):
+        result.append("JMP")
+        return result
+
+    if operand_str:
+        for op in operand_str.split(","):
+            result.append(
+                reference_normalize_operand(op.strip(), keep_register)
+            )
+
+    return result
+
+
+def _lines(paths: list[str]) -> list[str]:
+    lines = list(SYNTHETIC)
+
+    if not paths:
+        # About 100k distinct lines; a repeated listing would mostly
+        # time memo hits.
+        for seed in range(40):
+            lines.extend(
+                synthetic.generate_asm(40, 4, 60, seed=seed).splitlines()
+            )
+        return lines
+
+    for path in paths:
+        lines.extend(Path(path).read_text().splitlines())
+    return lines
+
+
+def _time(func, lines: list[str], keep_register: bool) -> float:
+    start = time.perf_counter()
+    for line in lines:
+        func(line, keep_register)
+    return time.perf_counter() - start
+
+
+def _clear_caches():
+    core._lex_instruction_field.cache_clear()
+    normalizer.normalize_operand.cache_clear()
+
+
+def main(argv: list[str]):
+    lines = _lines(argv)
+
+    for keep_register in (False, True):
+        for line in lines:
+            expected = reference_tokenize_instruction(line, keep_register)
+            if core.tokenize_instruction(line, keep_register) != expected:
+                raise SystemExit(f"Output mismatch for {line!r}")
+
+        reference = _time(reference_tokenize_instruction, lines, keep_register)
+
+        _clear_caches()
+        cold = _time(core.tokenize_instruction, lines, keep_register)
+        warm = _time(core.tokenize_instruction, lines, keep_register)
+
+        print(
+            f"keep_register={keep_register!s:5} lines={len(lines)} "
+            f"reference={reference:.3f}s lexer(cold)={cold:.3f}s "
+            f"lexer(warm)={warm:.3f}s speedup={reference / cold:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,336 @@
+"""
+Benchmark every pipeline stage on a synthetic corpus.
+
+Usage:
+    python benchmarks/run.py [--scale small|medium|large]
+                             [--files N] [--functions N] [--depth N]
+                             [--instructions N] [--repeat N]
+                             [--toolchain] [--output results.json]
+                             [--compare baseline.json]
+
+The tokenizer and vectorizer benchmarks use generated objdump-style
+listings and need neither gcc nor objdump; --toolchain adds compile
+and disassemble benchmarks on generated C sources.
+
+Results are written as JSON (best of --repeat runs per benchmark)
+so runs of different versions can be compared with --compare.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import bench_lexer
+import synthetic
+
+import disasm2vec
+from disasm2vec.tokenizer import (
+    FunctionCache,
+    core,
+    normalizer,
+    tokenize,
+    tokenize_batch,
+)
+from disasm2vec.vectorizer import HashingTfidf, Tfidf, load_vectorizer
+
+
+def bench(func, repeat: int, setup=None) -> list[float]:
+    """
+    Run func ``repeat`` times (after setup, untimed) and return
+    the wall times.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def clear_caches():
+    core._lex_instruction_field.cache_clear()
+    normalizer.normalize_operand.cache_clear()
+
+
+def run_benchmarks(args, work: Path) -> dict:
+    asm_dir = work / "asm"
+    paths = synthetic.write_corpus(
+        asm_dir,
+        args.files,
+        args.functions,
+        args.depth,
+        args.instructions,
+    )
+
+    lines = []
+    for path in paths:
+        lines.extend(path.read_text().splitlines())
+
+    operands = []
+    for line in lines:
+        fields = line.split("\t")
+        if len(fields) < 3:
+            continue
+        _, _, args_field = fields[2].split("#")[0].partition(" ")
+        operands.extend(op.strip() for op in args_field.split(",") if op.strip())
+
+    results = {}
+
+    def record(name, times, items):
+        best = min(times)
+        results[name] = {
+            "seconds": best,
+            "runs": times,
+            "items": items,
+            "items_per_second": items / best if best else None,
+        }
+        rate = items / best if best else 0
+        print(f"{name:32} {best:9.4f}s  {rate:12.0f} items/s")
+
+    # TOKENIZER
+    record(
+        "tokenize_instruction.cold",
+        bench(
+            lambda: [core.tokenize_instruction(line) for line in lines],
+            args.repeat,
+            setup=clear_caches,
+        ),
+        len(lines),
+    )
+    record(
+        "tokenize_instruction.warm",
+        bench(
+            lambda: [core.tokenize_instruction(line) for line in lines],
+            args.repeat,
+        ),
+        len(lines),
+    )
+    record(
+        "tokenize_instruction.reference",
+        bench(
+            lambda: [
+                bench_lexer.reference_tokenize_instruction(line)
+                for line in lines
+            ],
+            args.repeat,
+        ),
+        len(lines),
+    )
+    record(
+        "normalize_operand.cold",
+        bench(
+            lambda: [normalizer.normalize_operand(op) for op in operands],
+            args.repeat,
+            setup=clear_caches,
+        ),
+        len(operands),
+    )
+    record(
+        "split_functions",
+        bench(
+            lambda: [core._split_functions(path) for path in paths],
+            args.repeat,
+        ),
+        len(paths),
+    )
+    record(
+        "tokenize",
+        bench(lambda: [tokenize(path) for path in paths], args.repeat),
+        len(paths),
+    )
+
+    workers = args.workers or os.cpu_count() or 1
+    for n in sorted({1, workers}):
+        record(
+            f"tokenize_batch.workers{n}",
+            bench(
+                lambda: tokenize_batch(str(asm_dir), workers=n),
+                args.repeat,
+                setup=clear_caches,
+            ),
+            len(paths),
+        )
+
+    # A fresh cache only pays off for functions shared between files;
+    # a warm one (e.g. loaded from disk) skips every known body.
+    record(
+        "tokenize_batch.fcache.cold",
+        bench(
+            lambda: tokenize_batch(
+                str(asm_dir), function_cache=FunctionCache()
+            ),
+            args.repeat,
+            setup=clear_caches,
+        ),
+        len(paths),
+    )
+    function_cache = FunctionCache()
+    tokenize_batch(str(asm_dir), function_cache=function_cache)
+    record(
+        "tokenize_batch.fcache.warm",
+        bench(
+            lambda: tokenize_batch(
+                str(asm_dir), function_cache=function_cache
+            ),
+            args.repeat,
+            setup=clear_caches,
+        ),
+        len(paths),
+    )
+
+    # VECTORIZER
+    documents = [tokenize(path) for path in paths]
+
+    record(
+        "tfidf.fit",
+        bench(lambda: Tfidf().fit(documents), args.repeat),
+        len(documents),
+    )
+    model = Tfidf().fit(documents)
+    record(
+        "tfidf.transform",
+        bench(lambda: model.transform(documents), args.repeat),
+        len(documents),
+    )
+    record(
+        "hashing.fit_transform",
+        bench(lambda: HashingTfidf().fit_transform(documents), args.repeat),
+        len(documents),
+    )
+
+    pickle_path = work / "model.pkl"
+    native_path = work / "model"
+    model.save(pickle_path)
+    model.save(native_path, format="native")
+
+    for name, path in (("pickle", pickle_path), ("native", native_path)):
+        record(
+            f"model_load.{name}",
+            bench(
+                lambda: load_vectorizer(str(path), cached=False),
+                args.repeat,
+            ),
+            1,
+        )
+
+    # TOOLCHAIN
+    if args.toolchain:
+        run_toolchain_benchmarks(args, work, record)
+
+    return results
+
+
+def run_toolchain_benchmarks(args, work: Path, record):
+    from disasm2vec.compiler import compile_folder
+    from disasm2vec.disassembler import disassemble_folder
+
+    if not (shutil.which("gcc") and shutil.which("objdump")):
+        print("gcc/objdump not found; skipping toolchain benchmarks")
+        return
+
+    src_dir = work / "src"
+    sources = synthetic.write_corpus(
+        src_dir,
+        args.files,
+        args.functions,
+        args.depth,
+        args.instructions,
+        kind="c",
+    )
+
+    bin_dir = work / "bin"
+    out_dir = work / "disasm"
+
+    record(
+        "compile_folder",
+        bench(
+            lambda: compile_folder(src_dir, bin_dir, jobs=args.workers),
+            args.repeat,
+        ),
+        len(sources),
+    )
+    record(
+        "disassemble_folder",
+        bench(
+            lambda: disassemble_folder(bin_dir, out_dir, jobs=args.workers),
+            args.repeat,
+        ),
+        len(sources),
+    )
+    record(
+        "disassemble_folder_batched",
+        bench(
+            lambda: disassemble_folder(
+                bin_dir, out_dir, jobs=args.workers, batch_size=32
+            ),
+            args.repeat,
+        ),
+        len(sources),
+    )
+
+
+def compare(results: dict, baseline_path: str):
+    baseline = json.loads(Path(baseline_path).read_text())["results"]
+
+    print(f"\n{'benchmark':32} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]["seconds"], result["seconds"]
+        print(f"{name:32} {old:10.4f} {new:10.4f} {new / old:7.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", choices=sorted(synthetic.SCALES), default="small")
+    parser.add_argument("--files", type=int)
+    parser.add_argument("--functions", type=int)
+    parser.add_argument("--depth", type=int)
+    parser.add_argument("--instructions", type=int)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--toolchain", action="store_true")
+    parser.add_argument("--output")
+    parser.add_argument("--compare")
+    args = parser.parse_args(argv)
+
+    for key, value in synthetic.SCALES[args.scale].items():
+        if getattr(args, key) is None:
+            setattr(args, key, value)
+
+    params = {
+        key: getattr(args, key)
+        for key in ("scale", "files", "functions", "depth",
+                    "instructions", "repeat", "workers", "toolchain")
+    }
+    print(json.dumps(params))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run_benchmarks(args, Path(tmp))
+
+    report = {
+        "disasm2vec": disasm2vec.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "params": params,
+        "results": results,
+    }
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
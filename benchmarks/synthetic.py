@@ -0,0 +1,182 @@
+"""
+Synthetic C sources and objdump-style listings for benchmarks.
+
+Every generated program has a ``main`` plus ``n_functions`` helpers
+arranged in ``depth`` call levels: main calls the first level, each
+helper calls a few helpers of the next level, and some bodies call
+libc through the PLT. Listings follow ``objdump -d`` column layout
+(address, raw bytes, instruction), so the tokenizer benchmarks need
+no compiler or objdump.
+"""
+import random
+from pathlib import Path
+
+
+SCALES = {
+    "small": {"files": 20, "functions": 10, "depth": 3, "instructions": 30},
+    "medium": {"files": 200, "functions": 40, "depth": 4, "instructions": 60},
+    "large": {"files": 1000, "functions": 80, "depth": 6, "instructions": 100},
+}
+
+_REGISTERS = ["eax", "ebx", "ecx", "edx", "esi", "edi", "rax", "rbx",
+              "rcx", "rdx", "rsi", "rdi", "r8", "r9", "r10d", "r12"]
+
+_TEMPLATES = [
+    "mov    %{r1},%{r2}",
+    "mov    -0x{off:x}(%rbp),%{r1}",
+    "mov    %{r1},-0x{off:x}(%rbp)",
+    "movl   $0x{imm:x},-0x{off:x}(%rbp)",
+    "add    $0x{imm:x},%{r1}",
+    "sub    $0x{imm:x},%rsp",
+    "imul   %{r1},%{r2}",
+    "xor    %{r1},%{r1}",
+    "cmp    $0x{imm:x},%{r1}",
+    "test   %{r1},%{r2}",
+    "lea    0x{off:x}(%rip),%{r1}        # {target:x} <table+0x{imm:x}>",
+    "lea    (%{r1},%{r2},4),%{r1}",
+    "movzbl 0x{imm:x}(%{r1}),%{r2}",
+    "je     {target:x} <{name}+0x{imm:x}>",
+    "jmp    {target:x} <{name}+0x{imm:x}>",
+    "cltq   ",
+    "nopl   0x0(%rax)",
+]
+
+_PLT = ["puts@plt", "printf@plt", "malloc@plt", "free@plt", "memcpy@plt"]
+
+
+def call_graph(n_functions: int, depth: int, rng: random.Random) -> dict:
+    """
+    Return {caller: [callees]} for main and f0..f{n-1}.
+    """
+    depth = max(1, min(depth, n_functions))
+    levels = [[] for _ in range(depth)]
+    for i in range(n_functions):
+        levels[i * depth // n_functions].append(f"f{i}")
+
+    graph = {"main": list(levels[0])}
+    for level, names in enumerate(levels):
+        below = levels[level + 1] if level + 1 < depth else []
+        for name in names:
+            graph[name] = rng.sample(below, min(len(below), 2))
+
+    return graph
+
+
+def generate_asm(
+    n_functions: int = 10,
+    depth: int = 3,
+    instructions: int = 30,
+    seed: int = 0,
+) -> str:
+    """
+    Build an objdump -d style listing.
+    """
+    rng = random.Random(seed)
+    graph = call_graph(n_functions, depth, rng)
+
+    names = ["_start"] + list(graph)
+    starts = {name: 0x1040 + 0x400 * i for i, name in enumerate(names)}
+
+    out = ["", "synthetic:     file format elf64-x86-64", "",
+           "", "Disassembly of section .text:"]
+
+    for name in names:
+        addr = starts[name]
+        out.append("")
+        out.append(f"{addr:016x} <{name}>:")
+
+        body = ["endbr64 ", "push   %rbp", "mov    %rsp,%rbp"]
+        for _ in range(instructions):
+            body.append(_random_instruction(rng, name, addr))
+            if rng.random() < 0.05:
+                body.append(f"call   {0x1020:x} <{rng.choice(_PLT)}>")
+
+        # Spread the calls over the body
+        for callee in graph.get(name, []):
+            at = rng.randrange(3, len(body) + 1)
+            body.insert(at, f"call   {starts[callee]:x} <{callee}>")
+
+        body += ["leave  ", "ret    "]
+
+        for insn in body:
+            size = rng.randint(1, 7)
+            raw = " ".join(f"{rng.randrange(256):02x}" for _ in range(size))
+            out.append(f"    {addr:x}:\t{raw:<21}\t{insn}")
+            addr += size
+
+    return "\n".join(out) + "\n"
+
+
+def generate_c(
+    n_functions: int = 10,
+    depth: int = 3,
+    instructions: int = 30,
+    seed: int = 0,
+) -> str:
+    """
+    Build a C program with the same call structure as generate_asm.
+    ``instructions`` is the number of statements per function.
+    """
+    rng = random.Random(seed)
+    graph = call_graph(n_functions, depth, rng)
+
+    out = ["#include <stdio.h>", ""]
+    out += [f"int f{i}(int x);" for i in range(n_functions)]
+
+    for i in range(n_functions):
+        name = f"f{i}"
+        out += ["", f"int {name}(int x) {{", "    int y = x;"]
+
+        for _ in range(instructions):
+            op = rng.choice(["+", "-", "*", "^"])
+            out.append(f"    y = y {op} {rng.randint(1, 97)};")
+            if rng.random() < 0.1:
+                out.append("    if (y & 1) { y >>= 1; }")
+
+        for callee in graph[name]:
+            out.append(f"    y += {callee}(y);")
+
+        out += ["    return y;", "}"]
+
+    out += ["", "int main(void) {", "    int r = 0;"]
+    out += [f"    r += {callee}(r);" for callee in graph["main"]]
+    out += ['    printf("%d\\n", r);', "    return 0;", "}", ""]
+
+    return "\n".join(out)
+
+
+def write_corpus(
+    out_dir: str,
+    files: int,
+    functions: int,
+    depth: int,
+    instructions: int,
+    kind: str = "asm",
+    seed: int = 0,
+) -> list[Path]:
+    """
+    Write ``files`` synthetic .asm (kind="asm") or .c (kind="c") files.
+    """
+    generate = generate_asm if kind == "asm" else generate_c
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for i in range(files):
+        path = out_dir / f"prog{i:05d}.{kind}"
+        path.write_text(generate(functions, depth, instructions, seed + i))
+        paths.append(path)
+
+    return paths
+
+
+def _random_instruction(rng: random.Random, name: str, addr: int) -> str:
+    r1, r2 = rng.sample(_REGISTERS, 2)
+    return rng.choice(_TEMPLATES).format(
+        r1=r1,
+        r2=r2,
+        off=rng.randrange(4, 0x80, 4),
+        imm=rng.randrange(0x100),
+        target=addr + rng.randrange(0x200),
+        name=name,
+    )
@@ -1,3 +1,18 @@
-from .gcc import compile_c, compile_cpp, compile_folder
+from .gcc import (
+    compile_c,
+    compile_cpp,
+    compile_folder,
+    preprocess_c,
+    preprocess_cpp,
+)
+from .report import CompileReport, CompileResult
 
-__all__ = ["compile_c", "compile_cpp", "compile_folder"]
+__all__ = [
+    "compile_c",
+    "compile_cpp",
+    "compile_folder",
+    "preprocess_c",
+    "preprocess_cpp",
+    "CompileReport",
+    "CompileResult",
+]
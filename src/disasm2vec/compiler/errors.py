@@ -1,3 +1,6 @@
 class CompilationError(Exception):
     """Raised when compilation fails."""
-    pass
+
+    def __init__(self, message: str, stderr: str = ""):
+        super().__init__(message)
+        self.stderr = stderr
@@ -1,36 +1,93 @@
+import os
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from .errors import CompilationError
+from .report import CompileReport, CompileResult
 
 def compile_c(
     source: str,
     output: str,
-    flags: list[str] | None = None
+    flags: list[str] | None = None,
+    link: bool = True,
 ):
     """
     Compile C source file using gcc.
+
+    With ``link=False`` only an object file is built (``-c``).
+
+    Returns compiler stderr (warnings).
     """
-    _compile(
+    return _compile(
         compiler="gcc",
         source=source,
         output=output,
         flags=flags,
+        link=link,
     )
 
 
 def compile_cpp(
     source: str,
     output: str,
-    flags: list[str] | None = None
+    flags: list[str] | None = None,
+    link: bool = True,
 ):
     """
     Compile C++ source file using g++.
+
+    With ``link=False`` only an object file is built (``-c``).
+
+    Returns compiler stderr (warnings).
     """
-    _compile(
+    return _compile(
         compiler="g++",
         source=source,
         output=output,
         flags=flags,
+        link=link,
+    )
+
+
+def preprocess_c(
+    source: str,
+    output: str,
+    flags: list[str] | None = None,
+):
+    """
+    Preprocess C source file using gcc -E.
+
+    The output (conventionally ``.i``) can be compiled like a source
+    file without running the preprocessor again.
+
+    Returns compiler stderr (warnings).
+    """
+    return _compile(
+        compiler="gcc",
+        source=source,
+        output=output,
+        flags=flags,
+        preprocess=True,
+    )
+
+
+def preprocess_cpp(
+    source: str,
+    output: str,
+    flags: list[str] | None = None,
+):
+    """
+    Preprocess C++ source file using g++ -E (conventionally to ``.ii``).
+
+    Returns compiler stderr (warnings).
+    """
+    return _compile(
+        compiler="g++",
+        source=source,
+        output=output,
+        flags=flags,
+        preprocess=True,
     )
 
 
@@ -39,6 +96,8 @@ def _compile(
     source: str,
     output: str,
     flags: list[str] | None = None,
+    link: bool = True,
+    preprocess: bool = False,
 ):
     source = Path(source)
     output = Path(output)
@@ -56,8 +115,13 @@ def _compile(
     if flags:
         cmd.extend(flags)
 
+    if preprocess:
+        cmd.append("-E")
+    elif not link:
+        cmd.append("-c")
+
     try:
-        subprocess.run(
+        result = subprocess.run(
             cmd,
             check=True,
             stdout=subprocess.PIPE,
@@ -66,18 +130,46 @@ def _compile(
         )
     except subprocess.CalledProcessError as e:
         raise CompilationError(
-            f"Compilation failed for {source}:\n{e.stderr}"
+            f"Compilation failed for {source}:\n{e.stderr}",
+            stderr=e.stderr,
         ) from e
 
+    return result.stderr
+
 
 def compile_folder(
     src_dir: str,
     out_dir: str,
     optimize: str = "-O0",
     extra_flags: list[str] | None = None,
-):
+    jobs: int | None = None,
+    keep_going: bool = False,
+) -> CompileReport:
     """
     Compile all .c and .cpp files in a folder (recursively).
+
+    Parameters
+    ----------
+    src_dir : str
+        Folder containing C/C++ sources
+    out_dir : str
+        Folder to store compiled binaries
+    optimize : str
+        Optimization flag passed to the compiler
+    extra_flags : list[str] | None
+        Additional compiler flags
+    jobs : int | None
+        Number of concurrent compiler processes
+        (defaults to the number of cores)
+    keep_going : bool
+        If True, compile every source and report failures, including
+        OS errors (compiler not found, unwritable output).
+        If False, stop at the first failure.
+
+    Returns
+    -------
+    CompileReport
+        Per-source status, stderr and wall time, in source order.
     """
     src_dir = Path(src_dir)
     out_dir = Path(out_dir)
@@ -90,17 +182,81 @@ def compile_folder(
     if not sources:
         raise ValueError(f"No C/C++ files found in {src_dir}")
 
-    for src in sources:
-        output = out_dir / src.stem
-        flags = [optimize, *extra_flags]
+    flags = [optimize, *extra_flags]
+    jobs = jobs or os.cpu_count() or 1
+
+    results: list[CompileResult | None] = [None] * len(sources)
+
+    if jobs == 1:
+        for i, src in enumerate(sources):
+            results[i] = _compile_source(
+                src, out_dir / src.stem, flags, keep_going
+            )
+
+            if not results[i].ok and not keep_going:
+                _raise_failure(results[i])
 
-        try:
-            if src.suffix == ".c":
-                compile_c(src, output, flags)
-            else:
-                compile_cpp(src, output, flags)
+        return CompileReport(results=results)
 
-        except CompilationError as e:
-            raise CompilationError(
-                f"Compilation failed for {src}:\n{e}"
-            ) from e
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(
+                _compile_source, src, out_dir / src.stem, flags, keep_going
+            ): i
+            for i, src in enumerate(sources)
+        }
+
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except BaseException:
+                executor.shutdown(cancel_futures=True)
+                raise
+            results[futures[future]] = result
+
+            if not result.ok and not keep_going:
+                executor.shutdown(cancel_futures=True)
+                _raise_failure(result)
+
+    return CompileReport(results=results)
+
+
+def _compile_source(
+    src: Path,
+    output: Path,
+    flags: list[str],
+    keep_going: bool = False,
+) -> CompileResult:
+    start = time.perf_counter()
+
+    try:
+        if src.suffix == ".c":
+            stderr = compile_c(src, output, flags)
+        else:
+            stderr = compile_cpp(src, output, flags)
+        ok = True
+
+    except CompilationError as e:
+        stderr = e.stderr
+        ok = False
+
+    except OSError as e:
+        if not keep_going:
+            raise
+        stderr = f"{type(e).__name__}: {e}"
+        ok = False
+
+    return CompileResult(
+        source=str(src),
+        output=str(output),
+        ok=ok,
+        stderr=stderr,
+        elapsed=time.perf_counter() - start,
+    )
+
+
+def _raise_failure(result: CompileResult):
+    raise CompilationError(
+        f"Compilation failed for {result.source}:\n{result.stderr}",
+        stderr=result.stderr,
+    )
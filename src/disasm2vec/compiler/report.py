@@ -0,0 +1,33 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class CompileResult:
+    """
+    Outcome of compiling a single source file.
+    """
+    source: str
+    output: str
+    ok: bool
+    stderr: str = ""
+    elapsed: float = 0.0
+
+
+@dataclass
+class CompileReport:
+    """
+    Per-source results of compile_folder, in source order.
+    """
+    results: list[CompileResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> list[CompileResult]:
+        return [r for r in self.results if r.ok]
+
+    @property
+    def failed(self) -> list[CompileResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def elapsed(self) -> float:
+        return sum(r.elapsed for r in self.results)
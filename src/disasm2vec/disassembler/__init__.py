@@ -1,6 +1,18 @@
-from .objdump import disassemble, disassemble_folder
+from .objdump import (
+    disassemble,
+    disassemble_folder,
+    disassemble_many,
+    disassemble_stream,
+    resolve_relocations,
+)
+from .report import DisassemblyReport, DisassemblyResult
 
 __all__ = [
     "disassemble",
     "disassemble_folder",
+    "disassemble_many",
+    "disassemble_stream",
+    "resolve_relocations",
+    "DisassemblyReport",
+    "DisassemblyResult",
 ]
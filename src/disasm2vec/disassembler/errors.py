@@ -1,2 +1,6 @@
 class DisassemblyError(RuntimeError):
     """Raised when objdump disassembly fails."""
+
+    def __init__(self, message: str, stderr: str = ""):
+        super().__init__(message)
+        self.stderr = stderr
@@ -1,6 +1,24 @@
+import os
+import re
 import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Iterable, Iterator
 from .errors import DisassemblyError
+from .report import DisassemblyReport, DisassemblyResult
+
+
+# "  3d: R_X86_64_PLT32\tadd-0x4" below an instruction in objdump -r output
+RELOCATION_LINE = re.compile(r"\s+[0-9a-fA-F]+: (R_\w+)\s+(\S+)")
+ADDEND = re.compile(r"[+-]0x[0-9a-fA-F]+$")
+# "<value> <flags> <section>\t<size> [.hidden] <name>" in objdump -t output
+SYMBOL_LINE = re.compile(
+    r"([0-9a-fA-F]+) .{7} (\S+)\t[0-9a-fA-F]+\s+(?:\.\w+\s+)?(\S+)$"
+)
+SECTION_LINE = re.compile(r"Disassembly of section (\S+):")
+FUNCTION_LINE = re.compile(r"([0-9a-fA-F]+) <(.+?)>:")
 
 
 def disassemble(
@@ -8,6 +26,7 @@ def disassemble(
     output: str,
     arch: str | None = None,
     full: bool = False,
+    relocatable: bool = False,
 ):
     """
     Disassemble a single binary using objdump.
@@ -23,6 +42,10 @@ def disassemble(
     full : bool
         If True, disassemble all functions.
         If False, exclude builtin / PLT functions.
+    relocatable : bool
+        If True, binary is an unlinked object file (``gcc -c``): all
+        code sections are disassembled and call targets are taken
+        from the relocations (see resolve_relocations).
     """
     binary = Path(binary)
     output = Path(output)
@@ -32,38 +55,164 @@ def disassemble(
 
     output.parent.mkdir(parents=True, exist_ok=True)
 
-    # Base command
-    cmd = ["objdump", "-d", "--section=.text", str(binary)]
+    asm = _run_objdump(binary, arch, relocatable)
 
-    if arch:
-        cmd.extend(["-m", arch])
+    if relocatable:
+        asm = "".join(resolve_relocations(asm.splitlines(keepends=True)))
 
-    try:
-        result = subprocess.run(
+    if not full:
+        asm = _filter_builtin_functions(asm)
+
+    output.write_text(asm)
+
+
+def disassemble_many(
+    binaries: Iterable[str],
+    arch: str | None = None,
+    full: bool = False,
+    relocatable: bool = False,
+) -> Iterator[tuple[Path, str]]:
+    """
+    Disassemble several binaries with a single objdump process.
+
+    objdump's combined output is split back per file on its
+    ``<file>:     file format`` headers, so each listing is the same
+    as what disassemble would write for that binary. Binaries that
+    objdump rejects are retried one at a time, so a failure is
+    reported for the right file.
+
+    Parameters
+    ----------
+    binaries : Iterable[str]
+        Paths to compiled binaries (no duplicates)
+    arch : str | None
+        Optional architecture (e.g. i386:x86-64)
+    full : bool
+        If True, disassemble all functions.
+        If False, exclude builtin / PLT functions.
+    relocatable : bool
+        If True, binaries are unlinked object files (see disassemble)
+
+    Yields
+    ------
+    tuple[Path, str]
+        (binary, listing) in input order.
+
+    Raises
+    ------
+    DisassemblyError
+        When a binary also fails on its own.
+    """
+    binaries = [Path(b) for b in binaries]
+
+    for binary in binaries:
+        if not binary.exists():
+            raise FileNotFoundError(binary)
+
+    listings, _ = _objdump_many(binaries, arch, relocatable)
+
+    for binary in binaries:
+        asm = listings.get(binary)
+
+        if asm is None:
+            asm = _run_objdump(binary, arch, relocatable)
+
+        if relocatable:
+            asm = "".join(resolve_relocations(asm.splitlines(keepends=True)))
+
+        if not full:
+            asm = _filter_builtin_functions(asm)
+
+        yield binary, asm
+
+
+def disassemble_stream(
+    binary: str,
+    arch: str | None = None,
+    full: bool = False,
+    relocatable: bool = False,
+) -> Iterator[str]:
+    """
+    Disassemble a single binary and yield the listing line by line.
+
+    objdump's stdout is read through a pipe, so the listing is never
+    held in memory as a whole or written to disk.
+
+    Parameters
+    ----------
+    binary : str
+        Path to compiled binary
+    arch : str | None
+        Optional architecture (e.g. i386:x86-64)
+    full : bool
+        If True, disassemble all functions.
+        If False, exclude builtin / PLT functions.
+    relocatable : bool
+        If True, binary is an unlinked object file (see disassemble)
+    """
+    binary = Path(binary)
+
+    if not binary.exists():
+        raise FileNotFoundError(binary)
+
+    return _stream_objdump(
+        _objdump_command(binary, arch, relocatable),
+        binary,
+        full,
+        relocatable,
+    )
+
+
+def _stream_objdump(
+    cmd: list[str],
+    binary: Path,
+    full: bool,
+    relocatable: bool = False,
+) -> Iterator[str]:
+    # stderr goes to a temporary file so a chatty objdump cannot block
+    # on a full pipe while we are still draining stdout.
+    with tempfile.TemporaryFile(mode="w+") as stderr:
+        proc = subprocess.Popen(
             cmd,
-            check=True,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stderr=stderr,
             text=True,
         )
-    except subprocess.CalledProcessError as e:
-        raise DisassemblyError(
-            f"objdump failed for {binary}:\n{e.stderr}"
-        ) from e
 
-    asm = result.stdout
+        try:
+            lines = proc.stdout
+            if relocatable:
+                lines = resolve_relocations(lines)
+            if not full:
+                lines = _filter_builtin_lines(lines)
 
-    if not full:
-        asm = _filter_builtin_functions(asm)
+            yield from lines
 
-    output.write_text(asm)
+            returncode = proc.wait()
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+
+        if returncode != 0:
+            stderr.seek(0)
+            message = stderr.read()
+            raise DisassemblyError(
+                f"objdump failed for {binary}:\n{message}",
+                stderr=message,
+            )
 
 
 def disassemble_folder(
     bin_dir: str,
     out_dir: str,
     full: bool = False,
-):
+    arch: str | None = None,
+    jobs: int | None = None,
+    keep_going: bool = False,
+    batch_size: int = 1,
+) -> DisassemblyReport:
     """
     Disassemble all binaries in a folder.
 
@@ -76,6 +225,24 @@ def disassemble_folder(
     full : bool
         If True, disassemble all functions.
         If False, exclude builtin / PLT functions.
+    arch : str | None
+        Optional architecture (e.g. i386:x86-64)
+    jobs : int | None
+        Number of concurrent objdump processes
+        (defaults to the number of cores)
+    keep_going : bool
+        If True, disassemble every binary and report failures,
+        including OS errors (objdump not found, unwritable output).
+        If False, stop at the first failure.
+    batch_size : int
+        Number of binaries passed to each objdump process (see
+        disassemble_many). Up to ``jobs`` batches run at once.
+
+    Returns
+    -------
+    DisassemblyReport
+        Per-binary status, stderr and wall time, in folder order.
+        Binaries of a batch share its wall time equally.
     """
     bin_dir = Path(bin_dir)
     out_dir = Path(out_dir)
@@ -86,42 +253,394 @@ def disassemble_folder(
     if not binaries:
         raise ValueError(f"No binaries found in {bin_dir}")
 
-    for binary in binaries:
-        asm_out = out_dir / f"{binary.name}.asm"
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    jobs = jobs or os.cpu_count() or 1
+
+    results: list[DisassemblyResult | None] = [None] * len(binaries)
+    batches = [
+        list(range(start, min(start + batch_size, len(binaries))))
+        for start in range(0, len(binaries), batch_size)
+    ]
+
+    def job(batch: list[int]) -> list[DisassemblyResult]:
+        outputs = [out_dir / f"{binaries[i].name}.asm" for i in batch]
+
+        if len(batch) == 1:
+            return [
+                _disassemble_binary(
+                    binaries[batch[0]],
+                    outputs[0],
+                    arch=arch,
+                    full=full,
+                    keep_going=keep_going,
+                )
+            ]
+
+        return _disassemble_batch(
+            [binaries[i] for i in batch],
+            outputs,
+            arch=arch,
+            full=full,
+            keep_going=keep_going,
+        )
+
+    if jobs == 1:
+        for batch in batches:
+            for i, result in zip(batch, job(batch)):
+                results[i] = result
+
+                if not result.ok and not keep_going:
+                    _raise_failure(result)
+
+        return DisassemblyReport(results=results)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(job, batch): batch for batch in batches}
+
+        for future in as_completed(futures):
+            try:
+                batch_results = future.result()
+            except BaseException:
+                executor.shutdown(cancel_futures=True)
+                raise
+
+            for i, result in zip(futures[future], batch_results):
+                results[i] = result
+
+                if not result.ok and not keep_going:
+                    executor.shutdown(cancel_futures=True)
+                    _raise_failure(result)
+
+    return DisassemblyReport(results=results)
+
+
+def _disassemble_binary(
+    binary: Path,
+    output: Path,
+    arch: str | None,
+    full: bool,
+    keep_going: bool = False,
+) -> DisassemblyResult:
+    start = time.perf_counter()
+
+    try:
+        disassemble(binary, output, arch=arch, full=full)
+        stderr = ""
+        ok = True
+
+    except DisassemblyError as e:
+        stderr = e.stderr
+        ok = False
+
+    except OSError as e:
+        if not keep_going:
+            raise
+        stderr = f"{type(e).__name__}: {e}"
+        ok = False
+
+    return DisassemblyResult(
+        binary=str(binary),
+        output=str(output),
+        ok=ok,
+        stderr=stderr,
+        elapsed=time.perf_counter() - start,
+    )
+
+
+def _disassemble_batch(
+    binaries: list[Path],
+    outputs: list[Path],
+    arch: str | None,
+    full: bool,
+    keep_going: bool = False,
+) -> list[DisassemblyResult]:
+    start = time.perf_counter()
+    try:
+        listings, _ = _objdump_many(binaries, arch)
+    except OSError:
+        # objdump did not start; the reruns below fail (or raise)
+        # one binary at a time.
+        listings = {}
+    share = (time.perf_counter() - start) / len(binaries)
+
+    results = []
+    for binary, output in zip(binaries, outputs):
+        asm = listings.get(binary)
+
+        if asm is None:
+            # Rerun alone to get this binary's own stderr.
+            results.append(
+                _disassemble_binary(
+                    binary, output, arch=arch, full=full, keep_going=keep_going
+                )
+            )
+            continue
+
+        start = time.perf_counter()
+        if not full:
+            asm = _filter_builtin_functions(asm)
 
         try:
-            disassemble(binary, asm_out, full=full)
-        except DisassemblyError as e:
-            raise DisassemblyError(
-                f"Disassembly failed for {binary}:\n{e}"
-            ) from e
+            output.write_text(asm)
+            stderr = ""
+            ok = True
+        except OSError as e:
+            if not keep_going:
+                raise
+            stderr = f"{type(e).__name__}: {e}"
+            ok = False
+
+        results.append(
+            DisassemblyResult(
+                binary=str(binary),
+                output=str(output),
+                ok=ok,
+                stderr=stderr,
+                elapsed=share + time.perf_counter() - start,
+            )
+        )
+
+    return results
+
+
+def _raise_failure(result: DisassemblyResult):
+    raise DisassemblyError(
+        f"Disassembly failed for {result.binary}:\n{result.stderr}",
+        stderr=result.stderr,
+    )
+
+
+def is_builtin_function(name: str) -> bool:
+    """
+    Check whether a symbol is a builtin / PLT / runtime function.
+    """
+    return (
+        name.endswith("@plt")
+        or name.startswith("_start")
+        or name.startswith("frame_dummy")
+        or name.startswith("register_tm_clones")
+        or name.startswith("deregister_tm_clones")
+        or name.startswith("__")
+    )
+
+
+def _objdump_command(
+    binary: Path,
+    arch: str | None,
+    relocatable: bool = False,
+) -> list[str]:
+    return _objdump_batch_command([binary], arch, relocatable)
+
+
+def _objdump_batch_command(
+    binaries: list[Path],
+    arch: str | None,
+    relocatable: bool = False,
+) -> list[str]:
+    if relocatable:
+        # Object files keep code in several sections (.text.startup,
+        # .text.<name> with -ffunction-sections, C++ COMDAT groups)
+        # that the linker would merge into .text.
+        cmd = ["objdump", "-drt", *map(str, binaries)]
+    else:
+        cmd = ["objdump", "-d", "--section=.text", *map(str, binaries)]
+
+    if arch:
+        cmd.extend(["-m", arch])
+
+    return cmd
+
+
+def _run_objdump(
+    binary: Path,
+    arch: str | None,
+    relocatable: bool = False,
+) -> str:
+    try:
+        result = subprocess.run(
+            _objdump_command(binary, arch, relocatable),
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise DisassemblyError(
+            f"objdump failed for {binary}:\n{e.stderr}",
+            stderr=e.stderr,
+        ) from e
+
+    return result.stdout
+
+
+def _objdump_many(
+    binaries: list[Path],
+    arch: str | None,
+    relocatable: bool = False,
+) -> tuple[dict[Path, str], str]:
+    """
+    Run one objdump over several binaries and split its output.
+
+    Returns the listing of every binary objdump printed, keyed by
+    path, and objdump's stderr. objdump keeps going past files it
+    cannot read, so a nonzero exit only means some are missing.
+    """
+    names = {str(binary): binary for binary in binaries}
+    if len(names) != len(binaries):
+        raise ValueError("Duplicate binaries in batch")
+
+    result = subprocess.run(
+        _objdump_batch_command(binaries, arch, relocatable),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+    return _split_listings(result.stdout, names), result.stderr
+
+
+def _split_listings(
+    stdout: str,
+    names: dict[str, Path],
+) -> dict[Path, str]:
+    """
+    Split multi-file objdump output on its per-file headers.
+
+    Each file's output starts with an empty line followed by
+    ``<file>:     file format <bfd target>``; that empty line belongs
+    to the file it introduces.
+    """
+    lines = stdout.splitlines(keepends=True)
+
+    starts = []
+    for i, line in enumerate(lines):
+        name, sep, _ = line.partition(":     file format ")
+        if sep and name in names and (i == 0 or not lines[i - 1].strip()):
+            starts.append((max(i - 1, 0), names[name]))
+
+    listings = {}
+    for (start, binary), (stop, _) in zip(starts, starts[1:] + [(len(lines), None)]):
+        listings[binary] = "".join(lines[start:stop])
+
+    return listings
 
 
 def _filter_builtin_functions(asm: str) -> str:
     """
     Remove builtin / PLT / runtime functions from objdump output.
     """
-    filtered_lines = []
+    return "\n".join(_filter_builtin_lines(asm.splitlines()))
+
 
+def _filter_builtin_lines(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Streaming variant of _filter_builtin_functions.
+    """
     skip = False
-    for line in asm.splitlines():
+    for line in lines:
         if "<" in line and ">" in line and line.strip().endswith(":"):
             name = line.split("<")[1].split(">")[0]
 
-            if (
-                name.endswith("@plt")
-                or name.startswith("_start")
-                or name.startswith("frame_dummy")
-                or name.startswith("register_tm_clones")
-                or name.startswith("deregister_tm_clones")
-                or name.startswith("__")
-            ):
+            if is_builtin_function(name):
                 skip = True
                 continue
             else:
                 skip = False
 
         if not skip:
-            filtered_lines.append(line)
+            yield line
+
+
+def resolve_relocations(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Rewrite ``objdump -drt`` output of an object file so that it reads
+    like the listing of a linked binary.
+
+    In an object file, a call to a function outside its own section
+    is unresolved: objdump shows the call's own next address
+    (``call 41 <main+0x13>``), and the relocation line below it names
+    the real target (``3d: R_X86_64_PLT32  add-0x4``). The instruction's
+    ``<...>`` target is replaced by the function at the relocation
+    symbol's address, giving ``call 41 <add>``. Going through the
+    symbol table maps aliases (C++ C1/C2 constructors) to the name
+    objdump prints in the function header; undefined symbols become
+    ``name@plt``, as in a linked binary.
+
+    Symbol table and relocation lines are dropped. Since call targets
+    may be defined further down, the listing is read as a whole
+    before anything is yielded.
+    """
+    symbols: dict[str, tuple[str, int]] = {}
+    functions: dict[tuple[str, int], str] = {}
+    listing = []
+
+    in_table = False
+    section = None
+
+    for line in lines:
+        if in_table:
+            symbol = SYMBOL_LINE.match(line.rstrip("\n"))
+            if symbol:
+                value, where, name = symbol.groups()
+                symbols[name] = (where, int(value, 16))
+                continue
+            in_table = False
+
+        if line.startswith("SYMBOL TABLE:"):
+            in_table = True
+            continue
+
+        header = SECTION_LINE.match(line)
+        if header:
+            section = header.group(1)
+
+        function = FUNCTION_LINE.match(line)
+        if function:
+            functions[(section, int(function.group(1), 16))] = function.group(2)
+
+        listing.append(line)
+
+    def target(kind: str, symbol: str) -> str:
+        name = ADDEND.sub("", symbol)
+        where = symbols.get(name)
+
+        if where in functions:
+            return functions[where]
+
+        if where and where[0] == "*UND*" and kind.endswith("PLT32"):
+            return f"{name}@plt"
+
+        return name
+
+    pending = None
+    resolved = False
+
+    for line in listing:
+        reloc = RELOCATION_LINE.match(line)
+
+        if reloc:
+            if pending is not None and not resolved:
+                pending = _retarget(pending, target(*reloc.groups()))
+                resolved = True
+            continue
+
+        if pending is not None:
+            yield pending
+
+        pending = line
+        resolved = False
+
+    if pending is not None:
+        yield pending
+
+
+def _retarget(line: str, symbol: str) -> str:
+    start = line.rfind("<")
+    end = line.find(">", start)
+
+    if start < 0 or end < 0:
+        return line
 
-    return "\n".join(filtered_lines)
+    return f"{line[:start + 1]}{symbol}{line[end:]}"
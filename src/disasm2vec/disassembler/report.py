@@ -0,0 +1,33 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class DisassemblyResult:
+    """
+    Outcome of disassembling a single binary.
+    """
+    binary: str
+    output: str
+    ok: bool
+    stderr: str = ""
+    elapsed: float = 0.0
+
+
+@dataclass
+class DisassemblyReport:
+    """
+    Per-binary results of disassemble_folder, in folder order.
+    """
+    results: list[DisassemblyResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> list[DisassemblyResult]:
+        return [r for r in self.results if r.ok]
+
+    @property
+    def failed(self) -> list[DisassemblyResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def elapsed(self) -> float:
+        return sum(r.elapsed for r in self.results)
@@ -0,0 +1,7 @@
+from .exact import SimilarityIndex
+from .lsh import LSHIndex
+
+__all__ = [
+    "SimilarityIndex",
+    "LSHIndex",
+]
@@ -0,0 +1,256 @@
+import json
+from pathlib import Path
+from typing import Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+
+FORMAT_NAME = "disasm2vec-index"
+FORMAT_VERSION = 1
+
+# Upper bound on the dense (queries x rows) score block computed at once.
+_MAX_BLOCK = 1 << 24
+
+Match = Tuple[str, float]
+
+
+class SimilarityIndex:
+    """
+    Exact cosine-similarity index over sparse vectors.
+
+    Vectors are stored L2-normalized (as produced by Tfidf with its
+    default norm="l2"; others are normalized on add), so cosine
+    similarity is a sparse dot product. Every row has a unique name,
+    e.g. the source or binary it was built from.
+
+    remove() only marks rows as deleted; their storage is reclaimed
+    by compact() (called on save).
+    """
+
+    kind = "exact"
+
+    def __init__(self, n_features: int | None = None):
+        self.n_features = n_features
+
+        self._chunks: List[sparse.csr_matrix] = []
+        self._matrix: sparse.csr_matrix | None = None
+        self._names: List[str | None] = []
+        self._rows: dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+
+    # ADD / REMOVE
+    def add(self, names: Sequence[str], X):
+        """
+        Add one row of X per name.
+        """
+        names = list(names)
+        X = sparse.csr_matrix(X, dtype=np.float64)
+
+        if X.shape[0] != len(names):
+            raise ValueError(
+                f"Got {len(names)} names for {X.shape[0]} vectors"
+            )
+
+        if self.n_features is None:
+            self.n_features = X.shape[1]
+        elif X.shape[1] != self.n_features:
+            raise ValueError(
+                f"Expected {self.n_features} features, got {X.shape[1]}"
+            )
+
+        seen = set()
+        for name in names:
+            if name in self._rows or name in seen:
+                raise ValueError(f"Duplicate name in index: {name}")
+            seen.add(name)
+
+        self._insert(names, normalize(X, norm="l2", copy=False))
+
+    def remove(self, names: Union[str, Iterable[str]]):
+        if isinstance(names, str):
+            names = [names]
+
+        for name in names:
+            row = self._rows.pop(name)
+            self._names[row] = None
+            self._alive[row] = False
+
+    def compact(self):
+        """
+        Drop removed rows from storage, renumbering the rest.
+        """
+        if self._alive.all():
+            return
+
+        keep = np.flatnonzero(self._alive)
+        matrix = self._stacked()[keep]
+        names = [self._names[i] for i in keep]
+
+        self._reset()
+        self._insert(names, matrix)
+
+    # QUERY
+    def query(self, X, k: int = 10) -> List[List[Match]]:
+        """
+        Return the top-k (name, cosine similarity) matches for every
+        row of X, best first.
+        """
+        Q = self._prepare_queries(X)
+
+        if not self._rows:
+            return [[] for _ in range(Q.shape[0])]
+
+        return self._search(Q, k)
+
+    def query_one(self, x, k: int = 10) -> List[Match]:
+        return self.query(x, k)[0]
+
+    def vector(self, name: str) -> sparse.csr_matrix:
+        return self._stacked()[self._rows[name]]
+
+    def names(self) -> List[str]:
+        return [name for name in self._names if name is not None]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._rows
+
+    # SAVE / LOAD
+    def save(self, path: Union[str, Path]):
+        """
+        Write the index to a directory (meta.json, names.json and
+        vectors.npz).
+        """
+        self.compact()
+
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        meta = {
+            "format": FORMAT_NAME,
+            "format_version": FORMAT_VERSION,
+            "kind": self.kind,
+            "n_features": self.n_features,
+            "params": self._params(),
+        }
+
+        sparse.save_npz(path / "vectors.npz", self._stacked())
+        (path / "names.json").write_text(json.dumps(self._names))
+        (path / "meta.json").write_text(json.dumps(meta, indent=2))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "SimilarityIndex":
+        """
+        Load an index written by save(), returning the class it was
+        saved from.
+        """
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+
+        if meta.get("format") != FORMAT_NAME:
+            raise ValueError(f"Not a disasm2vec index: {path}")
+
+        kinds = {sub.kind: sub for sub in _index_classes()}
+        index_cls = kinds.get(meta["kind"])
+        if index_cls is None:
+            raise ValueError(f"Unknown index kind: {meta['kind']}")
+
+        index = index_cls(n_features=meta["n_features"], **meta["params"])
+
+        names = json.loads((path / "names.json").read_text())
+        vectors = sparse.load_npz(path / "vectors.npz").tocsr()
+        index._insert(names, vectors)
+
+        return index
+
+    # INTERNAL
+    def _params(self) -> dict:
+        return {}
+
+    def _insert(self, names: List[str], X: sparse.csr_matrix):
+        """
+        Append already-normalized rows.
+        """
+        if not names:
+            return
+
+        start = len(self._names)
+
+        self._chunks.append(X)
+        self._matrix = None
+        self._names.extend(names)
+        self._rows.update((name, start + i) for i, name in enumerate(names))
+        self._alive = np.concatenate([self._alive, np.ones(len(names), bool)])
+
+        self._on_add(start, X)
+
+    def _on_add(self, start: int, X: sparse.csr_matrix):
+        pass
+
+    def _reset(self):
+        self._chunks = []
+        self._matrix = None
+        self._names = []
+        self._rows = {}
+        self._alive = np.zeros(0, dtype=bool)
+
+    def _stacked(self) -> sparse.csr_matrix:
+        if self._matrix is None:
+            if self._chunks:
+                self._matrix = sparse.vstack(self._chunks, format="csr")
+            else:
+                self._matrix = sparse.csr_matrix((0, self.n_features or 0))
+            self._chunks = [self._matrix]
+
+        return self._matrix
+
+    def _prepare_queries(self, X) -> sparse.csr_matrix:
+        Q = sparse.csr_matrix(X, dtype=np.float64)
+
+        if self.n_features is not None and Q.shape[1] != self.n_features:
+            raise ValueError(
+                f"Expected {self.n_features} features, got {Q.shape[1]}"
+            )
+
+        return normalize(Q, norm="l2")
+
+    def _search(self, Q: sparse.csr_matrix, k: int) -> List[List[Match]]:
+        M = self._stacked()
+        MT = M.T.tocsc()
+
+        block = max(1, _MAX_BLOCK // M.shape[0])
+        results = []
+
+        for start in range(0, Q.shape[0], block):
+            scores = (Q[start:start + block] @ MT).toarray()
+            scores[:, ~self._alive] = -np.inf
+
+            for row in scores:
+                results.append(self._top_k(row, np.arange(len(row)), k))
+
+        return results
+
+    def _top_k(
+        self,
+        scores: np.ndarray,
+        rows: np.ndarray,
+        k: int,
+    ) -> List[Match]:
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        return [(self._names[rows[i]], float(scores[i])) for i in top]
+
+
+def _index_classes():
+    from .lsh import LSHIndex
+
+    return (SimilarityIndex, LSHIndex)
@@ -0,0 +1,102 @@
+from collections import defaultdict
+from typing import List
+
+import numpy as np
+from scipy import sparse
+from sklearn.random_projection import SparseRandomProjection
+
+from .exact import Match, SimilarityIndex
+
+
+class LSHIndex(SimilarityIndex):
+    """
+    Approximate cosine-similarity index using random-projection LSH
+    (SimHash).
+
+    Every vector gets ``n_tables`` hash codes of ``n_bits`` bits, one
+    bit per sign of a sparse random projection. A query is compared
+    exactly against the rows sharing at least one code with it, so
+    its cost depends on bucket sizes instead of the index size.
+    More bits give smaller buckets (faster, lower recall); more
+    tables raise recall.
+
+    The projection is seeded, so a saved index rebuilds the same
+    buckets on load.
+    """
+
+    kind = "lsh"
+
+    def __init__(
+        self,
+        n_features: int | None = None,
+        n_tables: int = 8,
+        n_bits: int = 16,
+        density: float | str = "auto",
+        seed: int = 0,
+    ):
+        if not 1 <= n_bits <= 62:
+            raise ValueError("n_bits must be between 1 and 62")
+
+        super().__init__(n_features)
+
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.density = density
+        self.seed = seed
+
+        self._projection: sparse.csr_matrix | None = None
+        self._buckets = [defaultdict(list) for _ in range(n_tables)]
+
+    # INTERNAL
+    def _params(self) -> dict:
+        return {
+            "n_tables": self.n_tables,
+            "n_bits": self.n_bits,
+            "density": self.density,
+            "seed": self.seed,
+        }
+
+    def _reset(self):
+        super()._reset()
+        self._buckets = [defaultdict(list) for _ in range(self.n_tables)]
+
+    def _on_add(self, start: int, X: sparse.csr_matrix):
+        for i, codes in enumerate(self._codes(X)):
+            for table, code in zip(self._buckets, codes):
+                table[code].append(start + i)
+
+    def _codes(self, X: sparse.csr_matrix) -> np.ndarray:
+        """
+        Return an (n_rows, n_tables) array of integer hash codes.
+        """
+        if self._projection is None:
+            projection = SparseRandomProjection(
+                n_components=self.n_tables * self.n_bits,
+                density=self.density,
+                random_state=self.seed,
+            )
+            projection.fit(sparse.csr_matrix((1, self.n_features)))
+            self._projection = sparse.csr_matrix(projection.components_.T)
+
+        bits = (X @ self._projection).toarray() > 0
+        bits = bits.reshape(X.shape[0], self.n_tables, self.n_bits)
+
+        weights = np.left_shift(1, np.arange(self.n_bits, dtype=np.int64))
+        return bits.astype(np.int64) @ weights
+
+    def _search(self, Q: sparse.csr_matrix, k: int) -> List[List[Match]]:
+        M = self._stacked()
+        results = []
+
+        for q, codes in zip(Q, self._codes(Q)):
+            candidates = set()
+            for table, code in zip(self._buckets, codes):
+                candidates.update(table.get(code, ()))
+
+            rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            rows = np.sort(rows[self._alive[rows]])
+
+            scores = (M[rows] @ q.T).toarray().ravel()
+            results.append(self._top_k(scores, rows, k))
+
+        return results
@@ -1,7 +1,24 @@
 from .config import PipelineConfig
 from .runner import run_pipeline
+from .batch import BatchResult, run_pipeline_batch
+from .cache import BuildCache, CacheStats, get_build_cache
+from .metrics import PipelineMetrics, StageTiming
+from .corpus import CorpusManifest, CorpusReport, run_corpus
+from .matrix import MatrixResult, run_build_matrix
 
 __all__ = [
     "run_pipeline",
+    "run_pipeline_batch",
+    "BatchResult",
+    "BuildCache",
+    "CacheStats",
+    "get_build_cache",
+    "PipelineMetrics",
+    "StageTiming",
+    "run_corpus",
+    "CorpusManifest",
+    "CorpusReport",
+    "run_build_matrix",
+    "MatrixResult",
     "PipelineConfig"
 ]
@@ -0,0 +1,219 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import partial
+from pathlib import Path
+from typing import Any, Iterable
+
+from disasm2vec.vectorizer import (
+    VectorizerBase,
+    load_vectorizer,
+    unique_documents,
+)
+
+from . import runner
+from .cache import CacheStats, get_build_cache
+from .config import PipelineConfig
+
+
+@dataclass
+class BatchResult:
+    """
+    Output of run_pipeline_batch.
+
+    Rows of ``X`` follow the order of ``sources``; files that failed
+    are left out of ``X`` and reported in ``errors`` instead.
+    ``duplicates`` counts documents identical to an earlier one,
+    which were not vectorized again.
+    """
+    X: Any
+    vectorizer: VectorizerBase
+    sources: list[str] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)
+    cache_stats: CacheStats | None = None
+    duplicates: int = 0
+
+
+def run_pipeline_batch(
+    sources: str | Iterable[str],
+    config: PipelineConfig,
+    workers: int | None = None,
+    chunksize: int = 1,
+) -> BatchResult:
+    """
+    Run pipeline for many source files.
+
+    Compile, disassemble and tokenize run in a process pool, then the
+    model is loaded once and the whole batch is vectorized with a
+    single transform call. Sources that produce identical token
+    documents are vectorized once.
+
+    With ``config.function_cache`` function bodies are tokenized once
+    across the batch; the cache is saved under ``cache_dir`` if set.
+
+    Parameters
+    ----------
+    sources : str | Iterable[str]
+        Folder searched recursively for .c/.cpp files, or an explicit
+        list of source files
+    config : PipelineConfig
+        Shared configuration; ``source_file`` is replaced per source
+    workers : int | None
+        Number of worker processes (defaults to the number of cores).
+        With 1 the stages run in the calling process.
+    chunksize : int
+        Number of sources handed to a worker at a time
+    """
+    if not config.model_path:
+        raise ValueError("model_path is required for pipeline")
+
+    sources = _collect_sources(sources)
+    configs = [replace(config, source_file=src) for src in sources]
+
+    workers = workers or os.cpu_count() or 1
+    outcomes = _build_all(configs, workers, chunksize)
+
+    result_sources = []
+    documents = []
+    errors = {}
+    cache_stats = CacheStats() if config.cache_dir else None
+
+    for src, (tokens, error, stats) in zip(sources, outcomes):
+        if stats is not None:
+            cache_stats.merge(stats)
+
+        if error is not None:
+            errors[src] = error
+            continue
+
+        result_sources.append(src)
+        documents.append(tokens)
+
+    # VECTORIZE
+    vectorizer = load_vectorizer(config.model_path, cached=True)
+
+    X, duplicates = _transform_unique(vectorizer, documents)
+
+    if cache_stats is not None and workers > 1:
+        _merge_cache_stats(config, cache_stats)
+
+    return BatchResult(
+        X=X,
+        vectorizer=vectorizer,
+        sources=result_sources,
+        errors=errors,
+        cache_stats=cache_stats,
+        duplicates=duplicates,
+    )
+
+
+def _collect_sources(sources: str | Iterable[str]) -> list[str]:
+    if isinstance(sources, (str, Path)):
+        src_dir = Path(sources)
+
+        if not src_dir.is_dir():
+            raise NotADirectoryError(src_dir)
+
+        paths = sorted(
+            list(src_dir.rglob("*.c")) + list(src_dir.rglob("*.cpp"))
+        )
+        sources = [str(p) for p in paths]
+    else:
+        sources = [str(s) for s in sources]
+
+    if not sources:
+        raise ValueError("No C/C++ source files to process")
+
+    # Intermediate files are named after the source stem, so two sources
+    # sharing a stem would overwrite each other's binary and .asm.
+    seen = {}
+    for src in sources:
+        stem = Path(src).stem
+        if stem in seen:
+            raise ValueError(
+                f"Duplicate source stem '{stem}': {seen[stem]} and {src}"
+            )
+        seen[stem] = src
+
+    return sources
+
+
+def _build_all(
+    configs: list[PipelineConfig],
+    workers: int,
+    chunksize: int = 1,
+) -> list[tuple]:
+    """
+    Run build_tokens for every config, in a process pool unless
+    workers is 1. Returns (tokens, error, cache stats) per config.
+
+    Function bodies tokenized by the workers are merged into this
+    process's function cache, which is then saved.
+    """
+    if workers == 1:
+        outcomes = list(map(_build_tokens_worker, configs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(
+                    _build_tokens_pool_worker,
+                    configs,
+                    chunksize=chunksize,
+                )
+            )
+
+        outcomes = []
+        for config, (outcome, delta) in zip(configs, results):
+            runner._merge_function_cache(config, delta)
+            outcomes.append(outcome)
+
+    if configs:
+        runner._save_function_cache(configs[0])
+
+    return outcomes
+
+
+def _transform_unique(vectorizer: VectorizerBase, documents: list) -> tuple:
+    """
+    Vectorize documents, transforming exact duplicates only once.
+    Returns X (one row per document) and the number of duplicates.
+    """
+    unique, inverse = unique_documents(documents)
+    duplicates = len(documents) - len(unique)
+
+    if not duplicates:
+        return vectorizer.transform(documents), 0
+
+    return vectorizer.transform(unique)[inverse], duplicates
+
+
+def _merge_cache_stats(config: PipelineConfig, stats: CacheStats):
+    # Workers have their own cache instances; fold their counters
+    # into this process's cache so its stats() cover the batch.
+    cache = get_build_cache(config.cache_dir, config.cache_max_bytes)
+    cache.merge_stats(stats)
+
+
+def _safe_build_tokens(config: PipelineConfig):
+    try:
+        return runner.build_tokens(config), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _build_tokens_worker(config: PipelineConfig):
+    if not config.cache_dir:
+        return _safe_build_tokens(config) + (None,)
+
+    cache = get_build_cache(config.cache_dir, config.cache_max_bytes)
+    before = cache.stats()
+    tokens, error = _safe_build_tokens(config)
+
+    return tokens, error, cache.stats().delta(before)
+
+
+def _build_tokens_pool_worker(config: PipelineConfig):
+    return runner._with_function_cache_delta(
+        config,
+        partial(_build_tokens_worker, config),
+    )
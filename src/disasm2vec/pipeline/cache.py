@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from pathlib import Path
+
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    def merge(self, other: "CacheStats"):
+        self.hits += other.hits
+        self.misses += other.misses
+        self.stores += other.stores
+        self.evictions += other.evictions
+
+    def delta(self, before: "CacheStats") -> "CacheStats":
+        return CacheStats(
+            hits=self.hits - before.hits,
+            misses=self.misses - before.misses,
+            stores=self.stores - before.stores,
+            evictions=self.evictions - before.evictions,
+        )
+
+
+class BuildCache:
+    """
+    Content-addressed on-disk cache of disassembly listings.
+
+    Entries are keyed by a hash of the source bytes and every setting
+    that influences the compile and disassemble stages. The cache is
+    bounded to ``max_bytes``; least recently used entries (by mtime,
+    refreshed on every hit) are evicted first.
+
+    Note that only the source file itself is hashed, not the headers
+    it includes.
+    """
+
+    SUFFIX = ".asm"
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        self._stats = CacheStats()
+        self._size = None
+
+    # KEY
+    def key(
+        self,
+        source: str,
+        compiler: str,
+        optimize: str,
+        extra_flags: list[str] | None = None,
+        arch: str | None = None,
+        full: bool = False,
+        frontend: str = "link",
+    ) -> str:
+        """
+        Build the cache key for a source file and its build settings.
+        """
+        digest = hashlib.sha256(Path(source).read_bytes()).hexdigest()
+
+        payload = json.dumps(
+            {
+                "source": digest,
+                "compiler": compiler,
+                "compiler_version": _compiler_version(compiler),
+                "optimize": optimize,
+                "extra_flags": list(extra_flags or []),
+                "arch": arch,
+                "full": full,
+                "frontend": frontend,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    # LOOKUP
+    def get(self, key: str) -> Path | None:
+        """
+        Return the cached listing for key, or None on a miss.
+        """
+        path = self._entry_path(key)
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self._stats.misses += 1
+            return None
+
+        self._stats.hits += 1
+        return path
+
+    def put(self, key: str, asm_path: str) -> Path:
+        """
+        Store a listing under key and evict old entries if needed.
+        """
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(asm_path, tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        self._stats.stores += 1
+
+        if self._size is None:
+            self._size = self._scan_size()
+        else:
+            self._size += path.stat().st_size
+
+        if self._size > self.max_bytes:
+            self._evict()
+
+        return path
+
+    # STATS
+    def stats(self) -> CacheStats:
+        return replace(self._stats)
+
+    def merge_stats(self, stats: CacheStats):
+        self._stats.merge(stats)
+
+    def reset_stats(self):
+        self._stats = CacheStats()
+
+    def size(self) -> int:
+        self._size = self._scan_size()
+        return self._size
+
+    def clear(self):
+        for path in self._entries():
+            path.unlink(missing_ok=True)
+        self._size = 0
+
+    # INTERNAL
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{self.SUFFIX}"
+
+    def _entries(self) -> list[Path]:
+        return list(self.root.glob(f"*/*{self.SUFFIX}"))
+
+    def _scan_size(self) -> int:
+        total = 0
+        for path in self._entries():
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def _evict(self):
+        entries = []
+        for path in self._entries():
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+
+            path.unlink(missing_ok=True)
+            total -= size
+            self._stats.evictions += 1
+
+        self._size = total
+
+
+_CACHES: dict[str, BuildCache] = {}
+
+
+def get_build_cache(
+    root: str,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> BuildCache:
+    """
+    Return the process-wide BuildCache for a cache directory.
+    """
+    resolved = str(Path(root).resolve())
+
+    cache = _CACHES.get(resolved)
+    if cache is None:
+        cache = BuildCache(resolved, max_bytes=max_bytes)
+        _CACHES[resolved] = cache
+    else:
+        cache.max_bytes = max_bytes
+
+    return cache
+
+
+@lru_cache(maxsize=None)
+def _compiler_version(compiler: str) -> str:
+    try:
+        result = subprocess.run(
+            [compiler, "--version"],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+    return result.stdout.splitlines()[0] if result.stdout else "unknown"
@@ -12,14 +12,26 @@ class PipelineConfig:
     # compiler
     optimize: str = "-O0"
     extra_flags: Optional[list[str]] = None
+    # "link": build an executable and disassemble it
+    # "object": compile with -c and disassemble the object file
+    #           (no linker, sources need no main)
+    frontend: str = "link"
+    # tag appended to output names (<stem>.<variant>), so builds of
+    # one source with different flags do not overwrite each other
+    variant: Optional[str] = None
 
     # disassembler
     arch: Optional[str] = None
     full_disasm: bool = False
+    # pipe objdump output straight into the tokenizer, no .asm file
+    stream_asm: bool = False
 
     # tokenizer
     entry: str = "main"
     keep_register: bool = False
+    # reuse tokenized function bodies across binaries; kept in
+    # cache_dir/functions.json when cache_dir is set
+    function_cache: bool = False
 
     # vectorizer
     model_path: Optional[str] = None
@@ -27,6 +39,10 @@ class PipelineConfig:
     ngram_range: Tuple[int, int] = (1, 2)
     min_df: int = 1
 
+    # build cache
+    cache_dir: Optional[str] = None
+    cache_max_bytes: int = 1 << 30
+
     # switches
     do_compile: bool = True
     do_disassemble: bool = True
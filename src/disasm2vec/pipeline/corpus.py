@@ -0,0 +1,409 @@
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from functools import partial
+from pathlib import Path
+from typing import Iterable
+
+from disasm2vec.store import VectorStore, hash_model
+from disasm2vec.vectorizer import load_vectorizer
+
+from . import runner
+from .batch import _collect_sources
+from .cache import _compiler_version
+from .config import PipelineConfig
+
+
+STAGES = ("compiled", "disassembled", "tokenized", "vectorized")
+
+MANIFEST_FORMAT = "disasm2vec-corpus"
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class CorpusReport:
+    """
+    Output of run_corpus.
+
+    ``ran`` counts how many sources went through each stage in this
+    run; sources whose every stage was already up to date are counted
+    in ``skipped``. ``duplicates`` counts documents in this run that
+    reused the stored vector of an identical document instead of
+    being transformed.
+    """
+    store: VectorStore
+    manifest: "CorpusManifest"
+    sources: list[str] = field(default_factory=list)
+    ran: dict[str, int] = field(default_factory=dict)
+    skipped: int = 0
+    errors: dict[str, str] = field(default_factory=dict)
+    duplicates: int = 0
+
+    def vectors(self):
+        """
+        Return the current vectors of all finished sources as
+        (sources, X), X in the same order as sources.
+        """
+        entries = self.manifest.entries
+        done = [
+            src for src in self.sources
+            if entries[src].get("stage") == "vectorized"
+        ]
+
+        return done, self.store.get([entries[src]["vector"] for src in done])
+
+
+class CorpusManifest:
+    """
+    Per-source record of finished stages, kept in manifest.json.
+
+    Every entry stores, per stage, a fingerprint of that stage's
+    inputs: the source hash and compiler settings for "compiled",
+    the compile fingerprint and objdump settings for "disassembled",
+    the .asm content hash and tokenizer settings for "tokenized" and
+    the token file hash and model hash for "vectorized". A stage is
+    redone when its fingerprint changes or its output is missing.
+    """
+
+    FILE = "manifest.json"
+
+    def __init__(self, path: str | Path, entries: dict | None = None):
+        self.path = Path(path)
+        self.entries: dict[str, dict] = entries or {}
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CorpusManifest":
+        path = Path(path)
+
+        if not path.exists():
+            return cls(path)
+
+        data = json.loads(path.read_text())
+        if data.get("format") != MANIFEST_FORMAT:
+            raise ValueError(f"Not a disasm2vec corpus manifest: {path}")
+
+        return cls(path, data["entries"])
+
+    def save(self):
+        _atomic_write(
+            self.path,
+            json.dumps(
+                {
+                    "format": MANIFEST_FORMAT,
+                    "format_version": MANIFEST_VERSION,
+                    "entries": self.entries,
+                },
+                indent=1,
+            ),
+        )
+
+
+def run_corpus(
+    sources: str | Iterable[str],
+    config: PipelineConfig,
+    work_dir: str,
+    workers: int | None = None,
+    batch_size: int = 1024,
+    checkpoint_every: int = 100,
+) -> CorpusReport:
+    """
+    Run the pipeline over a corpus, resuming from a previous run.
+
+    Progress is checkpointed to ``work_dir/manifest.json``. On a rerun
+    only the stages whose inputs changed (source content, compiler,
+    ``PipelineConfig`` settings, model) are redone; everything else
+    is skipped. Failed sources are recorded in the manifest and the
+    report and retried on the next run.
+
+    Binaries and listings go to ``config.build_dir`` and
+    ``config.asm_dir``, token documents to ``work_dir/tokens`` and
+    vectors to a VectorStore under ``work_dir/vectors``, one per
+    model. Documents with identical tokens are read and transformed
+    once per corpus and share one row of the store, including rows
+    written by earlier runs.
+
+    Parameters
+    ----------
+    sources : str | Iterable[str]
+        Folder searched recursively for .c/.cpp files, or an explicit
+        list of source files
+    config : PipelineConfig
+        Shared configuration; ``source_file`` is replaced per source
+    work_dir : str
+        Directory holding the manifest, token documents and vectors
+    workers : int | None
+        Number of worker processes for compile, disassemble and
+        tokenize (defaults to the number of cores)
+    batch_size : int
+        Number of documents vectorized and appended to the store at once
+    checkpoint_every : int
+        Save the manifest after this many sources finish tokenizing
+    """
+    if not config.model_path:
+        raise ValueError("model_path is required for pipeline")
+
+    if not (config.do_compile and config.do_disassemble):
+        raise ValueError("run_corpus needs do_compile and do_disassemble")
+
+    sources = _collect_sources(sources)
+
+    work_dir = Path(work_dir)
+    tokens_dir = work_dir / "tokens"
+    tokens_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = CorpusManifest.load(work_dir / CorpusManifest.FILE)
+    # Sources no longer in the corpus are forgotten.
+    manifest.entries = {
+        src: manifest.entries.get(src, {}) for src in sources
+    }
+
+    jobs = [
+        (
+            manifest.entries[src],
+            replace(config, source_file=src),
+            str(tokens_dir),
+        )
+        for src in sources
+    ]
+
+    ran = dict.fromkeys(STAGES, 0)
+    errors = {}
+    touched = set()
+
+    def record(src, entry, stages_run):
+        manifest.entries[src] = entry
+        for stage in stages_run:
+            ran[stage] += 1
+            touched.add(src)
+        if entry.get("error"):
+            errors[src] = entry["error"]
+
+    # COMPILE / DISASSEMBLE / TOKENIZE
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for done, (src, job) in enumerate(zip(sources, jobs), 1):
+            record(src, *_advance_worker(job))
+            if done % checkpoint_every == 0:
+                manifest.save()
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_advance_pool_worker, job): src
+                for src, job in zip(sources, jobs)
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                result, delta = future.result()
+                runner._merge_function_cache(config, delta)
+                record(futures[future], *result)
+                if done % checkpoint_every == 0:
+                    manifest.save()
+
+    manifest.save()
+    runner._save_function_cache(config)
+
+    # VECTORIZE
+    model_hash = hash_model(config.model_path)
+    store = VectorStore(work_dir / "vectors" / model_hash[:16], model_hash)
+
+    # tokens_hash -> store row of a document with those tokens; its
+    # vector is shared by every identical document in the corpus.
+    vectors = {}
+    pending = []
+    duplicates = 0
+    for src in sources:
+        entry = manifest.entries[src]
+        if entry.get("stage") != "tokenized":
+            continue
+
+        fingerprint = _fingerprint(entry["tokens_hash"], model_hash)
+
+        if (
+            entry["stages"].get("vectorized") == fingerprint
+            and entry.get("vector") in store
+        ):
+            entry["stage"] = "vectorized"
+            vectors.setdefault(entry["tokens_hash"], entry["vector"])
+            continue
+
+        pending.append((src, fingerprint))
+
+    if pending:
+        vectorizer = load_vectorizer(config.model_path, cached=True)
+
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+
+            documents = []
+            names = []
+            for src, fingerprint in batch:
+                entry = manifest.entries[src]
+                if entry["tokens_hash"] in vectors:
+                    duplicates += 1
+                    continue
+
+                name = f"{src}@{fingerprint[:16]}"
+                vectors[entry["tokens_hash"]] = name
+                if name not in store:
+                    documents.append(
+                        json.loads(Path(entry["tokens"]).read_text())
+                    )
+                    names.append(name)
+
+            if documents:
+                store.append(names, vectorizer.transform(documents))
+
+            for src, fingerprint in batch:
+                entry = manifest.entries[src]
+                entry["stages"]["vectorized"] = fingerprint
+                entry["vector"] = vectors[entry["tokens_hash"]]
+                entry["stage"] = "vectorized"
+                ran["vectorized"] += 1
+                touched.add(src)
+
+            manifest.save()
+
+    manifest.save()
+
+    return CorpusReport(
+        store=store,
+        manifest=manifest,
+        sources=sources,
+        ran=ran,
+        skipped=sum(
+            1 for src in sources if src not in touched and src not in errors
+        ),
+        errors=errors,
+        duplicates=duplicates,
+    )
+
+
+def _advance_worker(job):
+    """
+    Bring one source up to the "tokenized" stage.
+
+    Returns the updated manifest entry and the stages that ran.
+    """
+    entry, config, tokens_dir = job
+
+    entry = dict(entry)
+    stages = dict(entry.get("stages", {}))
+    entry["stages"] = stages
+    entry["stage"] = None
+    entry["error"] = None
+    stages_run = []
+
+    source = Path(config.source_file)
+    stem = runner._output_stem(config, source)
+
+    asm_path = Path(config.asm_dir) / f"{stem}.asm"
+    tokens_path = Path(tokens_dir) / f"{stem}.json"
+
+    try:
+        binary_path = runner._build_path(config, source)
+        compiler = runner._COMPILERS.get(source.suffix)
+        if compiler is None:
+            raise ValueError(f"Unsupported source type: {source.suffix}")
+
+        binary_path.parent.mkdir(parents=True, exist_ok=True)
+        asm_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # COMPILE
+        entry["source_hash"] = _file_hash(source)
+        fingerprint = _fingerprint(
+            entry["source_hash"],
+            compiler,
+            _compiler_version(compiler),
+            config.optimize,
+            config.extra_flags,
+            config.frontend,
+        )
+        if stages.get("compiled") != fingerprint or not binary_path.exists():
+            stages.pop("compiled", None)
+            runner._compile_source(config, source, binary_path)
+            stages_run.append("compiled")
+        stages["compiled"] = fingerprint
+        entry["stage"] = "compiled"
+
+        # DISASSEMBLE
+        fingerprint = _fingerprint(fingerprint, config.arch, config.full_disasm)
+        if stages.get("disassembled") != fingerprint or not asm_path.exists():
+            stages.pop("disassembled", None)
+            runner.disassemble(
+                binary=binary_path,
+                output=asm_path,
+                arch=config.arch,
+                full=config.full_disasm,
+                relocatable=config.frontend == "object",
+            )
+            stages_run.append("disassembled")
+        stages["disassembled"] = fingerprint
+        entry["stage"] = "disassembled"
+
+        # TOKENIZE
+        entry["asm_hash"] = _file_hash(asm_path)
+        fingerprint = _fingerprint(
+            entry["asm_hash"],
+            config.entry,
+            config.keep_register,
+        )
+        if stages.get("tokenized") != fingerprint or not tokens_path.exists():
+            stages.pop("tokenized", None)
+            kwargs = {}
+            function_cache = runner._function_cache(config)
+            if function_cache is not None:
+                kwargs["function_cache"] = function_cache
+
+            tokens = runner.tokenize(
+                path=asm_path,
+                entry=config.entry,
+                keep_register=config.keep_register,
+                **kwargs,
+            )
+            _atomic_write(tokens_path, json.dumps(tokens))
+            stages_run.append("tokenized")
+        stages["tokenized"] = fingerprint
+        entry["tokens"] = str(tokens_path)
+        entry["tokens_hash"] = _file_hash(tokens_path)
+        entry["stage"] = "tokenized"
+
+    except Exception as e:
+        entry["error"] = f"{type(e).__name__}: {e}"
+
+    return entry, stages_run
+
+
+def _advance_pool_worker(job):
+    return runner._with_function_cache_delta(
+        job[1],
+        partial(_advance_worker, job),
+    )
+
+
+def _fingerprint(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _atomic_write(path: Path, text: str):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
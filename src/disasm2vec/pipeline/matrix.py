@@ -0,0 +1,252 @@
+import hashlib
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable
+
+from disasm2vec.compiler import preprocess_c, preprocess_cpp
+from disasm2vec.vectorizer import VectorizerBase, load_vectorizer
+
+from . import runner
+from .batch import (
+    _build_all,
+    _collect_sources,
+    _merge_cache_stats,
+    _transform_unique,
+)
+from .cache import CacheStats
+from .config import PipelineConfig
+
+
+DEFAULT_VARIANTS = ("-O0", "-O1", "-O2", "-O3", "-Os")
+
+_UNIT_SUFFIXES = {
+    ".c": ".i",
+    ".cpp": ".ii",
+}
+
+
+@dataclass
+class MatrixResult:
+    """
+    Output of run_build_matrix.
+
+    Row i of ``X`` is ``sources[i]`` built with ``variants[i]``.
+    Builds that failed are left out of ``X`` and reported in
+    ``errors``, keyed by (source, variant). ``preprocessed`` counts
+    preprocessor runs; ``duplicates`` counts builds whose tokens
+    match an earlier build (e.g. -O2 and -O3 often do), which were
+    not vectorized again.
+    """
+    X: Any
+    vectorizer: VectorizerBase
+    sources: list[str] = field(default_factory=list)
+    variants: list[str] = field(default_factory=list)
+    errors: dict[tuple[str, str], str] = field(default_factory=dict)
+    preprocessed: int = 0
+    cache_stats: CacheStats | None = None
+    duplicates: int = 0
+
+    def names(self) -> list[str]:
+        """
+        Row names, "<source>@<variant>".
+        """
+        return [f"{src}@{tag}" for src, tag in zip(self.sources, self.variants)]
+
+
+def run_build_matrix(
+    sources: str | Iterable[str],
+    config: PipelineConfig,
+    variants: Iterable[str] | dict[str, str] = DEFAULT_VARIANTS,
+    workers: int | None = None,
+    chunksize: int = 1,
+) -> MatrixResult:
+    """
+    Build every source with several optimization flags and vectorize
+    all builds together.
+
+    Each source is preprocessed once (``gcc -E`` / ``g++ -E``) into
+    ``build_dir/preprocessed`` and every variant is compiled from that
+    unit, so headers are parsed once rather than once per variant.
+    Variants whose predefined macros differ still get a unit of their
+    own: -O1, -O2 and -O3 share one, while -O0 (``__NO_INLINE__``)
+    and -Os (``__OPTIMIZE_SIZE__``) each need theirs, since headers
+    select code on those macros.
+
+    Variants are then compiled, disassembled and tokenized
+    concurrently in a process pool, with outputs tagged by variant
+    (``build_dir/<stem>.O2``, ``asm_dir/<stem>.O2.asm``), and the
+    model vectorizes all of them with a single transform call,
+    identical token documents only once.
+
+    Parameters
+    ----------
+    sources : str | Iterable[str]
+        Folder searched recursively for .c/.cpp files, or an explicit
+        list of source files
+    config : PipelineConfig
+        Shared configuration; ``source_file``, ``optimize`` and
+        ``variant`` are replaced per build
+    variants : Iterable[str] | dict[str, str]
+        Optimization flags to build with. Tags are the flags without
+        their leading dash ("-O2" -> "O2"); pass a dict to choose
+        tags yourself ({"speed": "-O3"})
+    workers : int | None
+        Number of worker processes (defaults to the number of cores).
+        With 1 every stage runs in the calling process.
+    chunksize : int
+        Number of builds handed to a worker at a time
+    """
+    if not config.model_path:
+        raise ValueError("model_path is required for pipeline")
+
+    tags = _variant_tags(variants)
+    sources = _collect_sources(sources)
+    extra_flags = list(config.extra_flags or [])
+
+    workers = workers or os.cpu_count() or 1
+
+    # PLAN
+    units = {}
+    plan = []
+    for src in sources:
+        source = Path(src)
+        compiler = runner._COMPILERS[source.suffix]
+
+        for tag, flag in tags.items():
+            macros = _predefined_macros(compiler, flag, tuple(extra_flags))
+            unit = (
+                Path(config.build_dir)
+                / "preprocessed"
+                / macros[:12]
+                / f"{source.stem}{_UNIT_SUFFIXES[source.suffix]}"
+            )
+            units.setdefault(unit, (source, [flag, *extra_flags]))
+            plan.append((src, tag, flag, unit))
+
+    # PREPROCESS
+    def preprocess(item):
+        unit, (source, flags) = item
+        unit.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            if source.suffix == ".c":
+                preprocess_c(source, unit, flags)
+            else:
+                preprocess_cpp(source, unit, flags)
+        except Exception as e:
+            return unit, f"{type(e).__name__}: {e}"
+
+        return unit, None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        failed = {
+            unit: error
+            for unit, error in executor.map(preprocess, units.items())
+            if error is not None
+        }
+
+    # COMPILE / DISASSEMBLE / TOKENIZE
+    errors = {
+        (src, tag): failed[unit]
+        for src, tag, _, unit in plan
+        if unit in failed
+    }
+    builds = [
+        (src, tag, flag, unit)
+        for src, tag, flag, unit in plan
+        if unit not in failed
+    ]
+    configs = [
+        replace(config, source_file=str(unit), optimize=flag, variant=tag)
+        for _, tag, flag, unit in builds
+    ]
+
+    outcomes = _build_all(configs, workers, chunksize)
+
+    result_sources = []
+    result_variants = []
+    documents = []
+    cache_stats = CacheStats() if config.cache_dir else None
+
+    for (src, tag, _, _), (tokens, error, stats) in zip(builds, outcomes):
+        if stats is not None:
+            cache_stats.merge(stats)
+
+        if error is not None:
+            errors[(src, tag)] = error
+            continue
+
+        result_sources.append(src)
+        result_variants.append(tag)
+        documents.append(tokens)
+
+    # VECTORIZE
+    vectorizer = load_vectorizer(config.model_path, cached=True)
+
+    X, duplicates = _transform_unique(vectorizer, documents)
+
+    if cache_stats is not None and workers > 1:
+        _merge_cache_stats(config, cache_stats)
+
+    return MatrixResult(
+        X=X,
+        vectorizer=vectorizer,
+        sources=result_sources,
+        variants=result_variants,
+        errors=errors,
+        preprocessed=len(units),
+        cache_stats=cache_stats,
+        duplicates=duplicates,
+    )
+
+
+def _variant_tags(variants: Iterable[str] | dict[str, str]) -> dict[str, str]:
+    if isinstance(variants, str):
+        variants = [variants]
+
+    if isinstance(variants, dict):
+        tags = dict(variants)
+    else:
+        tags = {}
+        for flag in variants:
+            tag = flag.lstrip("-")
+            if tag in tags:
+                raise ValueError(f"Duplicate variant: {flag}")
+            tags[tag] = flag
+
+    if not tags:
+        raise ValueError("No build variants given")
+
+    for tag in tags:
+        if not tag or "/" in tag or tag.startswith("."):
+            raise ValueError(f"Invalid variant tag: {tag!r}")
+
+    return tags
+
+
+@lru_cache(maxsize=None)
+def _predefined_macros(
+    compiler: str,
+    optimize: str,
+    extra_flags: tuple[str, ...],
+) -> str:
+    """
+    Digest of the macros compiler predefines under the given flags.
+    """
+    language = "c++" if compiler == "g++" else "c"
+
+    result = subprocess.run(
+        [compiler, "-dM", "-E", "-x", language, "-", optimize, *extra_flags],
+        input="",
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+    macros = "\n".join(sorted(result.stdout.splitlines()))
+    return hashlib.sha256(f"{compiler}\n{macros}".encode()).hexdigest()
@@ -0,0 +1,117 @@
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field, fields
+from typing import Callable
+
+from disasm2vec.tokenizer import TokenizeStats
+
+
+@dataclass
+class StageTiming:
+    wall: float = 0.0
+    cpu: float = 0.0
+    calls: int = 0
+
+
+@dataclass
+class PipelineMetrics:
+    """
+    Per-stage timings and counters for pipeline runs.
+
+    Pass an instance as ``metrics`` to run_pipeline (or build_tokens);
+    values accumulate across runs. Stages are "compile",
+    "disassemble", "split" and "expand" (the two tokenizer phases),
+    "load_model" and "transform". With ``stream_asm`` objdump runs
+    while the listing is split, so its time is part of "split".
+
+    CPU time is this process's user+system time plus that of child
+    processes (compiler, objdump) that finished during the stage.
+
+    Every callback is called as ``callback(stage, timing)`` after
+    each stage, with the StageTiming of that single run, e.g. to
+    forward it to a metrics system.
+    """
+    stages: dict[str, StageTiming] = field(default_factory=dict)
+
+    asm_bytes: int = 0
+    functions: int = 0
+    instructions: int = 0
+    tokens: int = 0
+    inlined_calls: int = 0
+    inline_depth: int = 0
+
+    cache_hits: int = 0
+    cache_misses: int = 0
+    model_cache_hits: int = 0
+    function_cache_hits: int = 0
+    function_cache_misses: int = 0
+
+    callbacks: list[Callable[[str, StageTiming], None]] = field(
+        default_factory=list,
+        repr=False,
+    )
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time the enclosed block as one run of stage ``name``.
+        """
+        wall, cpu = time.perf_counter(), _cpu_time()
+        try:
+            yield
+        finally:
+            self.add_stage(
+                name,
+                time.perf_counter() - wall,
+                _cpu_time() - cpu,
+            )
+
+    def add_stage(self, name: str, wall: float, cpu: float):
+        timing = self.stages.setdefault(name, StageTiming())
+        timing.wall += wall
+        timing.cpu += cpu
+        timing.calls += 1
+
+        for callback in self.callbacks:
+            callback(name, StageTiming(wall, cpu, 1))
+
+    def add_tokenize_stats(self, stats: TokenizeStats):
+        self.add_stage("split", stats.split_wall, stats.split_cpu)
+        self.add_stage("expand", stats.expand_wall, stats.expand_cpu)
+
+        self.asm_bytes += stats.asm_bytes
+        self.functions += stats.functions
+        self.instructions += stats.instructions
+        self.tokens += stats.tokens
+        self.inlined_calls += stats.inlined_calls
+        self.inline_depth = max(self.inline_depth, stats.inline_depth)
+
+    @property
+    def total_wall(self) -> float:
+        return sum(timing.wall for timing in self.stages.values())
+
+    def as_dict(self) -> dict:
+        data = {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if f.name not in ("stages", "callbacks")
+        }
+        data["stages"] = {
+            name: asdict(timing) for name, timing in self.stages.items()
+        }
+        return data
+
+
+def stage_timer(metrics: PipelineMetrics | None, name: str):
+    """
+    metrics.stage(name), or a no-op context when metrics is None.
+    """
+    if metrics is None:
+        return nullcontext()
+    return metrics.stage(name)
+
+
+def _cpu_time() -> float:
+    t = os.times()
+    return time.process_time() + t.children_user + t.children_system
@@ -1,78 +1,319 @@
+import shutil
 from pathlib import Path
 
 from disasm2vec.compiler import compile_c, compile_cpp
-from disasm2vec.disassembler import disassemble
-from disasm2vec.tokenizer import tokenize
-from disasm2vec.vectorizer import Tfidf
+from disasm2vec.disassembler import disassemble, disassemble_stream
+from disasm2vec.tokenizer import (
+    TokenizeStats,
+    get_function_cache,
+    tokenize,
+    tokenize_lines,
+)
+from disasm2vec.vectorizer import get_model_registry, load_vectorizer
 
+from .cache import get_build_cache
 from .config import PipelineConfig
+from .metrics import PipelineMetrics, stage_timer
 
+_COMPILERS = {
+    ".c": "gcc",
+    ".cpp": "g++",
+    # preprocessed units (see run_build_matrix)
+    ".i": "gcc",
+    ".ii": "g++",
+}
 
-def run_pipeline(config: PipelineConfig):
+_FRONTENDS = ("link", "object")
+
+FUNCTION_CACHE_FILE = "functions.json"
+
+
+def run_pipeline(
+    config: PipelineConfig,
+    metrics: PipelineMetrics | None = None,
+):
     """
     Run pipeline for single source file.
 
     Flow:
         source -> compile -> disassemble -> tokenizer -> vectorize
+
+    With ``frontend="object"`` the source is only compiled to an
+    object file, which is disassembled with its relocations, so no
+    linker runs and the source needs no ``main``.
+
+    The model is taken from the process-wide model registry, so it
+    is only read from disk on the first call (or after it changes).
+    The returned vectorizer is that shared instance: use it read-only,
+    or load a private copy with load_vectorizer(config.model_path).
+
+    Pass a PipelineMetrics as ``metrics`` to collect per-stage
+    timings and counters.
     """
+    corpus = build_tokens(config, metrics)
+
+    # VECTORIZE
+    if not config.model_path:
+        raise ValueError("model_path is required for pipeline")
+
+    registry = get_model_registry()
+    hits = registry.stats().hits
 
+    with stage_timer(metrics, "load_model"):
+        vectorizer = load_vectorizer(config.model_path, cached=True)
+
+    if metrics is not None:
+        metrics.model_cache_hits += registry.stats().hits - hits
+
+    with stage_timer(metrics, "transform"):
+        X = vectorizer.transform_one(corpus)
+
+    return X, vectorizer
+
+
+def build_tokens(
+    config: PipelineConfig,
+    metrics: PipelineMetrics | None = None,
+) -> list[str]:
+    """
+    Run the compile, disassemble and tokenize stages for a single
+    source file and return its token document.
+
+    With ``stream_asm`` the objdump output is tokenized straight from
+    the pipe. Without a build cache no .asm file is written; with one,
+    hits are tokenized in place and misses are copied to the .asm file
+    while they stream past, then stored.
+    """
     source = Path(config.source_file)
 
     if not source.exists():
         raise FileNotFoundError(source)
 
-    stem = source.stem
+    stem = _output_stem(config, source)
 
-    binary_path = Path(config.build_dir) / stem
+    binary_path = _build_path(config, source)
     asm_path = Path(config.asm_dir) / f"{stem}.asm"
+    relocatable = config.frontend == "object"
 
     binary_path.parent.mkdir(parents=True, exist_ok=True)
     asm_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # COMPILE
-    if config.do_compile:
-        flags = [config.optimize]
-        if config.extra_flags:
-            flags.extend(config.extra_flags)
+    compiler = _COMPILERS.get(source.suffix)
 
-        if source.suffix == ".c":
-            compile_c(source, binary_path, flags)
+    # BUILD CACHE
+    cache = None
+    cache_key = None
+    cached = None
+    if (
+        config.cache_dir
+        and config.do_compile
+        and config.do_disassemble
+        and compiler
+    ):
+        cache = get_build_cache(config.cache_dir, config.cache_max_bytes)
+        cache_key = cache.key(
+            source,
+            compiler=compiler,
+            optimize=config.optimize,
+            extra_flags=config.extra_flags,
+            arch=config.arch,
+            full=config.full_disasm,
+            frontend=config.frontend,
+        )
+        cached = cache.get(cache_key)
 
-        elif source.suffix == ".cpp":
-            compile_cpp(source, binary_path, flags)
+        if metrics is not None:
+            if cached is not None:
+                metrics.cache_hits += 1
+            else:
+                metrics.cache_misses += 1
 
+    if cached is not None:
+        if config.stream_asm:
+            asm_path = cached
         else:
-            raise ValueError(
-                f"Unsupported source type: {source.suffix}"
+            shutil.copyfile(cached, asm_path)
+
+    else:
+        # COMPILE
+        if config.do_compile:
+            with stage_timer(metrics, "compile"):
+                _compile_source(config, source, binary_path)
+
+        # DISASSEMBLE
+        if config.do_disassemble and config.stream_asm:
+            lines = disassemble_stream(
+                binary=binary_path,
+                arch=config.arch,
+                full=config.full_disasm,
+                relocatable=relocatable,
             )
+            if cache is None:
+                return _tokenize(tokenize_lines, lines, config, metrics)
 
-    # DISASSEMBLE
-    if config.do_disassemble:
-        disassemble(
-            binary=binary_path,
-            output=asm_path,
-            arch=config.arch,
-            full=config.full_disasm,
-        )
+            with open(asm_path, "w") as f:
+                tokens = _tokenize(
+                    tokenize_lines, _tee(lines, f), config, metrics
+                )
+
+            cache.put(cache_key, asm_path)
+            return tokens
+
+        if config.do_disassemble:
+            with stage_timer(metrics, "disassemble"):
+                disassemble(
+                    binary=binary_path,
+                    output=asm_path,
+                    arch=config.arch,
+                    full=config.full_disasm,
+                    relocatable=relocatable,
+                )
+
+        if cache is not None:
+            cache.put(cache_key, asm_path)
 
     # TOKENIZER
-    corpus = tokenize(
-        path=asm_path,
+    return _tokenize(tokenize, asm_path, config, metrics)
+
+
+def _tee(lines, f):
+    for line in lines:
+        f.write(line)
+        yield line
+
+
+def _tokenize(tokenizer, listing, config: PipelineConfig, metrics):
+    kwargs = {}
+    function_cache = _function_cache(config)
+    if function_cache is not None:
+        kwargs["function_cache"] = function_cache
+
+    if metrics is None:
+        return tokenizer(
+            listing,
+            entry=config.entry,
+            keep_register=config.keep_register,
+            **kwargs,
+        )
+
+    if function_cache is not None:
+        before = function_cache.stats()
+
+    stats = TokenizeStats()
+    tokens = tokenizer(
+        listing,
         entry=config.entry,
         keep_register=config.keep_register,
+        stats=stats,
+        **kwargs,
     )
+    metrics.add_tokenize_stats(stats)
 
-    # VECTORIZE
-    if not config.model_path:
-        raise ValueError("model_path is required for pipeline")
+    if function_cache is not None:
+        delta = function_cache.stats().delta(before)
+        metrics.function_cache_hits += delta.hits
+        metrics.function_cache_misses += delta.misses
+
+    return tokens
+
+
+def _function_cache(config: PipelineConfig):
+    """
+    The process-wide FunctionCache for config, or None if disabled.
+    """
+    if not config.function_cache:
+        return None
+
+    return _shared_function_cache(config.cache_dir)
+
+
+def _shared_function_cache(cache_dir: str | None):
+    if cache_dir:
+        return get_function_cache(Path(cache_dir) / FUNCTION_CACHE_FILE)
+
+    return get_function_cache()
 
-    vectorizer = Tfidf(
-        max_features=config.max_features,
-        ngram_range=config.ngram_range,
-        min_df=config.min_df,
+
+def _with_function_cache_delta(config: PipelineConfig, run):
+    """
+    Call run() in a worker process. Returns its result and the
+    function cache entries and stats it added (None if the cache is
+    disabled), for _merge_function_cache in the parent process.
+    """
+    function_cache = _function_cache(config)
+
+    if function_cache is None:
+        return run(), None
+
+    before = function_cache.stats()
+    result = run()
+
+    return result, (
+        function_cache.take_new(),
+        function_cache.stats().delta(before),
     )
-    vectorizer.load(config.model_path)
-    
-    X = vectorizer.transform_one(corpus)
 
-    return X, vectorizer
+
+def _merge_function_cache(config: PipelineConfig, delta):
+    if delta is None:
+        return
+
+    entries, stats = delta
+    function_cache = _function_cache(config)
+    function_cache.update(entries)
+    function_cache.merge_stats(stats)
+
+
+def _save_function_cache(config: PipelineConfig):
+    function_cache = _function_cache(config)
+
+    if function_cache is not None and function_cache.path is not None:
+        function_cache.save()
+
+
+def _build_path(config: PipelineConfig, source: Path) -> Path:
+    """
+    Path of the executable (or object file) built from source.
+    """
+    if config.frontend not in _FRONTENDS:
+        raise ValueError(
+            f"Unknown frontend: {config.frontend!r} "
+            f"(expected one of {', '.join(_FRONTENDS)})"
+        )
+
+    stem = _output_stem(config, source)
+
+    if config.frontend == "object":
+        return Path(config.build_dir) / f"{stem}.o"
+
+    return Path(config.build_dir) / stem
+
+
+def _output_stem(config: PipelineConfig, source: Path) -> str:
+    if config.variant:
+        return f"{source.stem}.{config.variant}"
+
+    return source.stem
+
+
+def _compile_source(
+    config: PipelineConfig,
+    source: Path,
+    binary_path: Path,
+):
+    flags = [config.optimize]
+    if config.extra_flags:
+        flags.extend(config.extra_flags)
+
+    link = config.frontend != "object"
+
+    if source.suffix in (".c", ".i"):
+        compile_c(source, binary_path, flags, link=link)
+
+    elif source.suffix in (".cpp", ".ii"):
+        compile_cpp(source, binary_path, flags, link=link)
+
+    else:
+        raise ValueError(
+            f"Unsupported source type: {source.suffix}"
+        )
@@ -0,0 +1,11 @@
+from .config import ServerConfig
+from .batcher import MicroBatcher
+from .app import EmbeddingServer, EmbeddingService, serve
+
+__all__ = [
+    "ServerConfig",
+    "MicroBatcher",
+    "EmbeddingServer",
+    "EmbeddingService",
+    "serve",
+]
@@ -0,0 +1,61 @@
+import argparse
+
+from disasm2vec.vectorizer.factory import DEFAULT_MODEL_PATH
+
+from .app import serve
+from .config import ServerConfig
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m disasm2vec.server",
+        description="Serve disasm2vec embeddings over HTTP.",
+    )
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8421)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument(
+        "--max-latency-ms",
+        type=float,
+        default=5.0,
+        help="how long a batch waits for more requests",
+    )
+    parser.add_argument("--optimize", default="-O0")
+    parser.add_argument(
+        "--frontend",
+        choices=("link", "object"),
+        default="link",
+        help="how source requests are built (see PipelineConfig.frontend)",
+    )
+    parser.add_argument("--entry", default="main")
+    parser.add_argument(
+        "--function-cache",
+        action="store_true",
+        help="reuse tokenized function bodies across requests",
+    )
+    parser.add_argument("--cache-dir", default=None)
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    config = ServerConfig(
+        model_path=args.model,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        max_batch_size=args.max_batch_size,
+        max_latency=args.max_latency_ms / 1000,
+        optimize=args.optimize,
+        frontend=args.frontend,
+        entry=args.entry,
+        function_cache=args.function_cache,
+        cache_dir=args.cache_dir,
+    )
+
+    print(f"Serving on http://{config.host}:{config.port}")
+    serve(config, quiet=args.quiet)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+import base64
+import binascii
+import json
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from disasm2vec.compiler.errors import CompilationError
+from disasm2vec.disassembler import disassemble_stream
+from disasm2vec.disassembler.errors import DisassemblyError
+from disasm2vec.pipeline.config import PipelineConfig
+from disasm2vec.pipeline import runner
+from disasm2vec.pipeline.runner import build_tokens
+from disasm2vec.tokenizer import tokenize_lines
+from disasm2vec.vectorizer import load_vectorizer
+
+from .batcher import MicroBatcher
+from .config import ServerConfig
+
+_INPUT_KINDS = ("asm", "source", "binary")
+
+_SOURCE_SUFFIXES = {
+    "c": ".c",
+    "cpp": ".cpp",
+}
+
+
+class EmbeddingService:
+    """
+    Resident model plus the worker pool and micro-batcher behind
+    the HTTP server.
+
+    Requests are JSON objects with exactly one input:
+
+        {"asm": "<objdump -d text>"}
+        {"source": "<C/C++ code>", "language": "c" | "cpp"}
+        {"binary": "<base64 ELF>"}
+
+    and optional "entry" / "keep_register" overrides. Source and
+    binary inputs are compiled / disassembled on the worker pool;
+    token documents from concurrent requests are vectorized together
+    in one transform call.
+    """
+
+    def __init__(self, config: ServerConfig):
+        self.config = config
+        self.vectorizer = load_vectorizer(config.model_path, cached=True)
+
+        self._pool = ThreadPoolExecutor(
+            max_workers=config.workers,
+            thread_name_prefix="disasm2vec-build",
+        )
+        self._batcher = MicroBatcher(
+            self._transform,
+            max_batch_size=config.max_batch_size,
+            max_latency=config.max_latency,
+        )
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+
+    def embed(self, request: dict) -> dict:
+        """
+        Vectorize one request and return its sparse row.
+        """
+        try:
+            tokens = self._pool.submit(self.tokens, request).result()
+            row = self._batcher.submit(tokens).result()
+        except Exception:
+            with self._lock:
+                self.requests += 1
+                self.failures += 1
+            raise
+
+        with self._lock:
+            self.requests += 1
+
+        row.sort_indices()
+        return {
+            "shape": list(row.shape),
+            "indices": row.indices.tolist(),
+            "values": row.data.tolist(),
+            "n_tokens": len(tokens),
+        }
+
+    def tokens(self, request: dict) -> list[str]:
+        """
+        Build the token document for a request.
+        """
+        if not isinstance(request, dict):
+            raise ValueError("Request body must be a JSON object")
+
+        kinds = [kind for kind in _INPUT_KINDS if kind in request]
+        if len(kinds) != 1:
+            raise ValueError(
+                "Request needs exactly one of: " + ", ".join(_INPUT_KINDS)
+            )
+
+        kind = kinds[0]
+        if not isinstance(request[kind], str):
+            raise ValueError(f"'{kind}' must be a string")
+
+        entry = request.get("entry", self.config.entry)
+        keep_register = bool(
+            request.get("keep_register", self.config.keep_register)
+        )
+
+        kwargs = {}
+        function_cache = self._function_cache()
+        if function_cache is not None:
+            kwargs["function_cache"] = function_cache
+
+        if kind == "asm":
+            return tokenize_lines(
+                request["asm"].splitlines(keepends=True),
+                entry=entry,
+                keep_register=keep_register,
+                **kwargs,
+            )
+
+        with tempfile.TemporaryDirectory(dir=self.config.work_dir) as tmp:
+            if kind == "binary":
+                binary = Path(tmp) / "input"
+                binary.write_bytes(
+                    base64.b64decode(request["binary"], validate=True)
+                )
+                lines = disassemble_stream(
+                    binary,
+                    arch=self.config.arch,
+                    full=self.config.full_disasm,
+                )
+                return tokenize_lines(
+                    lines,
+                    entry=entry,
+                    keep_register=keep_register,
+                    **kwargs,
+                )
+
+            language = request.get("language", "c")
+            suffix = _SOURCE_SUFFIXES.get(language)
+            if suffix is None:
+                raise ValueError(f"Unsupported language: {language}")
+
+            source = Path(tmp) / f"input{suffix}"
+            source.write_text(request["source"])
+
+            return build_tokens(
+                PipelineConfig(
+                    source_file=str(source),
+                    build_dir=tmp,
+                    asm_dir=tmp,
+                    optimize=self.config.optimize,
+                    extra_flags=self.config.extra_flags,
+                    frontend=self.config.frontend,
+                    arch=self.config.arch,
+                    full_disasm=self.config.full_disasm,
+                    stream_asm=True,
+                    entry=entry,
+                    keep_register=keep_register,
+                    function_cache=self.config.function_cache,
+                    cache_dir=self.config.cache_dir,
+                )
+            )
+
+    def health(self) -> dict:
+        with self._lock:
+            requests, failures = self.requests, self.failures
+
+        return {
+            "status": "ok",
+            "model_path": self.config.model_path,
+            "n_features": len(self.vectorizer.features()),
+            "requests": requests,
+            "failures": failures,
+            "batches": self._batcher.batches,
+            "batched_items": self._batcher.items,
+        }
+
+    def close(self):
+        self._batcher.close()
+        self._pool.shutdown()
+
+        function_cache = self._function_cache()
+        if function_cache is not None and function_cache.path is not None:
+            function_cache.save()
+
+    def _function_cache(self):
+        # Shared with build_tokens for source requests.
+        if not self.config.function_cache:
+            return None
+
+        return runner._shared_function_cache(self.config.cache_dir)
+
+    def _transform(self, documents: list[list[str]]):
+        # The registry returns the resident model unless the file on
+        # disk has changed since it was loaded.
+        self.vectorizer = load_vectorizer(self.config.model_path, cached=True)
+
+        X = self.vectorizer.transform(documents).tocsr()
+        return [X[i] for i in range(X.shape[0])]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "EmbeddingServer"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+            return
+
+        self._send(HTTPStatus.OK, self.server.service.health())
+
+    def do_POST(self):
+        if self.path != "/embed":
+            self._send(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+
+        if length < 0:
+            # The body cannot be skipped without a valid length
+            self.close_connection = True
+            self._send(
+                HTTPStatus.BAD_REQUEST,
+                {"error": "Invalid Content-Length header"},
+            )
+            return
+
+        if length > self.server.service.config.max_request_bytes:
+            self.close_connection = True
+            self._send(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                {"error": "Request body too large"},
+            )
+            return
+
+        try:
+            request = json.loads(self.rfile.read(length))
+            result = self.server.service.embed(request)
+
+        except (CompilationError, DisassemblyError) as e:
+            self._send(
+                HTTPStatus.UNPROCESSABLE_ENTITY,
+                {"error": str(e), "stderr": e.stderr},
+            )
+
+        except (ValueError, KeyError, TypeError, binascii.Error) as e:
+            self._send(
+                HTTPStatus.BAD_REQUEST,
+                {"error": f"{type(e).__name__}: {e}"},
+            )
+
+        except Exception as e:
+            self._send(
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                {"error": f"{type(e).__name__}: {e}"},
+            )
+
+        else:
+            self._send(HTTPStatus.OK, result)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status: HTTPStatus, payload: dict):
+        body = json.dumps(payload).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class EmbeddingServer(ThreadingHTTPServer):
+    """
+    HTTP server keeping a vectorizer resident between requests.
+
+    Endpoints
+    ---------
+    POST /embed   request JSON (see EmbeddingService) -> sparse row
+                  {"shape", "indices", "values", "n_tokens"}
+    GET  /health  model and batching statistics
+    """
+
+    daemon_threads = True
+
+    def __init__(self, config: ServerConfig, quiet: bool = False):
+        self.service = EmbeddingService(config)
+        self.quiet = quiet
+
+        try:
+            super().__init__((config.host, config.port), _Handler)
+        except BaseException:
+            self.service.close()
+            raise
+
+    def server_close(self):
+        super().server_close()
+        self.service.close()
+
+
+def serve(config: ServerConfig, quiet: bool = False):
+    """
+    Run an EmbeddingServer until interrupted.
+    """
+    with EmbeddingServer(config, quiet=quiet) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,122 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Sequence
+
+
+class MicroBatcher:
+    """
+    Collect items submitted from many threads and process them in
+    batches with a single call to fn.
+
+    A batch is started by the first waiting item and closed when it
+    holds ``max_batch_size`` items or ``max_latency`` seconds have
+    passed, whichever comes first. fn receives the list of items and
+    must return one result per item, in order. If it raises, every
+    item in the batch fails with that exception.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[list], Sequence[Any]],
+        max_batch_size: int = 32,
+        max_latency: float = 0.005,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+
+        self.batches = 0
+        self.items = 0
+
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run,
+            name="disasm2vec-batcher",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def close(self):
+        """
+        Process the items already submitted and stop the worker thread.
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # WORKER
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            batch = [job]
+            stop = False
+            deadline = time.monotonic() + self.max_latency
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+
+                try:
+                    job = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+                if job is None:
+                    stop = True
+                    break
+
+                batch.append(job)
+
+            self._process(batch)
+
+            if stop:
+                return
+
+    def _process(self, batch: list):
+        batch = [
+            (item, future)
+            for item, future in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        if not batch:
+            return
+
+        self.batches += 1
+        self.items += len(batch)
+
+        try:
+            results = self.fn([item for item, _ in batch])
+        except BaseException as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class ServerConfig:
+    model_path: str
+
+    host: str = "127.0.0.1"
+    port: int = 8421
+
+    # compile / disassemble / tokenize pool
+    workers: int = 4
+
+    # micro-batching
+    max_batch_size: int = 32
+    max_latency: float = 0.005  # seconds
+
+    # build settings for "source" and "binary" requests
+    optimize: str = "-O0"
+    extra_flags: Optional[list[str]] = None
+    frontend: str = "link"
+    arch: Optional[str] = None
+    full_disasm: bool = False
+    entry: str = "main"
+    keep_register: bool = False
+    # reuse tokenized function bodies across requests
+    function_cache: bool = False
+
+    # scratch space for request files (default: system temp dir)
+    work_dir: Optional[str] = None
+    cache_dir: Optional[str] = None
+
+    max_request_bytes: int = 64 << 20
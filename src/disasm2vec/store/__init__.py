@@ -0,0 +1,6 @@
+from .vector_store import VectorStore, hash_model
+
+__all__ = [
+    "VectorStore",
+    "hash_model",
+]
@@ -0,0 +1,311 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+
+
+FORMAT_NAME = "disasm2vec-store"
+FORMAT_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+
+_ARRAYS = ("data", "indices", "indptr")
+
+
+class VectorStore:
+    """
+    Append-only on-disk store of sparse vectors.
+
+    Each append() writes one chunk (CSR data/indices/indptr arrays as
+    .npy files and the row names) and then atomically rewrites
+    manifest.json, so a store interrupted mid-append still opens at
+    its last complete chunk. Rows are read through memory-mapped
+    arrays; slicing or indexing only touches the chunks and byte
+    ranges it needs.
+
+    The manifest records the hash of the model that produced the
+    vectors (see hash_model). Opening a store with a different
+    model_hash raises ValueError instead of mixing vector spaces.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        model_hash: str | None = None,
+    ):
+        self.path = Path(path)
+
+        manifest = self.path / MANIFEST_FILE
+        if manifest.exists():
+            self._manifest = json.loads(manifest.read_text())
+
+            if self._manifest.get("format") != FORMAT_NAME:
+                raise ValueError(f"Not a disasm2vec vector store: {path}")
+
+            stored = self._manifest["model_hash"]
+            if model_hash is not None and stored not in (None, model_hash):
+                raise ValueError(
+                    f"Store was built with model {stored}, not {model_hash}"
+                )
+            if stored is None:
+                self._manifest["model_hash"] = model_hash
+        else:
+            self._manifest = {
+                "format": FORMAT_NAME,
+                "format_version": FORMAT_VERSION,
+                "model_hash": model_hash,
+                "n_features": None,
+                "chunks": [],
+            }
+
+        self._offsets = np.cumsum(
+            [0] + [chunk["rows"] for chunk in self._manifest["chunks"]]
+        )
+        self._names: List[str] | None = None
+        self._rows: dict[str, int] | None = None
+        self._arrays: dict = {}
+
+    # PROPERTIES
+    @property
+    def model_hash(self) -> str | None:
+        return self._manifest["model_hash"]
+
+    @property
+    def n_features(self) -> int | None:
+        return self._manifest["n_features"]
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (len(self), self.n_features or 0)
+
+    def __len__(self) -> int:
+        return int(self._offsets[-1])
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._name_rows()
+
+    def names(self) -> List[str]:
+        if self._names is None:
+            self._names = []
+            for chunk in self._manifest["chunks"]:
+                self._names.extend(self._read_names(chunk["id"]))
+
+        return list(self._names)
+
+    # WRITE
+    def append(self, names: Sequence[str], X):
+        """
+        Write X (one row per name) as a new chunk.
+        """
+        names = list(names)
+        X = sparse.csr_matrix(X)
+
+        if X.shape[0] != len(names):
+            raise ValueError(
+                f"Got {len(names)} names for {X.shape[0]} vectors"
+            )
+        if not names:
+            return
+
+        n_features = self.n_features
+        if n_features is not None and X.shape[1] != n_features:
+            raise ValueError(
+                f"Expected {n_features} features, got {X.shape[1]}"
+            )
+
+        rows = self._name_rows()
+        if len(set(names)) != len(names) or any(n in rows for n in names):
+            raise ValueError("Duplicate row names in vector store")
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        chunk_id = f"{len(self._manifest['chunks']):05d}"
+        X.sort_indices()
+        for name in _ARRAYS:
+            np.save(self._array_path(chunk_id, name), getattr(X, name))
+        self._names_path(chunk_id).write_text(json.dumps(names))
+
+        self._manifest["n_features"] = X.shape[1]
+        self._manifest["chunks"].append(
+            {"id": chunk_id, "rows": X.shape[0], "nnz": int(X.nnz)}
+        )
+        self._write_manifest()
+
+        start = len(self)
+        self._offsets = np.append(self._offsets, start + X.shape[0])
+        if self._names is not None:
+            self._names.extend(names)
+        rows.update((name, start + i) for i, name in enumerate(names))
+
+    # READ
+    def __getitem__(self, key) -> sparse.csr_matrix:
+        """
+        Rows by position: an int, a slice or a sequence of ints.
+        """
+        n = len(self)
+
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += n
+            if not 0 <= key < n:
+                raise IndexError(key)
+            return self.slice(key, key + 1)
+
+        if isinstance(key, slice):
+            start, stop, step = key.indices(n)
+            if step == 1:
+                return self.slice(start, stop)
+            key = range(start, stop, step)
+
+        return self.take(key)
+
+    def slice(self, start: int, stop: int) -> sparse.csr_matrix:
+        """
+        Rows start..stop (exclusive) as one CSR matrix.
+        """
+        stop = min(stop, len(self))
+        if start >= stop:
+            return sparse.csr_matrix((0, self.n_features or 0))
+
+        parts = []
+        first = int(np.searchsorted(self._offsets, start, side="right")) - 1
+
+        for c in range(first, len(self._manifest["chunks"])):
+            lo = int(self._offsets[c])
+            if lo >= stop:
+                break
+
+            hi = int(self._offsets[c + 1])
+            parts.append(
+                self._read_rows(c, max(start, lo) - lo, min(stop, hi) - lo)
+            )
+
+        return parts[0] if len(parts) == 1 else sparse.vstack(parts, "csr")
+
+    def take(self, rows: Sequence[int]) -> sparse.csr_matrix:
+        """
+        Rows at arbitrary positions, in the given order.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        n = len(self)
+
+        rows = np.where(rows < 0, rows + n, rows)
+        if rows.size and (rows.min() < 0 or rows.max() >= n):
+            raise IndexError("Row index out of range")
+
+        chunks = np.searchsorted(self._offsets, rows, side="right") - 1
+        data, indices, lengths = [], [], []
+
+        for row, c in zip(rows, chunks):
+            chunk_data, chunk_indices, indptr = self._chunk_arrays(c)
+            lo = row - self._offsets[c]
+            a, b = int(indptr[lo]), int(indptr[lo + 1])
+
+            data.append(chunk_data[a:b])
+            indices.append(chunk_indices[a:b])
+            lengths.append(b - a)
+
+        if not lengths:
+            return sparse.csr_matrix((0, self.n_features or 0))
+
+        return sparse.csr_matrix(
+            (
+                np.concatenate(data),
+                np.concatenate(indices),
+                np.concatenate([[0], np.cumsum(lengths)]),
+            ),
+            shape=(len(rows), self.n_features),
+        )
+
+    def get(self, names: Union[str, Sequence[str]]) -> sparse.csr_matrix:
+        """
+        Rows by name.
+        """
+        if isinstance(names, str):
+            names = [names]
+
+        rows = self._name_rows()
+        return self.take([rows[name] for name in names])
+
+    def iter_chunks(self) -> Iterator[Tuple[List[str], sparse.csr_matrix]]:
+        """
+        Yield (names, rows) per stored chunk.
+        """
+        for c, chunk in enumerate(self._manifest["chunks"]):
+            yield self._read_names(chunk["id"]), self._read_rows(
+                c, 0, chunk["rows"]
+            )
+
+    def to_csr(self) -> sparse.csr_matrix:
+        return self.slice(0, len(self))
+
+    # INTERNAL
+    def _read_rows(self, c: int, lo: int, hi: int) -> sparse.csr_matrix:
+        data, indices, indptr = self._chunk_arrays(c)
+
+        ptr = np.asarray(indptr[lo:hi + 1])
+        a, b = int(ptr[0]), int(ptr[-1])
+
+        return sparse.csr_matrix(
+            (np.asarray(data[a:b]), np.asarray(indices[a:b]), ptr - a),
+            shape=(hi - lo, self.n_features),
+        )
+
+    def _chunk_arrays(self, c: int):
+        arrays = self._arrays.get(c)
+        if arrays is None:
+            chunk_id = self._manifest["chunks"][c]["id"]
+            arrays = tuple(
+                np.load(self._array_path(chunk_id, name), mmap_mode="r")
+                for name in _ARRAYS
+            )
+            self._arrays[c] = arrays
+
+        return arrays
+
+    def _name_rows(self) -> dict[str, int]:
+        if self._rows is None:
+            self._rows = {name: i for i, name in enumerate(self.names())}
+
+        return self._rows
+
+    def _read_names(self, chunk_id: str) -> List[str]:
+        return json.loads(self._names_path(chunk_id).read_text())
+
+    def _array_path(self, chunk_id: str, name: str) -> Path:
+        return self.path / f"chunk-{chunk_id}.{name}.npy"
+
+    def _names_path(self, chunk_id: str) -> Path:
+        return self.path / f"chunk-{chunk_id}.names.json"
+
+    def _write_manifest(self):
+        tmp = self.path / (MANIFEST_FILE + ".tmp")
+        tmp.write_text(json.dumps(self._manifest, indent=2))
+        os.replace(tmp, self.path / MANIFEST_FILE)
+
+
+def hash_model(path: Union[str, Path]) -> str:
+    """
+    sha256 of a model file, or of every file in a native model
+    directory (by name and content).
+    """
+    path = Path(path)
+    digest = hashlib.sha256()
+
+    if path.is_dir():
+        files = sorted(p for p in path.iterdir() if p.is_file())
+    else:
+        files = [path]
+
+    for file in files:
+        if path.is_dir():
+            digest.update(file.name.encode() + b"\0")
+        with open(file, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+
+    return digest.hexdigest()
@@ -1,4 +1,26 @@
-from .core import tokenize, tokenize_batch
+from .core import (
+    AsmCorpus,
+    BatchTokens,
+    TokenizeStats,
+    iter_tokenize,
+    tokenize,
+    tokenize_batch,
+    tokenize_functions,
+    tokenize_lines,
+)
+from .encoded import EncodedCorpus, InstructionVocab
+from .function_cache import FunctionCache, FunctionCacheStats, get_function_cache
 
 __all__ = ["tokenize", 
-           "tokenize_batch",]
+           "tokenize_batch",
+           "tokenize_functions",
+           "tokenize_lines",
+           "iter_tokenize",
+           "AsmCorpus",
+           "BatchTokens",
+           "TokenizeStats",
+           "EncodedCorpus",
+           "InstructionVocab",
+           "FunctionCache",
+           "FunctionCacheStats",
+           "get_function_cache",]
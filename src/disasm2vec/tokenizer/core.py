@@ -1,23 +1,118 @@
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple
+from disasm2vec.disassembler.objdump import is_builtin_function
 from .cleaner import is_instruction_line
+from .function_cache import FunctionCache, function_key
 from .normalizer import normalize_operand
 
 
 BYTE_PATTERN = re.compile(r"^[0-9a-fA-F]{2}$")
 MNEMONIC_PATTERN = re.compile(r"^[a-zA-Z][a-zA-Z0-9]*$")
+BYTES_FIELD = re.compile(r"\s*(?:[0-9a-fA-F]{2}\s+)*[0-9a-fA-F]{2}\s*")
 FUNCTION_HEADER = re.compile(r"<(.+?)>:")
 
 
 def tokenize_instruction(line: str, keep_register: bool = False):
-    line = line.split("#", 1)[0]
+    """
+    Tokenize one objdump instruction line into
+    [mnemonic, operand, ...].
+
+    Lines in objdump's column layout (``addr:<TAB>bytes<TAB>insn``)
+    are lexed in a single pass over the instruction field, memoized
+    per instruction text; anything else goes through the generic
+    token-by-token parser. Both produce identical output.
+    """
+    if "#" in line:
+        line = line.split("#", 1)[0]
+
+    _, sep, rest = line.partition(":")
 
-    if ":" not in line:
+    if not sep:
         return None
 
-    _, rest = line.split(":", 1)
-    tokens = rest.strip().split()
+    fields = rest.split("\t")
+
+    if (
+        2 <= len(fields) <= 3
+        and not fields[0].strip()
+        and BYTES_FIELD.fullmatch(fields[1])
+    ):
+        # Continuation line holding only raw bytes.
+        if len(fields) == 2 or not fields[2].strip():
+            return None
+
+        result = _lex_instruction_field(fields[2], keep_register)
+
+        if result is not _GENERIC:
+            return list(result) if result else None
+
+    result = _parse_generic(rest.split(), keep_register)
+
+    return list(result) if result else None
+
+
+# Returned by _lex_instruction_field for lines the generic parser
+# has to handle.
+_GENERIC = object()
+
+
+@lru_cache(maxsize=1 << 16)
+def _lex_instruction_field(insn: str, keep_register: bool):
+    # Keyed on the instruction column alone: unlike the address and
+    # raw bytes, its text repeats throughout a listing.
+    head = insn.split(None, 1)
+
+    # A mnemonic that looks like a hex byte would be swallowed by
+    # the byte-skipping loop of the generic parser; let it decide.
+    if BYTE_PATTERN.match(head[0]):
+        return _GENERIC
+
+    return _lex_instruction(head, keep_register)
+
+
+def _lex_instruction(
+    head: list[str],
+    keep_register: bool,
+) -> tuple[str, ...] | None:
+    mnemonic = head[0].lower()
+
+    if not (
+        mnemonic.isascii()
+        and mnemonic.isalnum()
+        and mnemonic[0].isalpha()
+    ):
+        return None
+
+    if mnemonic == "call":
+        return (mnemonic, "FUNC")
+
+    if mnemonic.startswith("j"):
+        return (mnemonic, "JMP")
+
+    if len(head) == 1:
+        return (mnemonic,)
+
+    operand_str = " ".join(head[1].split())
 
+    return (mnemonic,) + tuple(
+        normalize_operand(op.strip(), keep_register=keep_register)
+        for op in operand_str.split(",")
+    )
+
+
+def _parse_generic(
+    tokens: list[str],
+    keep_register: bool,
+) -> tuple[str, ...] | None:
+    """
+    Token-by-token parser for line bodies that do not follow
+    objdump's tab-separated column layout.
+    """
     if not tokens:
         return None
 
@@ -37,11 +132,11 @@ def tokenize_instruction(line: str, keep_register: bool = False):
 
     if mnemonic == "call":
         result.append("FUNC")
-        return result
+        return tuple(result)
 
     if mnemonic.startswith("j"):
         result.append("JMP")
-        return result
+        return tuple(result)
 
     if operand_str:
         operands = [op.strip() for op in operand_str.split(",")]
@@ -50,23 +145,27 @@ def tokenize_instruction(line: str, keep_register: bool = False):
                 normalize_operand(op, keep_register=keep_register)
             )
 
-    return result
+    return tuple(result)
 
 
 def _split_functions(path: Path) -> dict[str, list[str]]:
+    with path.open() as f:
+        return _split_function_lines(f)
+
+
+def _split_function_lines(lines: Iterable[str]) -> dict[str, list[str]]:
     functions = {}
     current = None
 
-    with path.open() as f:
-        for line in f:
-            header = FUNCTION_HEADER.search(line)
-            if header:
-                current = header.group(1)
-                functions[current] = []
-                continue
+    for line in lines:
+        header = FUNCTION_HEADER.search(line)
+        if header:
+            current = header.group(1)
+            functions[current] = []
+            continue
 
-            if current and is_instruction_line(line):
-                functions[current].append(line)
+        if current and is_instruction_line(line):
+            functions[current].append(line)
 
     return functions
 
@@ -81,11 +180,95 @@ def _extract_call_target(line: str) -> str | None:
     return None
 
 
+class _FunctionBody(NamedTuple):
+    """
+    Tokenized function body.
+
+    ``tokens`` holds one joined token string per instruction and
+    ``calls`` lists ``(index, callee)`` for every call site with a
+    resolvable, non-PLT target.
+    """
+    tokens: list[str]
+    calls: list[tuple[int, str]]
+
+
+class _FunctionTable:
+    """
+    Raw function listings plus their lazily tokenized bodies.
+
+    Each function is tokenized at most once, no matter how many times
+    (or from how many entries) it is inlined. With a FunctionCache,
+    bodies already tokenized in other listings are reused too.
+    """
+
+    def __init__(
+        self,
+        functions: dict[str, list[str]],
+        keep_register: bool,
+        cache: FunctionCache | None = None,
+    ):
+        self.functions = functions
+        self.keep_register = keep_register
+        self.cache = cache
+        self._bodies: dict[str, _FunctionBody] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.functions
+
+    def body(self, name: str) -> _FunctionBody:
+        body = self._bodies.get(name)
+
+        if body is None:
+            lines = self.functions.get(name, [])
+
+            if self.cache is None:
+                body = _tokenize_body(lines, self.keep_register)
+            else:
+                key = function_key(lines, self.keep_register)
+                body = self.cache.get(key)
+
+                if body is None:
+                    body = _tokenize_body(lines, self.keep_register)
+                    self.cache.put(key, body)
+                elif not isinstance(body, _FunctionBody):
+                    # loaded from disk as a plain tuple
+                    body = _FunctionBody._make(body)
+
+            self._bodies[name] = body
+
+        return body
+
+
+def _tokenize_body(lines: list[str], keep_register: bool) -> _FunctionBody:
+    tokens = []
+    calls = []
+
+    for line in lines:
+        instruction = tokenize_instruction(
+            line,
+            keep_register=keep_register,
+        )
+
+        if not instruction:
+            continue
+
+        if instruction[0] == "call":
+            callee = _extract_call_target(line)
+
+            if callee and "@plt" not in callee:
+                calls.append((len(tokens), callee))
+
+        tokens.append(" ".join(instruction))
+
+    return _FunctionBody(tokens, calls)
+
+
 def _expand_function(
     func_name: str,
-    functions: dict[str, list[str]],
-    keep_register: bool,
+    table: _FunctionTable,
     visited: set,
+    stats: "TokenizeStats | None" = None,
+    depth: int = 1,
 ) -> list[str]:
     """
     Inline user-defined function bodies at call sites.
@@ -95,73 +278,441 @@ def _expand_function(
 
     visited.add(func_name)
 
-    result = []
+    if stats is not None:
+        stats.inline_depth = max(stats.inline_depth, depth)
 
-    for line in functions.get(func_name, []):
-        tokens = tokenize_instruction(
-            line,
-            keep_register=keep_register,
-        )
+    body = table.body(func_name)
+    result = []
+    start = 0
 
-        if not tokens:
+    for index, callee in body.calls:
+        if callee not in table:
             continue
 
-        if tokens[0] == "call":
-            callee = _extract_call_target(line)
+        if stats is not None and callee not in visited:
+            stats.inlined_calls += 1
+
+        result.extend(body.tokens[start:index])
+        result.extend(
+            _expand_function(callee, table, visited, stats, depth + 1)
+        )
+        start = index + 1
 
-            if (
-                callee
-                and "@plt" not in callee
-                and callee in functions
-            ):
-                result.extend(
-                    _expand_function(
-                        callee,
-                        functions,
-                        keep_register,
-                        visited,
-                    )
-                )
-                continue
-
-        result.append(" ".join(tokens))
+    result.extend(body.tokens[start:])
 
     return result
 
 
+@dataclass
+class TokenizeStats:
+    """
+    Counters and timings collected by tokenize / tokenize_lines
+    when a TokenizeStats is passed as ``stats``.
+
+    Values accumulate, so one instance can cover several calls.
+    ``asm_bytes`` is the encoded size of the listing, the same
+    whether it was read from a file or streamed. ``instructions``
+    counts the instructions of every function body reached from the
+    entry; ``inline_depth`` is the longest chain of inlined calls
+    (1 = the entry alone). Times are in seconds; CPU time is process
+    time.
+    """
+    asm_bytes: int = 0
+    functions: int = 0
+    instructions: int = 0
+    tokens: int = 0
+    inlined_calls: int = 0
+    inline_depth: int = 0
+    split_wall: float = 0.0
+    split_cpu: float = 0.0
+    expand_wall: float = 0.0
+    expand_cpu: float = 0.0
+
+
 def tokenize(
     path: str,
     keep_register: bool = False,
     entry: str = "main",
+    stats: TokenizeStats | None = None,
+    function_cache: FunctionCache | None = None,
 ) -> list[str]:
     """
     Parse file and inline user-defined function calls
     inside selected entry function.
+
+    Pass a FunctionCache to reuse function bodies tokenized in
+    earlier listings.
+    """
+    path = Path(path)
+
+    if stats is not None:
+        stats.asm_bytes += path.stat().st_size
+        with path.open() as f:
+            return _tokenize_with_stats(
+                f, keep_register, entry, stats, function_cache
+            )
+
+    functions = _split_functions(path)
+
+    return _tokenize_entry(functions, keep_register, entry, function_cache)
+
+
+def tokenize_lines(
+    lines: Iterable[str],
+    keep_register: bool = False,
+    entry: str = "main",
+    stats: TokenizeStats | None = None,
+    function_cache: FunctionCache | None = None,
+) -> list[str]:
+    """
+    Same as tokenize, but read the listing from an iterable of lines
+    (e.g. disassembler.disassemble_stream) instead of an .asm file.
+
+    With stats, the time spent producing the lines (e.g. a running
+    objdump) is part of ``split_wall``.
+    """
+    if stats is not None:
+        return _tokenize_with_stats(
+            _count_bytes(lines, stats),
+            keep_register,
+            entry,
+            stats,
+            function_cache,
+        )
+
+    functions = _split_function_lines(lines)
+
+    return _tokenize_entry(functions, keep_register, entry, function_cache)
+
+
+def _tokenize_with_stats(
+    lines: Iterable[str],
+    keep_register: bool,
+    entry: str,
+    stats: TokenizeStats,
+    function_cache: FunctionCache | None = None,
+) -> list[str]:
+    wall, cpu = time.perf_counter(), time.process_time()
+    functions = _split_function_lines(lines)
+    stats.split_wall += time.perf_counter() - wall
+    stats.split_cpu += time.process_time() - cpu
+
+    if entry not in functions:
+        raise ValueError(f"Function '{entry}' not found.")
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    table = _FunctionTable(functions, keep_register, function_cache)
+    tokens = _expand_function(entry, table, set(), stats)
+    stats.expand_wall += time.perf_counter() - wall
+    stats.expand_cpu += time.process_time() - cpu
+
+    stats.functions += len(functions)
+    stats.instructions += sum(
+        len(body.tokens) for body in table._bodies.values()
+    )
+    stats.tokens += len(tokens)
+
+    return tokens
+
+
+def _count_bytes(lines: Iterable[str], stats: TokenizeStats):
+    # Encoded size, to match st_size of the same listing on disk.
+    for line in lines:
+        stats.asm_bytes += (
+            len(line) if line.isascii() else len(line.encode())
+        )
+        yield line
+
+
+def tokenize_functions(
+    path: str,
+    entries: Iterable[str] | None = None,
+    keep_register: bool = False,
+    function_cache: FunctionCache | None = None,
+) -> dict[str, list[str]]:
+    """
+    Parse file once and build an inlined token document
+    for every requested entry function.
+
+    If entries is None, every non-runtime function in the
+    listing is used as an entry. Function bodies are tokenized
+    once and shared between all entries.
     """
     path = Path(path)
 
     functions = _split_functions(path)
 
+    if entries is None:
+        entries = [
+            name for name in functions
+            if not is_builtin_function(name)
+        ]
+    else:
+        entries = list(entries)
+
+        for entry in entries:
+            if entry not in functions:
+                raise ValueError(f"Function '{entry}' not found.")
+
+    table = _FunctionTable(functions, keep_register, function_cache)
+
+    return {
+        entry: _expand_function(entry, table, visited=set())
+        for entry in entries
+    }
+
+
+def _tokenize_entry(
+    functions: dict[str, list[str]],
+    keep_register: bool,
+    entry: str,
+    function_cache: FunctionCache | None = None,
+) -> list[str]:
     if entry not in functions:
         raise ValueError(f"Function '{entry}' not found.")
 
     return _expand_function(
         entry,
-        functions,
-        keep_register,
+        _FunctionTable(functions, keep_register, function_cache),
         visited=set(),
     )
 
 
+class BatchTokens(dict):
+    """
+    Result of tokenize_batch: file name -> token document,
+    in sorted file order.
+
+    Files that failed under ``on_error="collect"`` are left out
+    and reported in ``errors`` (file name -> error message).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.errors: dict[str, str] = {}
+
+
+ON_ERROR_POLICIES = ("raise", "skip", "collect")
+
+
 def tokenize_batch(
     asm_dir: str,
     keep_register: bool = False,
     entry: str = "main",
-) -> dict[str, list[str]]:
+    workers: int = 1,
+    chunksize: int | None = None,
+    on_error: str = "raise",
+    function_cache: FunctionCache | None = None,
+) -> BatchTokens:
     """
     Parse all .asm files in a folder.
     Each file processed independently.
+
+    Parameters
+    ----------
+    asm_dir : str
+        Folder containing .asm files
+    keep_register : bool
+        Keep register names instead of abstracting them to REG
+    entry : str
+        Entry function to inline from
+    workers : int
+        Number of worker processes; 1 tokenizes in this process
+    chunksize : int | None
+        Files handed to a worker at a time
+        (defaults to an even split into 4 chunks per worker)
+    on_error : str
+        "raise" re-raises the first failure, "skip" drops failed
+        files, "collect" drops them and records the error in
+        the result's ``errors``.
+    function_cache : FunctionCache | None
+        Share tokenized function bodies between the files. Worker
+        processes start from a copy of the cache; the bodies they
+        add are merged back into it.
+    """
+    _check_on_error(on_error, ON_ERROR_POLICIES)
+
+    asm_files = _list_asm_files(asm_dir)
+
+    result = BatchTokens()
+
+    if workers == 1:
+        jobs = [
+            (asm_file, keep_register, entry, on_error, function_cache)
+            for asm_file in asm_files
+        ]
+        _collect_batch(result, asm_files, map(_tokenize_file, jobs), on_error)
+        return result
+
+    # Workers get the cache once, through the pool initializer.
+    jobs = [
+        (asm_file, keep_register, entry, on_error, None)
+        for asm_file in asm_files
+    ]
+
+    if chunksize is None:
+        chunksize = max(1, len(jobs) // (workers * 4))
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_batch_worker,
+        initargs=(function_cache,),
+    ) as executor:
+        try:
+            outcomes = executor.map(
+                _tokenize_pool_file, jobs, chunksize=chunksize
+            )
+            _collect_batch(
+                result,
+                asm_files,
+                _merge_new_bodies(outcomes, function_cache),
+                on_error,
+            )
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+
+    return result
+
+
+def _collect_batch(
+    result: BatchTokens,
+    asm_files: list[Path],
+    outcomes: Iterable[tuple[list[str] | None, str | None]],
+    on_error: str,
+):
+    for asm_file, (tokens, error) in zip(asm_files, outcomes):
+        if error is None:
+            result[asm_file.name] = tokens
+        elif on_error == "collect":
+            result.errors[asm_file.name] = error
+
+
+def _merge_new_bodies(
+    outcomes: Iterable[tuple],
+    function_cache: FunctionCache | None,
+) -> Iterator[tuple[list[str] | None, str | None]]:
+    for tokens, error, delta in outcomes:
+        if delta is not None:
+            new_bodies, stats = delta
+            function_cache.update(new_bodies)
+            function_cache.merge_stats(stats)
+        yield tokens, error
+
+
+# Function cache of a tokenize_batch worker process.
+_worker_function_cache: FunctionCache | None = None
+
+
+def _init_batch_worker(function_cache: FunctionCache | None):
+    global _worker_function_cache
+    _worker_function_cache = function_cache
+
+
+def _tokenize_file(job: tuple) -> tuple[list[str] | None, str | None]:
+    asm_file, keep_register, entry, on_error, function_cache = job
+
+    try:
+        return tokenize(
+            asm_file,
+            keep_register=keep_register,
+            entry=entry,
+            function_cache=function_cache,
+        ), None
+    except Exception as e:
+        if on_error == "raise":
+            raise
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _tokenize_pool_file(job: tuple) -> tuple:
+    """
+    _tokenize_file in a worker process, with the worker's copy of
+    the function cache. Also returns the bodies it added and its
+    lookup stats for the file, for merging into the parent's cache.
     """
+    function_cache = _worker_function_cache
+
+    if function_cache is None:
+        return _tokenize_file(job[:4] + (None,)) + (None,)
+
+    before = function_cache.stats()
+    tokens, error = _tokenize_file(job[:4] + (function_cache,))
+
+    return tokens, error, (
+        function_cache.take_new(),
+        function_cache.stats().delta(before),
+    )
+
+
+def iter_tokenize(
+    asm_dir: str,
+    keep_register: bool = False,
+    entry: str = "main",
+    on_error: str = "raise",
+    function_cache: FunctionCache | None = None,
+) -> Iterator[tuple[str, list[str]]]:
+    """
+    Lazily tokenize all .asm files in a folder, yielding
+    (file name, tokens) one file at a time in sorted order.
+
+    on_error is "raise" or "skip".
+    """
+    _check_on_error(on_error, ("raise", "skip"))
+
+    for asm_file in _list_asm_files(asm_dir):
+        tokens, _ = _tokenize_file(
+            (asm_file, keep_register, entry, on_error, function_cache)
+        )
+
+        if tokens is not None:
+            yield asm_file.name, tokens
+
+
+class AsmCorpus:
+    """
+    Re-iterable stream of token documents from an .asm folder.
+
+    Every pass re-tokenizes the files lazily (see iter_tokenize),
+    so the corpus is never held in memory. Suitable as the source
+    for a two-pass Tfidf.fit_transform. With a FunctionCache, later
+    passes reuse the function bodies tokenized by earlier ones.
+    """
+
+    def __init__(
+        self,
+        asm_dir: str,
+        keep_register: bool = False,
+        entry: str = "main",
+        on_error: str = "raise",
+        function_cache: FunctionCache | None = None,
+    ):
+        _check_on_error(on_error, ("raise", "skip"))
+
+        self.asm_dir = asm_dir
+        self.keep_register = keep_register
+        self.entry = entry
+        self.on_error = on_error
+        self.function_cache = function_cache
+
+    def __iter__(self) -> Iterator[list[str]]:
+        for _, tokens in iter_tokenize(
+            self.asm_dir,
+            keep_register=self.keep_register,
+            entry=self.entry,
+            on_error=self.on_error,
+            function_cache=self.function_cache,
+        ):
+            yield tokens
+
+    def names(self) -> list[str]:
+        """
+        File names in iteration order (before any skipped failures).
+        """
+        return [p.name for p in _list_asm_files(self.asm_dir)]
+
+
+def _list_asm_files(asm_dir: str) -> list[Path]:
     asm_dir = Path(asm_dir)
 
     if not asm_dir.exists():
@@ -172,13 +723,11 @@ def tokenize_batch(
     if not asm_files:
         raise ValueError(f"No .asm files found in {asm_dir}")
 
-    result: dict[str, list[str]] = {}
+    return asm_files
 
-    for asm_file in asm_files:
-        result[asm_file.name] = tokenize(
-            asm_file,
-            keep_register=keep_register,
-            entry=entry,
-        )
 
-    return result
+def _check_on_error(on_error: str, allowed: tuple[str, ...]):
+    if on_error not in allowed:
+        raise ValueError(
+            f"on_error must be one of {allowed}, got {on_error!r}"
+        )
@@ -0,0 +1,191 @@
+import json
+from pathlib import Path
+from typing import Iterable, Iterator, List, Sequence, Union
+
+import numpy as np
+
+
+FORMAT_NAME = "disasm2vec-encoded-corpus"
+FORMAT_VERSION = 1
+
+META_FILE = "meta.json"
+VOCAB_FILE = "vocab.txt"
+TOKENS_FILE = "tokens.bin"
+OFFSETS_FILE = "offsets.npy"
+NAMES_FILE = "names.json"
+
+# tokens.bin is little-endian int32 whatever the host byte order
+TOKEN_DTYPE = np.dtype("<i4")
+
+
+class InstructionVocab:
+    """
+    Interning table mapping normalized instructions
+    (e.g. "mov REG MEM") to dense int ids, in order of first use.
+    """
+
+    def __init__(self, tokens: Iterable[str] = ()):
+        self.tokens: List[str] = []
+        self.ids: dict[str, int] = {}
+
+        for token in tokens:
+            self.intern(token)
+
+    def intern(self, token: str) -> int:
+        token_id = self.ids.get(token)
+
+        if token_id is None:
+            if "\n" in token:
+                raise ValueError(f"Token contains a newline: {token!r}")
+            token_id = len(self.tokens)
+            self.tokens.append(token)
+            self.ids[token] = token_id
+
+        return token_id
+
+    def encode(self, document: Sequence[str]) -> np.ndarray:
+        intern = self.intern
+        return np.fromiter(
+            (intern(token) for token in document),
+            dtype=np.int32,
+            count=len(document),
+        )
+
+    def decode(self, ids: Iterable[int]) -> List[str]:
+        tokens = self.tokens
+        return [tokens[i] for i in ids]
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self.ids
+
+    def save(self, path: Union[str, Path]):
+        Path(path).write_text("\n".join(self.tokens), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "InstructionVocab":
+        text = Path(path).read_text(encoding="utf-8")
+        return cls(text.split("\n") if text else [])
+
+
+class EncodedCorpus:
+    """
+    Tokenized corpus stored as int32 instruction ids.
+
+    A corpus directory holds every document's ids back to back in
+    ``tokens.bin`` (raw little-endian int32), document boundaries in
+    ``offsets.npy``, the instruction vocabulary in ``vocab.txt``
+    (line number = id) and document names in ``names.json``.
+    ``tokens.bin`` is memory-mapped, so opening a corpus is cheap and
+    documents are read on access.
+
+    Iterating yields decoded documents (List[str]), so an
+    EncodedCorpus can be passed anywhere a re-iterable corpus is
+    accepted; Tfidf.fit/transform also read the ids directly.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+        meta = json.loads((self.path / META_FILE).read_text())
+        if meta.get("format") != FORMAT_NAME:
+            raise ValueError(f"Not an encoded corpus: {path}")
+
+        self.vocab = InstructionVocab.load(self.path / VOCAB_FILE)
+        self.offsets = np.load(self.path / OFFSETS_FILE)
+
+        if meta["n_tokens"]:
+            self.tokens = np.memmap(
+                self.path / TOKENS_FILE,
+                dtype=TOKEN_DTYPE,
+                mode="r",
+                shape=(meta["n_tokens"],),
+            )
+        else:
+            self.tokens = np.zeros(0, dtype=TOKEN_DTYPE)
+
+        self._names = json.loads((self.path / NAMES_FILE).read_text())
+
+    @classmethod
+    def write(
+        cls,
+        path: Union[str, Path],
+        documents: Iterable[Sequence[str]],
+        names: Sequence[str] | None = None,
+        vocab: InstructionVocab | None = None,
+    ) -> "EncodedCorpus":
+        """
+        Encode documents (streamed, one at a time) into a corpus
+        directory and open it.
+
+        Names default to the document index. Pass an existing vocab
+        to keep ids compatible with another corpus.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        vocab = vocab or InstructionVocab()
+        offsets = [0]
+
+        with open(path / TOKENS_FILE, "wb") as f:
+            for document in documents:
+                if isinstance(document, str):
+                    raise TypeError(
+                        "Each document must be a list of tokens, not a string"
+                    )
+                ids = vocab.encode(document)
+                f.write(ids.astype(TOKEN_DTYPE, copy=False).tobytes())
+                offsets.append(offsets[-1] + len(ids))
+
+        n_documents = len(offsets) - 1
+        names = list(names) if names is not None else [
+            str(i) for i in range(n_documents)
+        ]
+        if len(names) != n_documents:
+            raise ValueError(
+                f"Got {len(names)} names for {n_documents} documents"
+            )
+
+        np.save(path / OFFSETS_FILE, np.asarray(offsets, dtype=np.int64))
+        vocab.save(path / VOCAB_FILE)
+        (path / NAMES_FILE).write_text(json.dumps(names))
+        (path / META_FILE).write_text(
+            json.dumps(
+                {
+                    "format": FORMAT_NAME,
+                    "format_version": FORMAT_VERSION,
+                    "n_documents": n_documents,
+                    "n_tokens": offsets[-1],
+                    "vocab_size": len(vocab),
+                },
+                indent=2,
+            )
+        )
+
+        return cls(path)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def ids(self, index: int) -> np.ndarray:
+        """
+        Instruction ids of one document (a view of the memory map).
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        return self.tokens[self.offsets[index]:self.offsets[index + 1]]
+
+    def __getitem__(self, index: int) -> List[str]:
+        return self.vocab.decode(self.ids(index))
+
+    def __iter__(self) -> Iterator[List[str]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def names(self) -> List[str]:
+        return list(self._names)
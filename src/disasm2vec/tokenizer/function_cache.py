@@ -0,0 +1,272 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Iterable
+
+
+FORMAT_NAME = "disasm2vec-function-cache"
+FORMAT_VERSION = 1
+
+DEFAULT_MAX_ENTRIES = 1 << 20
+
+# "  1149:\tf3 0f 1e fa          \t" address and raw byte columns
+_ADDRESS_BYTES = re.compile(
+    r"^[ \t]*[0-9a-fA-F]+:\t(?:[0-9a-fA-F]{2} )+[ \t]*",
+    re.M,
+)
+# Comment text before its first "<"; call targets are read from the
+# "<symbol>" part, the rest never reaches a token.
+_COMMENT = re.compile(r"#[^<\n]*")
+# Target address of a call / jump ("call   1129 <f>"); these become
+# FUNC / JMP whatever the address, so it is dropped.
+_BRANCH_TARGET = re.compile(
+    r"^(:\t(?:call|j[a-z0-9]*)[ \t]+)[0-9a-fA-F]+ <",
+    re.M,
+)
+# Hex literals outside "<symbol+0x10>"
+_HEX = re.compile(r"0x[0-9a-fA-F]+(?![^<\n]*>)")
+
+
+def function_key(lines: Iterable[str], keep_register: bool) -> str:
+    """
+    Content hash of a function listing with its addresses masked.
+
+    Address and raw byte columns, call / jump target addresses and
+    comments (up to the symbol they name) are dropped and every hex
+    literal becomes ``0x0``. None of these change the tokens or call
+    sites the tokenizer extracts (a hex literal always normalizes to
+    the same operand class), so the same function found at different
+    addresses in different binaries gets the same key.
+    """
+    text = _ADDRESS_BYTES.sub(":\t", "\n".join(lines))
+
+    if "#" in text:
+        text = _COMMENT.sub("#", text)
+
+    text = _BRANCH_TARGET.sub(r"\1<", text)
+    text = _HEX.sub("0x0", text)
+
+    digest = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    return f"{int(keep_register)}{digest}"
+
+
+@dataclass
+class FunctionCacheStats:
+    """
+    ``hits`` and ``misses`` count function body lookups;
+    ``instructions_saved`` counts the instructions that hits did not
+    have to tokenize again.
+    """
+    hits: int = 0
+    misses: int = 0
+    instructions_saved: int = 0
+    evictions: int = 0
+
+    def merge(self, other: "FunctionCacheStats"):
+        self.hits += other.hits
+        self.misses += other.misses
+        self.instructions_saved += other.instructions_saved
+        self.evictions += other.evictions
+
+    def delta(self, before: "FunctionCacheStats") -> "FunctionCacheStats":
+        return FunctionCacheStats(
+            hits=self.hits - before.hits,
+            misses=self.misses - before.misses,
+            instructions_saved=self.instructions_saved
+            - before.instructions_saved,
+            evictions=self.evictions - before.evictions,
+        )
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class FunctionCache:
+    """
+    Cross-binary cache of tokenized function bodies.
+
+    Maps function_key of a function listing to its tokens and call
+    sites, so functions repeated across binaries (statically linked
+    helpers, shared utility code, template instantiations) are
+    tokenized once. Least recently used entries beyond ``max_entries``
+    are evicted.
+
+    With a ``path`` the cache starts from the entries saved there and
+    save() writes it back. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_entries: int | None = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = Path(path) if path is not None else None
+        self.max_entries = max_entries
+
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        self._new: dict[str, tuple] = {}
+        self._stats = FunctionCacheStats()
+        self._lock = threading.Lock()
+
+        if self.path is not None and self.path.exists():
+            self.load(self.path)
+
+    # LOOKUP
+    def get(self, key: str) -> tuple | None:
+        """
+        Return the cached (tokens, calls) for key, or None on a miss.
+        """
+        with self._lock:
+            body = self._entries.get(key)
+
+            if body is None:
+                self._stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            self._stats.instructions_saved += len(body[0])
+
+            return body
+
+    def put(self, key: str, body: tuple):
+        with self._lock:
+            self._entries[key] = body
+            self._new[key] = body
+            self._evict()
+
+    def update(self, entries: dict[str, tuple]):
+        """
+        Add entries (e.g. collected from worker processes) without
+        counting them as lookups or as new.
+        """
+        with self._lock:
+            self._entries.update(entries)
+            self._evict()
+
+    def take_new(self) -> dict[str, tuple]:
+        """
+        Return and forget the entries put since the last call.
+        """
+        with self._lock:
+            new, self._new = self._new, {}
+            return new
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._new.clear()
+
+    # STATS
+    def stats(self) -> FunctionCacheStats:
+        return replace(self._stats)
+
+    def merge_stats(self, stats: FunctionCacheStats):
+        self._stats.merge(stats)
+
+    def reset_stats(self):
+        self._stats = FunctionCacheStats()
+
+    # PERSISTENCE
+    def save(self, path: str | Path | None = None):
+        """
+        Write all entries as JSON (atomically) to path, or to the
+        path the cache was created with.
+        """
+        path = Path(path) if path is not None else self.path
+        if path is None:
+            raise ValueError("No path to save the function cache to")
+
+        with self._lock:
+            entries = {
+                key: [tokens, calls]
+                for key, (tokens, calls) in self._entries.items()
+            }
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(
+                    {
+                        "format": FORMAT_NAME,
+                        "format_version": FORMAT_VERSION,
+                        "entries": entries,
+                    },
+                    f,
+                )
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def load(self, path: str | Path):
+        """
+        Merge the entries saved at path into this cache.
+        """
+        data = json.loads(Path(path).read_text())
+
+        if data.get("format") != FORMAT_NAME:
+            raise ValueError(f"Not a function cache: {path}")
+
+        if data.get("format_version") != FORMAT_VERSION:
+            # Written by an incompatible tokenizer; start over.
+            return
+
+        self.update(
+            {
+                key: (tokens, [tuple(call) for call in calls])
+                for key, (tokens, calls) in data["entries"].items()
+            }
+        )
+
+    # INTERNAL
+    def _evict(self):
+        if self.max_entries is None:
+            return
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+_CACHES: dict[str | None, FunctionCache] = {}
+
+
+def get_function_cache(path: str | Path | None = None) -> FunctionCache:
+    """
+    Return the process-wide FunctionCache for path (loaded from it
+    on first use), or the in-memory one when path is None.
+    """
+    key = str(Path(path).resolve()) if path is not None else None
+
+    cache = _CACHES.get(key)
+    if cache is None:
+        cache = FunctionCache(key)
+        _CACHES[key] = cache
+
+    return cache
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 
 REGISTER_PATTERN = re.compile(r"%([a-zA-Z0-9]+)")
 IMMEDIATE_PATTERN = re.compile(r"\$0x[0-9a-fA-F]+|\$\d+")
@@ -10,17 +11,25 @@ MEMORY_PATTERN = re.compile(
 SYMBOL_PATTERN = re.compile(r"<.*?>")
 
 
+@lru_cache(maxsize=1 << 16)
 def normalize_operand(operand: str, keep_register: bool = False) -> str:
-    operand = SYMBOL_PATTERN.sub("", operand)
+    # Each pattern needs a specific marker character, so a cheap
+    # substring check skips regexes that cannot match.
+    if "<" in operand:
+        operand = SYMBOL_PATTERN.sub("", operand)
 
-    if MEMORY_PATTERN.search(operand):
+    if (
+        ("(" in operand or "0x" in operand or ":" in operand)
+        and MEMORY_PATTERN.search(operand)
+    ):
         return "MEM"
 
-    if IMMEDIATE_PATTERN.search(operand):
+    if "$" in operand and IMMEDIATE_PATTERN.search(operand):
         return "IMM"
 
-    m = REGISTER_PATTERN.search(operand)
-    if m:
-        return m.group(1).lower() if keep_register else "REG"
+    if "%" in operand:
+        m = REGISTER_PATTERN.search(operand)
+        if m:
+            return m.group(1).lower() if keep_register else "REG"
 
     return operand
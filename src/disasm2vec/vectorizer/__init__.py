@@ -1,5 +1,17 @@
 from .base import VectorizerBase
 from .tfidf import Tfidf
+from .hashing import HashingTfidf
 from .factory import get_vectorizer, load_vectorizer
+from .registry import ModelRegistry, get_model_registry
+from .dedup import unique_documents
 
-__all__ = ["VectorizerBase", "Tfidf", "get_vectorizer", "load_vectorizer"]
+__all__ = [
+    "VectorizerBase",
+    "Tfidf",
+    "HashingTfidf",
+    "get_vectorizer",
+    "load_vectorizer",
+    "ModelRegistry",
+    "get_model_registry",
+    "unique_documents",
+]
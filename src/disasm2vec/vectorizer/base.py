@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Union
+from typing import Iterable, Iterator, List, Union
 from pathlib import Path
 
 class VectorizerBase(ABC):
@@ -48,3 +48,33 @@ class VectorizerBase(ABC):
         Load the vectorizer from a file.
         """
         pass
+
+    def _iter_docs(self, docs) -> Iterator[List[str]]:
+        """
+        Lazily validate a stream of documents.
+        """
+        if isinstance(docs, str) or not isinstance(docs, Iterable):
+            raise TypeError("documents must be iterable")
+
+        for d in docs:
+            if not isinstance(d, list):
+                raise TypeError(
+                    "Each document must be List[str]"
+                )
+            yield d
+
+    def _validate_docs(self, docs):
+        if not isinstance(docs, Iterable):
+            raise TypeError("documents must be iterable")
+
+        for d in docs:
+            if not isinstance(d, list):
+                raise TypeError(
+                    "Each document must be List[str]"
+                )
+
+    def _check_fitted(self):
+        if not self._fitted:
+            raise RuntimeError(
+                "Vectorizer not fitted. Call fit() first."
+            )
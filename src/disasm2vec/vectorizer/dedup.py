@@ -0,0 +1,31 @@
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+def unique_documents(
+    documents: Sequence[Sequence[str]],
+) -> Tuple[List[Sequence[str]], np.ndarray]:
+    """
+    Drop exact duplicate documents.
+
+    Returns the distinct documents, in order of first appearance, and
+    for every input document the index of its copy among them, so a
+    matrix computed from the distinct documents expands back with
+    ``X[inverse]``.
+    """
+    index: dict[tuple, int] = {}
+    unique = []
+    inverse = np.empty(len(documents), dtype=np.intp)
+
+    for i, document in enumerate(documents):
+        key = tuple(document)
+        j = index.get(key)
+
+        if j is None:
+            j = index[key] = len(unique)
+            unique.append(document)
+
+        inverse[i] = j
+
+    return unique, inverse
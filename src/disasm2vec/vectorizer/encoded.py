@@ -0,0 +1,154 @@
+from collections import Counter
+from typing import Iterator, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from disasm2vec.tokenizer.encoded import EncodedCorpus
+
+from .stats import DocumentStats
+
+
+# Tokens handled per block when building n-gram keys.
+_BLOCK_TOKENS = 1 << 22
+
+
+def encoded_stats(
+    corpus: EncodedCorpus,
+    ngram_range: Tuple[int, int],
+) -> DocumentStats:
+    """
+    Count n-gram document and term frequencies of an encoded corpus
+    with numpy, giving the same DocumentStats as streaming its
+    decoded documents through the sklearn analyzer.
+    """
+    df: Counter = Counter()
+    tf: Counter = Counter()
+
+    for rows, keys in _ngram_keys(corpus, ngram_range):
+        if not len(keys):
+            continue
+
+        uniq, inverse = np.unique(keys, return_inverse=True)
+        tf.update(dict(zip(uniq.tolist(), np.bincount(inverse).tolist())))
+
+        pairs = np.unique(rows * len(uniq) + inverse)
+        doc_freq = np.bincount(pairs % len(uniq), minlength=len(uniq))
+        df.update(dict(zip(uniq.tolist(), doc_freq.tolist())))
+
+    base = len(corpus.vocab) + 1
+
+    stats = DocumentStats()
+    for key, count in df.items():
+        term = _decode_key(key, base, corpus.vocab.tokens)
+        stats.df[term] = count
+        stats.tf[term] = tf[key]
+    stats.n_documents = len(corpus)
+
+    return stats
+
+
+def encoded_counts(
+    corpus: EncodedCorpus,
+    vocabulary: dict[str, int],
+    ngram_range: Tuple[int, int],
+    dtype=np.float64,
+) -> sparse.csr_matrix:
+    """
+    Document-term count matrix of an encoded corpus over a fitted
+    vocabulary (n-gram string -> column).
+    """
+    base = len(corpus.vocab) + 1
+    columns: dict[int, int] = {}
+    all_rows, all_cols = [], []
+
+    for rows, keys in _ngram_keys(corpus, ngram_range):
+        uniq, inverse = np.unique(keys, return_inverse=True)
+
+        cols = np.empty(len(uniq), dtype=np.int64)
+        for i, key in enumerate(uniq.tolist()):
+            col = columns.get(key)
+            if col is None:
+                term = _decode_key(key, base, corpus.vocab.tokens)
+                col = columns[key] = vocabulary.get(term, -1)
+            cols[i] = col
+
+        cols = cols[inverse]
+        keep = cols >= 0
+
+        all_rows.append(rows[keep])
+        all_cols.append(cols[keep])
+
+    rows = np.concatenate(all_rows) if all_rows else np.zeros(0, np.int64)
+    cols = np.concatenate(all_cols) if all_cols else np.zeros(0, np.int64)
+
+    X = sparse.coo_matrix(
+        (np.ones(len(rows), dtype=dtype), (rows, cols)),
+        shape=(len(corpus), len(vocabulary)),
+    ).tocsr()
+    X.sum_duplicates()
+    X.sort_indices()
+
+    return X
+
+
+def _ngram_keys(
+    corpus: EncodedCorpus,
+    ngram_range: Tuple[int, int],
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield (document row, n-gram key) arrays, in blocks of documents.
+
+    An n-gram of ids (a, b, c) gets the key (a+1)*B**2 + (b+1)*B + (c+1)
+    with B = vocabulary size + 1, which is unique across n-gram
+    lengths.
+    """
+    min_n, max_n = ngram_range
+    base = len(corpus.vocab) + 1
+
+    if base ** max_n >= 2 ** 63:
+        raise ValueError(
+            "Vocabulary too large for int64 n-gram keys "
+            f"({len(corpus.vocab)} instructions, n={max_n})"
+        )
+
+    offsets = corpus.offsets
+    n_docs = len(corpus)
+    start = 0
+
+    while start < n_docs:
+        # Take whole documents up to roughly _BLOCK_TOKENS tokens.
+        limit = offsets[start] + _BLOCK_TOKENS
+        stop = int(np.searchsorted(offsets, limit, side="right")) - 1
+        stop = min(max(stop, start + 1), n_docs)
+
+        lo, hi = offsets[start], offsets[stop]
+        ids = np.asarray(corpus.tokens[lo:hi], dtype=np.int64) + 1
+        ends = offsets[start + 1:stop + 1] - lo
+        lengths = np.diff(offsets[start:stop + 1])
+        rows = np.repeat(np.arange(start, stop, dtype=np.int64), lengths)
+        doc_end = np.repeat(ends, lengths)
+
+        for n in range(min_n, max_n + 1):
+            if len(ids) < n:
+                break
+
+            count = len(ids) - n + 1
+            keys = ids[:count].copy()
+            for j in range(1, n):
+                keys *= base
+                keys += ids[j:j + count]
+
+            valid = np.arange(count) + n <= doc_end[:count]
+            yield rows[:count][valid], keys[valid]
+
+        start = stop
+
+
+def _decode_key(key: int, base: int, tokens: list[str]) -> str:
+    parts = []
+    while key:
+        key, digit = divmod(key, base)
+        parts.append(tokens[digit - 1])
+
+    return " ".join(reversed(parts))
@@ -1,6 +1,9 @@
 import os
 
 from .base import VectorizerBase
+from .hashing import HashingTfidf
+from .native import is_native_model, read_meta
+from .registry import get_model_registry, load_model
 from .tfidf import Tfidf
 
 _CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -14,14 +17,34 @@ def get_vectorizer(model_type: str = "tfidf", **kwargs) -> VectorizerBase:
     """
     if model_type == "tfidf":
         return Tfidf(**kwargs)
+    elif model_type == "hashing":
+        return HashingTfidf(**kwargs)
     else:
         raise ValueError(f"Unknown vectorizer type: {model_type}")
 
-def load_vectorizer(path: str = DEFAULT_MODEL_PATH, model_type: str = "tfidf") -> VectorizerBase:
+def load_vectorizer(
+    path: str = DEFAULT_MODEL_PATH,
+    model_type: str = "tfidf",
+    cached: bool = False,
+) -> VectorizerBase:
     """
     Load a vectorizer from a file.
+
+    Native model directories are detected automatically and their
+    model type is taken from meta.json; other paths are unpickled.
+
+    By default a private copy is loaded, which may be modified
+    (e.g. with partial_fit). With cached=True the model comes from
+    the process-wide model registry instead and is shared with other
+    callers, so it must be treated as read-only.
     """
-    if model_type == "tfidf":
-        return Tfidf().load(path)
-    else:
+    if is_native_model(path):
+        model_type = read_meta(path)["model_type"]
+
+    if model_type not in ("tfidf", "hashing"):
         raise ValueError(f"Unknown vectorizer type: {model_type}")
+
+    if cached:
+        return get_model_registry().get(path, model_type)
+
+    return load_model(path, model_type)
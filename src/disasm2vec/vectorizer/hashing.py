@@ -0,0 +1,197 @@
+from itertools import chain
+from typing import Iterable, Iterator, List, Tuple, Union
+import pickle
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from .base import VectorizerBase
+from .tfidf import identity
+
+
+class HashingTfidf(VectorizerBase):
+    """
+    Feature-hashing vectorizer for assembly instruction tokens.
+
+    Instruction n-grams are hashed into a fixed ``n_features`` wide
+    sparse space, so there is no vocabulary to grow, store or share
+    between workers. An optional IDF stage reweights columns from
+    document frequencies accumulated with partial_fit.
+
+    With ``use_idf=False`` the vectorizer is stateless and needs no
+    fitting at all.
+
+    Input format is the same as Tfidf: List[List[str]].
+    """
+
+    def __init__(
+        self,
+        *,
+        n_features: int = 2 ** 20,
+        ngram_range: Tuple[int, int] = (1, 2),
+        use_idf: bool = True,
+        smooth_idf: bool = True,
+        sublinear_tf: bool = False,
+        norm: str | None = "l2",
+    ):
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.use_idf = use_idf
+        self.smooth_idf = smooth_idf
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+
+        self.vectorizer = HashingVectorizer(
+            tokenizer=identity,
+            preprocessor=identity,
+            token_pattern=None,
+            lowercase=False,
+            ngram_range=self.ngram_range,
+            n_features=n_features,
+            alternate_sign=False,
+            norm=None,
+        )
+
+        self.df = np.zeros(n_features, dtype=np.int64)
+        self.n_documents = 0
+        self._idf = None
+        self._fitted = not use_idf
+
+    # FIT
+    def fit(self, documents: Iterable[List[str]]):
+        """
+        Reset document frequencies and fit them from corpus.
+        """
+        self.df[:] = 0
+        self.n_documents = 0
+        self._fitted = not self.use_idf
+
+        self.partial_fit(documents)
+
+        if not self.n_documents:
+            raise ValueError("Cannot fit on an empty corpus")
+
+        return self
+
+    def partial_fit(self, documents: Iterable[List[str]]):
+        """
+        Add a batch of documents to the document frequencies.
+        An empty batch changes nothing.
+        """
+        X = self._hash(documents)
+
+        if not X.shape[0]:
+            return self
+
+        # Rows of a hashed count matrix hold unique column indices,
+        # so counting indices counts documents per column.
+        self.df += np.bincount(X.indices, minlength=self.n_features)
+        self.n_documents += X.shape[0]
+
+        self._idf = None
+        self._fitted = True
+        return self
+
+    # TRANSFORM
+    def transform(self, documents: Iterable[List[str]]):
+        """
+        Transform documents → vectors.
+        """
+        self._check_fitted()
+
+        X = self._hash(documents)
+
+        if self.sublinear_tf:
+            np.log(X.data, X.data)
+            X.data += 1.0
+
+        if self.use_idf:
+            X.data *= self.idf()[X.indices]
+
+        if self.norm is not None and X.shape[0]:
+            X = normalize(X, norm=self.norm, copy=False)
+
+        return X
+
+    def fit_transform(self, documents: Iterable[List[str]]):
+        """
+        Fit then transform.
+        """
+        if isinstance(documents, Iterator):
+            raise TypeError(
+                "fit_transform needs a list or a re-iterable "
+                "source; got a one-shot iterator"
+            )
+
+        return self.fit(documents).transform(documents)
+
+    def transform_one(self, document: List[str]):
+        """
+        Transform single file → vector
+        """
+        return self.transform([document])
+
+    # IDF
+    def idf(self) -> np.ndarray:
+        """
+        Inverse document frequency of every hashed column.
+        """
+        if self._idf is None:
+            df = self.df.astype(np.float64)
+            n_samples = self.n_documents
+
+            df += float(self.smooth_idf)
+            n_samples += int(self.smooth_idf)
+
+            # Columns no fitted document hashed into get the IDF of a
+            # term seen once, instead of log(n / 0).
+            np.maximum(df, 1.0, out=df)
+
+            self._idf = np.log(max(n_samples, 1) / df) + 1.0
+
+        return self._idf
+
+    def _hash(self, documents: Iterable[List[str]]) -> sparse.csr_matrix:
+        docs = self._iter_docs(documents)
+
+        # HashingVectorizer raises StopIteration on an empty stream.
+        first = next(docs, None)
+        if first is None:
+            return sparse.csr_matrix((0, self.n_features), dtype=np.float64)
+
+        return self.vectorizer.transform(chain([first], docs))
+
+    # SAVE / LOAD
+    def save(self, path: Union[str, Path]):
+        self._check_fitted()
+
+        state = {
+            "model_type": "hashing",
+            "params": {
+                "n_features": self.n_features,
+                "ngram_range": self.ngram_range,
+                "use_idf": self.use_idf,
+                "smooth_idf": self.smooth_idf,
+                "sublinear_tf": self.sublinear_tf,
+                "norm": self.norm,
+            },
+            "df": self.df,
+            "n_documents": self.n_documents,
+        }
+
+        with open(path, "wb") as f:
+            pickle.dump(state, f)
+
+    def load(self, path: Union[str, Path]):
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+
+        self.__init__(**state["params"])
+        self.df = state["df"]
+        self.n_documents = state["n_documents"]
+
+        self._fitted = True
+        return self
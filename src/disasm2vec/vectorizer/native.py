@@ -0,0 +1,134 @@
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .tfidf import Tfidf
+
+
+FORMAT_NAME = "disasm2vec-native"
+FORMAT_VERSION = 1
+
+META_FILE = "meta.json"
+VOCABULARY_FILE = "vocabulary.txt"
+IDF_FILE = "idf.npy"
+
+
+def is_native_model(path: Union[str, Path]) -> bool:
+    """
+    Check whether path is a model directory in the native format.
+    """
+    meta = Path(path) / META_FILE
+
+    if not meta.is_file():
+        return False
+
+    return json.loads(meta.read_text()).get("format") == FORMAT_NAME
+
+
+def read_meta(path: Union[str, Path]) -> dict:
+    return json.loads((Path(path) / META_FILE).read_text())
+
+
+def save_native(
+    vectorizer: "Tfidf",
+    path: Union[str, Path],
+    metadata: dict | None = None,
+):
+    """
+    Save a fitted Tfidf as a pickle-free model directory.
+
+    Layout
+    ------
+    meta.json       model type, vectorizer parameters and metadata
+    vocabulary.txt  one n-gram per line, line number = column index
+    idf.npy         raw float64 IDF vector (if use_idf)
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    vec = vectorizer.vectorizer
+    terms = vectorizer.features()
+
+    if any("\n" in term for term in terms):
+        raise ValueError("Vocabulary terms must not contain newlines")
+
+    meta = dict(metadata or {})
+    meta.update(
+        {
+            "format": FORMAT_NAME,
+            "format_version": FORMAT_VERSION,
+            "model_type": "tfidf",
+            "n_features": len(terms),
+            "vectorizer": {
+                "max_features": vec.max_features,
+                "ngram_range": list(vec.ngram_range),
+                "min_df": vec.min_df,
+                "max_df": vec.max_df,
+                "norm": vec.norm,
+                "use_idf": vec.use_idf,
+                "smooth_idf": vec.smooth_idf,
+                "sublinear_tf": vec.sublinear_tf,
+            },
+        }
+    )
+
+    if vectorizer._stats is not None:
+        meta.setdefault("dataset", {})
+        meta["dataset"]["num_documents"] = vectorizer._stats.n_documents
+
+    (path / VOCABULARY_FILE).write_text("\n".join(terms), encoding="utf-8")
+
+    if vec.use_idf:
+        np.save(path / IDF_FILE, np.asarray(vec.idf_, dtype=np.float64))
+
+    (path / META_FILE).write_text(json.dumps(meta, indent=2))
+
+
+def load_native(
+    vectorizer: "Tfidf",
+    path: Union[str, Path],
+    mmap: bool = True,
+) -> "Tfidf":
+    """
+    Load a native model directory into vectorizer.
+
+    With mmap=True the IDF vector is a read-only numpy.memmap, so
+    processes loading the same model share one page-cached copy.
+    """
+    path = Path(path)
+    meta = read_meta(path)
+
+    if meta.get("format_version") != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported native model version: {meta.get('format_version')}"
+        )
+
+    if meta.get("model_type") != "tfidf":
+        raise ValueError(f"Not a tfidf model: {meta.get('model_type')}")
+
+    params = dict(meta["vectorizer"])
+    params["ngram_range"] = tuple(params["ngram_range"])
+    smooth_idf = params.pop("smooth_idf", True)
+    sublinear_tf = params.pop("sublinear_tf", False)
+
+    vectorizer.__init__(**params)
+    vectorizer.vectorizer.set_params(
+        smooth_idf=smooth_idf,
+        sublinear_tf=sublinear_tf,
+    )
+
+    text = (path / VOCABULARY_FILE).read_text(encoding="utf-8")
+    terms = text.split("\n") if text else []
+
+    idf = None
+    if params["use_idf"]:
+        idf = np.load(path / IDF_FILE, mmap_mode="r" if mmap else None)
+
+    vectorizer._install(terms, idf)
+    vectorizer.metadata = meta
+    vectorizer._fitted = True
+
+    return vectorizer
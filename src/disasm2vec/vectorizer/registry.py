@@ -0,0 +1,159 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Iterable, Union
+
+from .base import VectorizerBase
+from .hashing import HashingTfidf
+from .tfidf import Tfidf
+
+
+DEFAULT_MAX_MODELS = 4
+
+_MODEL_TYPES = {
+    "tfidf": Tfidf,
+    "hashing": HashingTfidf,
+}
+
+
+@dataclass
+class RegistryStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class ModelRegistry:
+    """
+    In-memory LRU cache of loaded vectorizers.
+
+    Entries are keyed by model path and type together with the
+    file's modification time and size, so a model rewritten on disk
+    is reloaded on the next lookup. Returned models are shared
+    between callers and must not be modified (e.g. with partial_fit);
+    load a private copy with ``load_vectorizer(path)``.
+    """
+
+    def __init__(self, max_models: int = DEFAULT_MAX_MODELS):
+        self.max_models = max_models
+
+        self._models: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = RegistryStats()
+
+    def get(
+        self,
+        path: Union[str, Path],
+        model_type: str = "tfidf",
+    ) -> VectorizerBase:
+        """
+        Return the model at path, loading it on a miss.
+        """
+        key = _model_key(path, model_type)
+
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self._stats.hits += 1
+                return model
+
+            self._stats.misses += 1
+
+        model = load_model(path, model_type)
+
+        with self._lock:
+            # Drop stale versions of the same model.
+            for old in [k for k in self._models if k[:2] == key[:2]]:
+                del self._models[old]
+
+            self._models[key] = model
+
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+                self._stats.evictions += 1
+
+        return model
+
+    def preload(
+        self,
+        paths: Iterable[Union[str, Path]],
+        model_type: str = "tfidf",
+    ):
+        """
+        Load models ahead of the first request.
+        """
+        for path in paths:
+            self.get(path, model_type)
+
+    def invalidate(self, path: Union[str, Path, None] = None):
+        """
+        Forget a cached model (every type and version of it), or all
+        models when path is None.
+        """
+        with self._lock:
+            if path is None:
+                self._models.clear()
+                return
+
+            resolved = os.path.abspath(path)
+            for key in [k for k in self._models if k[0] == resolved]:
+                del self._models[key]
+
+    def stats(self) -> RegistryStats:
+        with self._lock:
+            return replace(self._stats)
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+
+_REGISTRY = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """
+    Return the process-wide ModelRegistry.
+    """
+    return _REGISTRY
+
+
+def load_model(
+    path: Union[str, Path],
+    model_type: str = "tfidf",
+) -> VectorizerBase:
+    """
+    Load a model from disk, bypassing the registry.
+    """
+    cls = _MODEL_TYPES.get(model_type)
+    if cls is None:
+        raise ValueError(f"Unknown vectorizer type: {model_type}")
+
+    model = cls()
+    model.load(path)
+    return model
+
+
+def _model_key(path: Union[str, Path], model_type: str) -> tuple:
+    """
+    Identify a model version by (path, type, mtime_ns, size).
+
+    For native model directories the newest mtime and total size of
+    the files inside are used.
+    """
+    resolved = os.path.abspath(path)
+    st = os.stat(resolved)
+
+    if not Path(resolved).is_dir():
+        return (resolved, model_type, st.st_mtime_ns, st.st_size)
+
+    mtime, size = st.st_mtime_ns, 0
+    for entry in os.scandir(resolved):
+        if entry.is_file():
+            est = entry.stat()
+            mtime = max(mtime, est.st_mtime_ns)
+            size += est.st_size
+
+    return (resolved, model_type, mtime, size)
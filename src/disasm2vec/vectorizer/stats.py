@@ -0,0 +1,123 @@
+from collections import Counter
+from numbers import Integral
+from typing import Iterable
+
+import numpy as np
+
+
+class DocumentStats:
+    """
+    Running n-gram statistics of a corpus.
+
+    Keeps, for every n-gram seen, its document frequency (``df``) and
+    total term frequency (``tf``), plus the number of documents. This
+    is everything TF-IDF fitting needs, so a corpus can be streamed
+    through once without keeping documents or a count matrix around.
+    """
+
+    def __init__(self):
+        self.df: Counter = Counter()
+        self.tf: Counter = Counter()
+        self.n_documents = 0
+
+        # False when the counts were reconstructed from a fitted
+        # model's IDF and only cover its (pruned) vocabulary.
+        self.complete = True
+
+    @classmethod
+    def from_idf(
+        cls,
+        vocabulary: list[str],
+        idf: np.ndarray,
+        n_documents: int,
+        smooth_idf: bool = True,
+    ) -> "DocumentStats":
+        """
+        Reconstruct document frequencies from an IDF vector.
+
+        Term frequencies and pruned n-grams cannot be recovered,
+        so the result is marked incomplete.
+        """
+        n_samples = n_documents + int(smooth_idf)
+        df = n_samples / np.exp(np.asarray(idf, dtype=np.float64) - 1.0)
+        df -= float(smooth_idf)
+
+        stats = cls()
+        stats.df.update(dict(zip(vocabulary, np.rint(df).astype(np.int64).tolist())))
+        stats.n_documents = n_documents
+        stats.complete = False
+
+        return stats
+
+    def add(self, ngrams: Iterable[str]):
+        """
+        Count the n-grams of one document.
+        """
+        counts = Counter(ngrams)
+
+        self.tf.update(counts)
+        self.df.update(counts.keys())
+        self.n_documents += 1
+
+    def select_vocabulary(
+        self,
+        min_df: float | int = 1,
+        max_df: float | int = 1.0,
+        max_features: int | None = None,
+    ) -> list[str]:
+        """
+        Pick the sorted vocabulary the way sklearn's CountVectorizer
+        prunes and caps features.
+        """
+        terms = sorted(self.df)
+
+        if not terms:
+            raise ValueError(
+                "empty vocabulary; perhaps the documents only contain stop words"
+            )
+
+        n = self.n_documents
+        max_doc_count = max_df if isinstance(max_df, Integral) else max_df * n
+        min_doc_count = min_df if isinstance(min_df, Integral) else min_df * n
+
+        if max_doc_count < min_doc_count:
+            raise ValueError("max_df corresponds to < documents than min_df")
+
+        dfs = np.fromiter((self.df[t] for t in terms), dtype=np.int64, count=len(terms))
+        mask = (dfs <= max_doc_count) & (dfs >= min_doc_count)
+
+        if max_features is not None and mask.sum() > max_features:
+            tfs = np.fromiter(
+                (self.tf[t] for t in terms), dtype=np.int64, count=len(terms)
+            )
+            mask_inds = (-tfs[mask]).argsort()[:max_features]
+            new_mask = np.zeros(len(dfs), dtype=bool)
+            new_mask[np.where(mask)[0][mask_inds]] = True
+            mask = new_mask
+
+        vocabulary = [t for t, keep in zip(terms, mask) if keep]
+
+        if not vocabulary:
+            raise ValueError(
+                "After pruning, no terms remain. Try a lower min_df or a higher max_df."
+            )
+
+        return vocabulary
+
+    def idf(self, terms: list[str], smooth_idf: bool = True) -> np.ndarray:
+        """
+        Inverse document frequencies of terms, as sklearn's
+        TfidfTransformer computes them.
+        """
+        df = np.fromiter((self.df[t] for t in terms), dtype=np.float64, count=len(terms))
+        n_samples = self.n_documents
+
+        df += float(smooth_idf)
+        n_samples += int(smooth_idf)
+
+        idf = np.full_like(df, fill_value=n_samples, dtype=np.float64)
+        idf /= df
+        np.log(idf, out=idf)
+        idf += 1.0
+
+        return idf
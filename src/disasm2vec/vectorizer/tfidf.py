@@ -1,13 +1,25 @@
-from typing import List, Iterable, Optional, Tuple, Union
+from typing import List, Iterable, Iterator, Optional, Tuple, Union
 import pickle
 from pathlib import Path
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfTransformer, TfidfVectorizer
+from disasm2vec.tokenizer.encoded import EncodedCorpus
 from .base import VectorizerBase
+from .encoded import encoded_counts, encoded_stats
+from .native import is_native_model, load_native, save_native
+from .stats import DocumentStats
 
     
 def identity(x):
     return x
 
+
+# Sidecar file next to a pickled model holding its DocumentStats
+STATS_SUFFIX = ".stats"
+
+
+def stats_path(path: Union[str, Path]) -> Path:
+    return Path(f"{path}{STATS_SUFFIX}")
+
 class Tfidf(VectorizerBase):
     """
     TF-IDF vectorizer for assembly instruction tokens.
@@ -20,6 +32,22 @@ class Tfidf(VectorizerBase):
     where:
         outer list  = files
         inner list  = instructions
+
+    fit/transform also accept any iterable of documents (e.g. a
+    generator); those are streamed through once instead of being
+    held in memory. fit_transform on a non-list source needs a
+    re-iterable one (such as tokenizer.AsmCorpus) and makes two
+    passes: fit, then transform.
+
+    partial_fit updates a model with new documents from running
+    n-gram statistics instead of refitting the whole corpus. These
+    hold counts for every n-gram seen, not just the vocabulary, so
+    fit only keeps them with keep_stats=True; a model built with
+    partial_fit keeps them from the start.
+
+    fit/transform read a tokenizer.EncodedCorpus directly from its
+    instruction ids, counting n-grams with numpy instead of building
+    n-gram strings per document.
     """
 
     def __init__(
@@ -31,6 +59,7 @@ class Tfidf(VectorizerBase):
         max_df: float | int = 1.0,
         use_idf: bool = True,
         norm: str | None = "l2",
+        keep_stats: bool = False,
     ):
         self.vectorizer = TfidfVectorizer(
             tokenizer=identity,
@@ -44,41 +73,133 @@ class Tfidf(VectorizerBase):
             use_idf=use_idf,
             norm=norm,
         )
+        self.keep_stats = keep_stats
         self._fitted = False
+        self._stats: DocumentStats | None = None
+        # Sidecar of a loaded model, read on first partial_fit
+        self._stats_path: Path | None = None
+        self.metadata: dict = {}
 
     # FIT
-    def fit(self, documents: List[List[str]]):
+    def fit(self, documents: Iterable[List[str]]):
         """
         Fit vocabulary + IDF from corpus.
         """
-        self._validate_docs(documents)
+        self._stats_path = None
+
+        if isinstance(documents, EncodedCorpus):
+            stats = encoded_stats(documents, self.vectorizer.ngram_range)
+            self._apply_stats(stats)
+            self._stats = stats if self.keep_stats else None
+        elif isinstance(documents, list) and not self.keep_stats:
+            self._validate_docs(documents)
+            self.vectorizer.fit(documents)
+            self._stats = None
+        else:
+            self._fit_stream(documents)
 
-        self.vectorizer.fit(documents)
         self._fitted = True
         return self
 
     # TRANSFORM
-    def transform(self, documents: List[List[str]]):
+    def transform(self, documents: Iterable[List[str]]):
         """
         Transform documents → vectors.
         """
         self._check_fitted()
-        self._validate_docs(documents)
+
+        if isinstance(documents, EncodedCorpus):
+            return self._transform_encoded(documents)
+
+        if isinstance(documents, list):
+            self._validate_docs(documents)
+        else:
+            documents = self._iter_docs(documents)
 
         X = self.vectorizer.transform(documents)
         return X
 
     # FIT + TRANSFORM
-    def fit_transform(self, documents: List[List[str]]):
+    def fit_transform(self, documents: Iterable[List[str]]):
         """
         Fit then transform.
         """
+        if not isinstance(documents, list) or self.keep_stats:
+            if isinstance(documents, Iterator):
+                raise TypeError(
+                    "fit_transform needs a list or a re-iterable "
+                    "source; got a one-shot iterator"
+                )
+            return self.fit(documents).transform(documents)
+
         self._validate_docs(documents)
 
         X = self.vectorizer.fit_transform(documents)
+        self._stats = None
+        self._stats_path = None
         self._fitted = True
         return X
 
+    # INCREMENTAL
+    def partial_fit(
+        self,
+        documents: Iterable[List[str]],
+        grow_vocabulary: bool = True,
+        n_documents: int | None = None,
+    ):
+        """
+        Add documents to the model without refitting the corpus.
+
+        Document frequencies, term frequencies and the document total
+        are kept for every n-gram seen, and IDF is recomputed from them.
+
+        grow_vocabulary=True re-selects the vocabulary from all counts
+        (min_df, max_df and the max_features cap), giving the same
+        model as a full fit on every document seen so far. New n-grams
+        may enter and others drop out, so column indices can change.
+
+        grow_vocabulary=False keeps the current vocabulary and columns
+        and only refreshes IDF; new n-grams are counted but not added.
+
+        A model without statistics (fitted without keep_stats, or
+        saved without them) can only be updated with
+        grow_vocabulary=False; its document frequencies are
+        reconstructed from IDF, which needs
+        the number of documents it was trained on (``n_documents``,
+        e.g. ``dataset.num_documents`` in the model's .json; native
+        model directories record it and it is picked up from there).
+        """
+        if self._stats is None and self._stats_path is not None:
+            self._stats = self._load_stats()
+
+        if self._stats is None:
+            if self._fitted:
+                self._stats = self._stats_from_idf(n_documents)
+            else:
+                self._stats = DocumentStats()
+
+        if grow_vocabulary and not self._stats.complete:
+            raise ValueError(
+                "Model has no complete n-gram statistics; "
+                "use grow_vocabulary=False or refit with keep_stats=True"
+            )
+
+        analyzer = self.vectorizer.build_analyzer()
+
+        for doc in self._iter_docs(documents):
+            self._stats.add(analyzer(doc))
+
+        if grow_vocabulary or not self._fitted:
+            self._apply_stats(self._stats)
+        elif self.vectorizer.use_idf:
+            self.vectorizer._tfidf.idf_ = self._stats.idf(
+                self.features(),
+                smooth_idf=self.vectorizer.smooth_idf,
+            )
+
+        self._fitted = True
+        return self
+
     # SINGLE DOC
     def transform_one(self, document: List[str]):
         """
@@ -93,31 +214,153 @@ class Tfidf(VectorizerBase):
         return self.vectorizer.get_feature_names_out().tolist()
 
     # SAVE / LOAD
-    def save(self, path: Union[str, Path]):
+    def save(
+        self,
+        path: Union[str, Path],
+        format: str = "pickle",
+        metadata: dict | None = None,
+    ):
+        """
+        Save the model.
+
+        format="pickle" writes a pickled TfidfVectorizer;
+        format="native" writes a pickle-free model directory
+        (see vectorizer.native) with optional extra metadata.
+
+        A pickled model with n-gram statistics gets them in a
+        separate ``<path>.stats`` file, so loading the model for
+        transform never reads them.
+        """
         self._check_fitted()
 
+        if format == "native":
+            save_native(self, path, metadata=metadata)
+            return
+        if format != "pickle":
+            raise ValueError(f"Unknown model format: {format}")
+
+        stats = self._stats
+        if stats is None and self._stats_path is not None:
+            stats = self._load_stats()
+
         with open(path, "wb") as f:
             pickle.dump(self.vectorizer, f)
 
-    def load(self, path: Union[str, Path]):
+        if stats is not None:
+            with open(stats_path(path), "wb") as f:
+                pickle.dump(stats, f)
+        else:
+            # Do not pair the new model with stale statistics
+            stats_path(path).unlink(missing_ok=True)
+
+    def load(self, path: Union[str, Path], mmap: bool = True):
+        """
+        Load a model, detecting the format from path: a native
+        model directory (IDF memory-mapped unless mmap=False)
+        or a pickled TfidfVectorizer.
+        """
+        if is_native_model(path):
+            return load_native(self, path, mmap=mmap)
+
         with open(path, "rb") as f:
             self.vectorizer = pickle.load(f)
 
+        self._stats = None
+        self._stats_path = None
+        if stats_path(path).exists():
+            self._stats_path = stats_path(path)
+
         self._fitted = True
         return self
     
-    def _validate_docs(self, docs):
-        if not isinstance(docs, Iterable):
-            raise TypeError("documents must be iterable")
+    # STREAMING
+    def _fit_stream(self, documents: Iterable[List[str]]):
+        stats = DocumentStats()
+        analyzer = self.vectorizer.build_analyzer()
 
-        for d in docs:
-            if not isinstance(d, list):
-                raise TypeError(
-                    "Each document must be List[str]"
-                )
+        for doc in self._iter_docs(documents):
+            stats.add(analyzer(doc))
+
+        self._apply_stats(stats)
+        self._stats = stats if self.keep_stats else None
+
+    def _load_stats(self) -> DocumentStats:
+        with open(self._stats_path, "rb") as f:
+            stats = pickle.load(f)
+
+        self._stats_path = None
+        return stats
+
+    def _transform_encoded(self, corpus: EncodedCorpus):
+        vec = self.vectorizer
+
+        counts = encoded_counts(
+            corpus,
+            vec.vocabulary_,
+            vec.ngram_range,
+            dtype=vec.dtype,
+        )
+        return vec._tfidf.transform(counts, copy=False)
+
+    def _stats_from_idf(self, n_documents: int | None) -> DocumentStats:
+        vec = self.vectorizer
 
-    def _check_fitted(self):
-        if not self._fitted:
-            raise RuntimeError(
-                "Vectorizer not fitted. Call fit() first."
+        if not vec.use_idf:
+            raise ValueError("Cannot update a model fitted with use_idf=False")
+
+        if n_documents is None:
+            n_documents = self.metadata.get("dataset", {}).get("num_documents")
+
+        if n_documents is None:
+            raise ValueError(
+                "n_documents is required to update a model "
+                "without n-gram statistics (fit with keep_stats=True "
+                "to keep them)"
             )
+
+        return DocumentStats.from_idf(
+            self.features(),
+            vec.idf_,
+            n_documents,
+            smooth_idf=vec.smooth_idf,
+        )
+
+    def _apply_stats(self, stats: DocumentStats):
+        """
+        Install vocabulary and IDF computed from corpus statistics
+        into the underlying sklearn vectorizer.
+        """
+        vec = self.vectorizer
+
+        vocabulary = stats.select_vocabulary(
+            min_df=vec.min_df,
+            max_df=vec.max_df,
+            max_features=vec.max_features,
+        )
+
+        idf = None
+        if vec.use_idf:
+            idf = stats.idf(vocabulary, smooth_idf=vec.smooth_idf)
+
+        self._install(vocabulary, idf)
+
+    def _install(self, vocabulary: List[str], idf):
+        """
+        Make the sklearn vectorizer fitted with the given
+        column-ordered vocabulary and IDF vector.
+        """
+        vec = self.vectorizer
+
+        vec.vocabulary_ = {term: i for i, term in enumerate(vocabulary)}
+        vec.fixed_vocabulary_ = False
+
+        vec._tfidf = TfidfTransformer(
+            norm=vec.norm,
+            use_idf=vec.use_idf,
+            smooth_idf=vec.smooth_idf,
+            sublinear_tf=vec.sublinear_tf,
+        )
+        vec._tfidf.n_features_in_ = len(vocabulary)
+
+        if vec.use_idf:
+            vec._tfidf.idf_ = idf
@@ -20,6 +20,17 @@ class TestCompiler(unittest.TestCase):
         self.assertIn("-o", args)
         self.assertIn(output, args)
 
+    @patch("subprocess.run")
+    def test_compile_object(self, mock_run):
+        with patch("pathlib.Path.exists", return_value=True):
+            gcc.compile_c("test.c", "test.o", ["-O2"], link=False)
+            gcc.compile_c("test.c", "test", ["-O2"])
+
+        object_args = mock_run.call_args_list[0][0][0]
+        link_args = mock_run.call_args_list[1][0][0]
+        self.assertEqual(object_args[-2:], ["-O2", "-c"])
+        self.assertNotIn("-c", link_args)
+
     @patch("subprocess.run")
     def test_compile_cpp_success(self, mock_run):
         source = "test.cpp"
@@ -56,7 +67,7 @@ class TestCompiler(unittest.TestCase):
         ]
         
         with patch("pathlib.Path.exists", return_value=True):
-            gcc.compile_folder("src", "out")
+            gcc.compile_folder("src", "out", jobs=1)
             
         self.assertEqual(mock_run.call_count, 2)
         
@@ -68,5 +79,74 @@ class TestCompiler(unittest.TestCase):
         call2 = mock_run.call_args_list[1][0][0]
         self.assertEqual(call2[0], "g++")
 
+    @patch("subprocess.run")
+    @patch("pathlib.Path.rglob")
+    @patch("pathlib.Path.mkdir")
+    def test_compile_folder_parallel_keep_going(self, mock_mkdir, mock_rglob, mock_run):
+        mock_rglob.side_effect = [
+            [Path("src/a.c"), Path("src/bad.c")],
+            [Path("src/b.cpp")]
+        ]
+
+        def fake_run(cmd, **kwargs):
+            if "src/bad.c" in cmd:
+                raise subprocess.CalledProcessError(1, cmd, stderr="syntax error")
+            return MagicMock(stderr="warning")
+
+        mock_run.side_effect = fake_run
+
+        with patch("pathlib.Path.exists", return_value=True):
+            report = gcc.compile_folder("src", "out", jobs=3, keep_going=True)
+
+        self.assertEqual(mock_run.call_count, 3)
+        self.assertEqual(
+            [r.source for r in report.results],
+            ["src/a.c", "src/bad.c", "src/b.cpp"],
+        )
+        self.assertEqual([r.source for r in report.failed], ["src/bad.c"])
+        self.assertEqual(report.failed[0].stderr, "syntax error")
+        self.assertEqual(report.succeeded[0].stderr, "warning")
+        self.assertTrue(all(r.elapsed >= 0 for r in report.results))
+
+    @patch("subprocess.run")
+    @patch("pathlib.Path.rglob")
+    @patch("pathlib.Path.mkdir")
+    def test_compile_folder_stops_on_error(self, mock_mkdir, mock_rglob, mock_run):
+        mock_rglob.side_effect = [[Path("src/bad.c")], []]
+        mock_run.side_effect = subprocess.CalledProcessError(1, ["gcc"], stderr="error")
+
+        with patch("pathlib.Path.exists", return_value=True):
+            with self.assertRaises(errors.CompilationError) as ctx:
+                gcc.compile_folder("src", "out", jobs=2)
+
+        self.assertEqual(ctx.exception.stderr, "error")
+
+    @patch("subprocess.run")
+    @patch("pathlib.Path.rglob")
+    @patch("pathlib.Path.mkdir")
+    def test_compile_folder_keep_going_os_errors(self, mock_mkdir, mock_rglob, mock_run):
+        mock_rglob.side_effect = [[Path("src/a.c")], [Path("src/b.cpp")]]
+
+        def fake_run(cmd, **kwargs):
+            if cmd[0] == "g++":
+                raise FileNotFoundError(2, "No such file or directory", "g++")
+            return MagicMock(stderr="")
+
+        mock_run.side_effect = fake_run
+
+        for jobs in (1, 2):
+            mock_rglob.side_effect = [[Path("src/a.c")], [Path("src/b.cpp")]]
+            with patch("pathlib.Path.exists", return_value=True):
+                report = gcc.compile_folder("src", "out", jobs=jobs, keep_going=True)
+
+            self.assertEqual([r.source for r in report.succeeded], ["src/a.c"])
+            self.assertEqual([r.source for r in report.failed], ["src/b.cpp"])
+            self.assertIn("FileNotFoundError", report.failed[0].stderr)
+
+        mock_rglob.side_effect = [[Path("src/b.cpp")], []]
+        with patch("pathlib.Path.exists", return_value=True):
+            with self.assertRaises(FileNotFoundError):
+                gcc.compile_folder("src", "out", jobs=1)
+
 if __name__ == '__main__':
     unittest.main()
@@ -3,6 +3,7 @@ from unittest.mock import patch, MagicMock
 from pathlib import Path
 import subprocess
 from disasm2vec.disassembler import objdump, errors
+from disasm2vec.tokenizer.core import _split_function_lines
 
 class TestDisassembler(unittest.TestCase):
     @patch("subprocess.run")
@@ -71,5 +72,256 @@ class TestDisassembler(unittest.TestCase):
             
         self.assertEqual(mock_disassemble.call_count, 2)
 
+    @patch("disasm2vec.disassembler.objdump.disassemble")
+    @patch("pathlib.Path.iterdir")
+    @patch("pathlib.Path.mkdir")
+    def test_disassemble_folder_keep_going(self, mock_mkdir, mock_iterdir, mock_disassemble):
+        mock_iterdir.return_value = [Path("bin/a"), Path("bin/bad"), Path("bin/b")]
+
+        def fake_disassemble(binary, output, arch=None, full=False):
+            if binary.name == "bad":
+                raise errors.DisassemblyError("failed", stderr="file format not recognized")
+
+        mock_disassemble.side_effect = fake_disassemble
+
+        with patch("pathlib.Path.is_file", return_value=True):
+            report = objdump.disassemble_folder(
+                "bin", "asm", arch="i386:x86-64", jobs=2, keep_going=True
+            )
+
+        self.assertEqual(mock_disassemble.call_count, 3)
+        for call in mock_disassemble.call_args_list:
+            self.assertEqual(call.kwargs["arch"], "i386:x86-64")
+
+        self.assertEqual(
+            [r.binary for r in report.results], ["bin/a", "bin/bad", "bin/b"]
+        )
+        self.assertEqual([r.binary for r in report.failed], ["bin/bad"])
+        self.assertEqual(report.failed[0].stderr, "file format not recognized")
+
+    @patch("subprocess.run")
+    @patch("pathlib.Path.write_text")
+    @patch("pathlib.Path.iterdir")
+    @patch("pathlib.Path.mkdir")
+    def test_disassemble_folder_keep_going_os_errors(self, mock_mkdir, mock_iterdir, mock_write, mock_run):
+        mock_iterdir.return_value = [Path("bin/a"), Path("bin/b")]
+        mock_run.side_effect = FileNotFoundError(2, "No such file or directory", "objdump")
+
+        with patch("pathlib.Path.is_file", return_value=True), \
+             patch("pathlib.Path.exists", return_value=True):
+            for batch_size in (1, 2):
+                report = objdump.disassemble_folder(
+                    "bin", "asm", jobs=2, keep_going=True, batch_size=batch_size
+                )
+                self.assertEqual(len(report.failed), 2)
+                self.assertIn("FileNotFoundError", report.failed[0].stderr)
+
+            with self.assertRaises(FileNotFoundError):
+                objdump.disassemble_folder("bin", "asm", jobs=1)
+
+            # An unwritable output fails only that binary.
+            mock_run.side_effect = None
+            mock_run.return_value = MagicMock(stdout="", stderr="")
+            mock_write.side_effect = PermissionError(13, "Permission denied")
+            for batch_size in (1, 2):
+                report = objdump.disassemble_folder(
+                    "bin", "asm", jobs=1, keep_going=True, batch_size=batch_size
+                )
+                self.assertEqual(len(report.failed), 2)
+                self.assertIn("PermissionError", report.failed[0].stderr)
+
+    @patch("disasm2vec.disassembler.objdump.disassemble")
+    @patch("pathlib.Path.iterdir")
+    @patch("pathlib.Path.mkdir")
+    def test_disassemble_folder_stops_on_error(self, mock_mkdir, mock_iterdir, mock_disassemble):
+        mock_iterdir.return_value = [Path("bin/bad")]
+        mock_disassemble.side_effect = errors.DisassemblyError("failed", stderr="error")
+
+        with patch("pathlib.Path.is_file", return_value=True):
+            with self.assertRaises(errors.DisassemblyError):
+                objdump.disassemble_folder("bin", "asm", jobs=2)
+
+    @patch("subprocess.Popen")
+    def test_disassemble_stream(self, mock_popen):
+        proc = mock_popen.return_value
+        proc.stdout = MagicMock()
+        proc.stdout.__iter__.return_value = iter([
+            "0000000000001149 <main>:\n",
+            "    1149:\tf3 0f 1e fa          \tendbr64\n",
+            "0000000000001030 <printf@plt>:\n",
+            "    1030:\tf3 0f 1e fa          \tendbr64\n",
+        ])
+        proc.wait.return_value = 0
+        proc.poll.return_value = 0
+
+        with patch("pathlib.Path.exists", return_value=True):
+            lines = list(objdump.disassemble_stream("test.bin", arch="i386:x86-64"))
+
+        self.assertEqual(len(lines), 2)
+        self.assertIn("<main>:", lines[0])
+        args = mock_popen.call_args[0][0]
+        self.assertEqual(args[0], "objdump")
+        self.assertIn("i386:x86-64", args)
+
+    @patch("subprocess.Popen")
+    def test_disassemble_stream_error(self, mock_popen):
+        proc = mock_popen.return_value
+        proc.stdout = MagicMock()
+        proc.stdout.__iter__.return_value = iter([])
+        proc.wait.return_value = 1
+        proc.poll.return_value = 1
+
+        with patch("pathlib.Path.exists", return_value=True):
+            with self.assertRaises(errors.DisassemblyError):
+                list(objdump.disassemble_stream("test.bin"))
+
+    def test_split_listings(self):
+        stdout = (
+            "\nbin/a:     file format elf64-x86-64\n\n\n"
+            "Disassembly of section .text:\n\n"
+            "0000000000001149 <main>:\n"
+            "    1149:\tc3                   \tret\n"
+            "\nbin/b:     file format elf64-x86-64\n\n\n"
+            "Disassembly of section .text:\n"
+        )
+
+        listings = objdump._split_listings(
+            stdout, {"bin/a": Path("bin/a"), "bin/b": Path("bin/b")}
+        )
+
+        self.assertEqual(list(listings), [Path("bin/a"), Path("bin/b")])
+        self.assertEqual(
+            listings[Path("bin/a")] + listings[Path("bin/b")], stdout
+        )
+        self.assertTrue(listings[Path("bin/b")].startswith("\nbin/b:"))
+        self.assertTrue(listings[Path("bin/a")].endswith("\tret\n"))
+
+    @patch("subprocess.run")
+    def test_disassemble_many(self, mock_run):
+        def fake_run(cmd, **kwargs):
+            result = MagicMock()
+            if len(cmd) > 4:
+                # objdump skips the unreadable file and exits nonzero
+                result.stdout = (
+                    "\nbin/a:     file format elf64-x86-64\n\n"
+                    "0000000000001149 <main>:\n"
+                    "0000000000001030 <puts@plt>:\n"
+                )
+                result.stderr = "objdump: bin/bad: file format not recognized"
+                result.returncode = 1
+                return result
+            raise subprocess.CalledProcessError(
+                1, cmd, stderr="objdump: bin/bad: file format not recognized"
+            )
+
+        mock_run.side_effect = fake_run
+
+        with patch("pathlib.Path.exists", return_value=True):
+            listings = objdump.disassemble_many(["bin/a", "bin/bad"])
+
+            binary, asm = next(listings)
+            self.assertEqual(binary, Path("bin/a"))
+            self.assertIn("<main>:", asm)
+            self.assertNotIn("puts@plt", asm)
+
+            with self.assertRaises(errors.DisassemblyError):
+                next(listings)
+
+        batch_cmd = mock_run.call_args_list[0][0][0]
+        self.assertEqual(batch_cmd[-2:], ["bin/a", "bin/bad"])
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch("disasm2vec.disassembler.objdump.disassemble")
+    @patch("disasm2vec.disassembler.objdump._objdump_many")
+    @patch("pathlib.Path.write_text")
+    @patch("pathlib.Path.iterdir")
+    @patch("pathlib.Path.mkdir")
+    def test_disassemble_folder_batched(self, mock_mkdir, mock_iterdir, mock_write, mock_many, mock_disassemble):
+        binaries = [Path("bin/a"), Path("bin/bad"), Path("bin/b"), Path("bin/c")]
+        mock_iterdir.return_value = binaries
+        mock_many.side_effect = lambda batch, arch: (
+            {b: f"<{b.name}>:\n" for b in batch if b.name != "bad"}, "error"
+        )
+        mock_disassemble.side_effect = errors.DisassemblyError("failed", stderr="bad")
+
+        with patch("pathlib.Path.is_file", return_value=True):
+            report = objdump.disassemble_folder(
+                "bin", "asm", jobs=2, batch_size=2, keep_going=True
+            )
+
+        self.assertEqual(
+            [call[0][0] for call in mock_many.call_args_list],
+            [binaries[:2], binaries[2:]],
+        )
+        # Only the binary missing from the batch output is rerun alone.
+        mock_disassemble.assert_called_once()
+        self.assertEqual(mock_disassemble.call_args[0][0], Path("bin/bad"))
+        self.assertEqual(mock_write.call_count, 3)
+        self.assertEqual([r.binary for r in report.failed], ["bin/bad"])
+        self.assertEqual(len(report.succeeded), 3)
+
+    def test_resolve_relocations(self):
+        listing = [
+            "\n",
+            "a.o:     file format elf64-x86-64\n",
+            "\n",
+            "SYMBOL TABLE:\n",
+            "0000000000000000 l    df *ABS*\t0000000000000000 a.cpp\n",
+            "0000000000000000  w    F .text._ZN1AC2Ev\t000000000000000b _ZN1AC2Ev\n",
+            "0000000000000000  w    F .text._ZN1AC2Ev\t000000000000000b _ZN1AC1Ev\n",
+            "0000000000000000 g     F .text\t0000000000000020 main\n",
+            "0000000000000000         *UND*\t0000000000000000 puts\n",
+            "\n",
+            "\n",
+            "Disassembly of section .text:\n",
+            "\n",
+            "0000000000000000 <main>:\n",
+            "   0:\te8 00 00 00 00       \tcall   5 <main+0x5>\n",
+            "\t\t\t1: R_X86_64_PLT32\t_ZN1AC2Ev-0x4\n",
+            "   5:\te8 00 00 00 00       \tcall   a <main+0xa>\n",
+            "\t\t\t6: R_X86_64_PLT32\tputs-0x4\n",
+            "   a:\t48 8d 05 00 00 00 00 \tlea    0x0(%rip),%rax        # 11 <main+0x11>\n",
+            "\t\t\td: R_X86_64_PC32\t.rodata-0x4\n",
+            "  11:\tc3                   \tret\n",
+            "\n",
+            "Disassembly of section .text._ZN1AC2Ev:\n",
+            "\n",
+            "0000000000000000 <_ZN1AC1Ev>:\n",
+            "   0:\tc3                   \tret\n",
+        ]
+
+        lines = list(objdump.resolve_relocations(iter(listing)))
+        text = "".join(lines)
+
+        self.assertNotIn("SYMBOL TABLE", text)
+        self.assertNotIn("R_X86_64", text)
+        # The C2 alias resolves to the C1 name objdump uses as header.
+        self.assertIn("\tcall   5 <_ZN1AC1Ev>\n", text)
+        self.assertIn("\tcall   a <puts@plt>\n", text)
+        self.assertIn("# 11 <.rodata>\n", text)
+
+        functions = _split_function_lines(lines)
+        self.assertEqual(list(functions), ["main", "_ZN1AC1Ev"])
+        self.assertEqual(len(functions["main"]), 4)
+
+    @patch("subprocess.run")
+    def test_disassemble_relocatable(self, mock_run):
+        mock_run.return_value.stdout = (
+            "0000000000000000 <main>:\n"
+            "   0:\te8 00 00 00 00       \tcall   5 <main+0x5>\n"
+            "\t\t\t1: R_X86_64_PLT32\thelper-0x4\n"
+        )
+
+        with patch("pathlib.Path.exists", return_value=True), \
+             patch("pathlib.Path.mkdir"), \
+             patch("pathlib.Path.write_text") as mock_write:
+            objdump.disassemble("a.o", "a.asm", relocatable=True)
+
+        args = mock_run.call_args[0][0]
+        self.assertEqual(args[:2], ["objdump", "-drt"])
+        self.assertFalse(any(arg.startswith("--section") for arg in args))
+        self.assertIn("<helper>", mock_write.call_args[0][0])
+        self.assertNotIn("R_X86_64", mock_write.call_args[0][0])
+
 if __name__ == '__main__':
     unittest.main()
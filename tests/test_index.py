@@ -0,0 +1,126 @@
+import tempfile
+import unittest
+
+from scipy import sparse
+
+from disasm2vec.index import LSHIndex, SimilarityIndex
+from disasm2vec.vectorizer import Tfidf
+
+
+class TestSimilarityIndex(unittest.TestCase):
+    def setUp(self):
+        self.documents = [
+            ["mov REG REG", "push REG", "call FUNC", "ret"],
+            ["mov REG REG", "push REG", "call FUNC", "ret", "nop"],
+            ["add REG IMM", "sub REG IMM", "ret"],
+            ["jmp JMP", "pop REG", "leave"],
+        ]
+        self.names = ["a", "a2", "b", "c"]
+
+        self.vectorizer = Tfidf()
+        self.X = self.vectorizer.fit_transform(self.documents)
+
+    def test_query_matches_brute_force(self):
+        index = SimilarityIndex()
+        index.add(self.names, self.X)
+
+        results = index.query(self.X, k=4)
+        similarities = (self.X @ self.X.T).toarray()
+
+        for i, matches in enumerate(results):
+            self.assertEqual(matches[0][0], self.names[i])
+            self.assertAlmostEqual(matches[0][1], 1.0)
+            scores = [score for _, score in matches]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+            for name, score in matches:
+                j = self.names.index(name)
+                self.assertAlmostEqual(score, similarities[i, j])
+
+        self.assertEqual(index.query_one(self.X[0], k=2)[1][0], "a2")
+
+    def test_normalizes_vectors(self):
+        index = SimilarityIndex()
+        index.add(["x"], sparse.csr_matrix([[3.0, 4.0]]))
+
+        ((name, score),) = index.query_one(sparse.csr_matrix([[6.0, 8.0]]))
+        self.assertEqual(name, "x")
+        self.assertAlmostEqual(score, 1.0)
+
+    def test_add_remove(self):
+        index = SimilarityIndex()
+        index.add(self.names[:2], self.X[:2])
+        index.add(self.names[2:], self.X[2:])
+
+        with self.assertRaises(ValueError):
+            index.add(["a"], self.X[:1])
+        with self.assertRaises(ValueError):
+            index.add(["z"], sparse.csr_matrix((1, 3)))
+
+        index.remove("a2")
+        self.assertNotIn("a2", index)
+        self.assertEqual(len(index), 3)
+        self.assertNotIn("a2", [n for n, _ in index.query_one(self.X[0], k=10)])
+
+        with self.assertRaises(KeyError):
+            index.remove("a2")
+
+        index.compact()
+        self.assertEqual(index.names(), ["a", "b", "c"])
+        self.assertEqual(index.query_one(self.X[2], k=1)[0][0], "b")
+
+    def test_save_load(self):
+        index = SimilarityIndex()
+        index.add(self.names, self.X)
+        index.remove("c")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            index.save(tmp)
+            loaded = SimilarityIndex.load(tmp)
+
+        self.assertIs(type(loaded), SimilarityIndex)
+        self.assertEqual(loaded.names(), ["a", "a2", "b"])
+        self.assertEqual(loaded.query(self.X, k=2), index.query(self.X, k=2))
+
+
+class TestLSHIndex(unittest.TestCase):
+    def setUp(self):
+        self.X = sparse.random(500, 256, density=0.2, format="csr", random_state=0)
+        self.names = [f"bin{i}" for i in range(500)]
+
+    def test_finds_identical_vectors(self):
+        index = LSHIndex(n_tables=4, n_bits=12)
+        index.add(self.names, self.X)
+
+        results = index.query(self.X[:50], k=3)
+
+        for i, matches in enumerate(results):
+            self.assertEqual(matches[0][0], self.names[i])
+            self.assertAlmostEqual(matches[0][1], 1.0)
+
+    def test_scores_are_exact(self):
+        index = LSHIndex(n_tables=16, n_bits=4)
+        exact = SimilarityIndex()
+        index.add(self.names, self.X)
+        exact.add(self.names, self.X)
+
+        approx = dict(index.query_one(self.X[7], k=500))
+        for name, score in exact.query_one(self.X[7], k=500):
+            if name in approx:
+                self.assertAlmostEqual(approx[name], score)
+
+    def test_save_load(self):
+        index = LSHIndex(n_tables=4, n_bits=8, seed=3)
+        index.add(self.names, self.X)
+        index.remove("bin1")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            index.save(tmp)
+            loaded = SimilarityIndex.load(tmp)
+
+        self.assertIsInstance(loaded, LSHIndex)
+        self.assertEqual((loaded.n_tables, loaded.n_bits, loaded.seed), (4, 8, 3))
+        self.assertEqual(loaded.query(self.X[:20], k=5), index.query(self.X[:20], k=5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,25 @@
+import dataclasses
+import os
+import numpy as np
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import MagicMock, patch
-from disasm2vec.pipeline import runner, config
-from disasm2vec.vectorizer import Tfidf
+from disasm2vec.pipeline import runner, config, batch, cache, corpus, matrix
+from disasm2vec.pipeline import PipelineMetrics
 
+from tests.test_tokenizer import SAMPLE_ASM
+from disasm2vec.vectorizer import Tfidf, get_model_registry
+
+
+@patch("disasm2vec.vectorizer.registry._model_key", lambda path, t: (path, t))
 class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        get_model_registry().invalidate()
+
+    def tearDown(self):
+        get_model_registry().invalidate()
+
     @patch("disasm2vec.pipeline.runner.compile_c")
     @patch("disasm2vec.pipeline.runner.disassemble")
     @patch("disasm2vec.pipeline.runner.tokenize")
@@ -35,6 +51,74 @@ class TestPipeline(unittest.TestCase):
             mock_load.assert_called_once_with("model.pkl")
             mock_transform.assert_called_once_with(["mov", "eax", "ebx"])
 
+    @patch("disasm2vec.pipeline.runner.compile_c")
+    @patch("disasm2vec.pipeline.runner.disassemble")
+    @patch("disasm2vec.pipeline.runner.tokenize")
+    def test_object_frontend(self, mock_tokenize, mock_disassemble, mock_compile):
+        cfg = config.PipelineConfig(
+            source_file="lib.c",
+            build_dir="build",
+            asm_dir="asm",
+            entry="helper",
+            frontend="object",
+        )
+        mock_tokenize.return_value = ["ret"]
+
+        with patch("pathlib.Path.exists", return_value=True), \
+             patch("pathlib.Path.mkdir"):
+            self.assertEqual(runner.build_tokens(cfg), ["ret"])
+
+            with self.assertRaises(ValueError):
+                runner.build_tokens(dataclasses.replace(cfg, frontend="asm"))
+
+        args, kwargs = mock_compile.call_args
+        self.assertEqual(args[1], Path("build") / "lib.o")
+        self.assertFalse(kwargs["link"])
+        self.assertEqual(mock_disassemble.call_args.kwargs["binary"], Path("build") / "lib.o")
+        self.assertTrue(mock_disassemble.call_args.kwargs["relocatable"])
+
+    @patch("disasm2vec.pipeline.runner.compile_c")
+    @patch("disasm2vec.pipeline.runner.disassemble")
+    @patch("disasm2vec.vectorizer.Tfidf.load")
+    @patch("disasm2vec.vectorizer.Tfidf.transform_one")
+    def test_run_pipeline_metrics(self, mock_transform, mock_load, mock_disassemble, mock_compile):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / "a.c"
+            source.write_text("int main() { return 0; }")
+
+            def fake_disassemble(binary, output, arch, full, relocatable=False):
+                Path(output).write_text(SAMPLE_ASM)
+
+            mock_disassemble.side_effect = fake_disassemble
+
+            cfg = config.PipelineConfig(
+                source_file=str(source),
+                build_dir=tmp,
+                asm_dir=tmp,
+                model_path="model.pkl",
+            )
+
+            events = []
+            metrics = PipelineMetrics(
+                callbacks=[lambda stage, timing: events.append(stage)]
+            )
+            runner.run_pipeline(cfg, metrics=metrics)
+            runner.run_pipeline(cfg, metrics=metrics)
+
+        stages = ["compile", "disassemble", "split", "expand", "load_model", "transform"]
+        self.assertEqual(events, stages * 2)
+        self.assertEqual(list(metrics.stages), stages)
+        self.assertEqual(metrics.stages["compile"].calls, 2)
+
+        self.assertEqual(metrics.asm_bytes, 2 * len(SAMPLE_ASM))
+        self.assertEqual(metrics.functions, 4)
+        self.assertEqual(metrics.inline_depth, 2)
+        self.assertEqual(metrics.model_cache_hits, 1)
+
+        data = metrics.as_dict()
+        self.assertNotIn("callbacks", data)
+        self.assertEqual(data["stages"]["transform"]["calls"], 2)
+
     def test_missing_model_path(self):
         cfg = config.PipelineConfig(
             source_file="test.c",
@@ -52,5 +136,474 @@ class TestPipeline(unittest.TestCase):
             with self.assertRaisesRegex(ValueError, "model_path is required"):
                 runner.run_pipeline(cfg)
 
+    @patch("disasm2vec.pipeline.runner.compile_c")
+    @patch("disasm2vec.pipeline.runner.disassemble")
+    @patch("disasm2vec.pipeline.runner.disassemble_stream")
+    @patch("disasm2vec.pipeline.runner.tokenize_lines")
+    def test_build_tokens_stream_asm(self, mock_tokenize_lines, mock_stream, mock_disassemble, mock_compile):
+        cfg = config.PipelineConfig(
+            source_file="test.c",
+            build_dir="build",
+            asm_dir="asm",
+            stream_asm=True,
+        )
+
+        mock_stream.return_value = iter(["line"])
+        mock_tokenize_lines.return_value = ["ret"]
+
+        with patch("pathlib.Path.exists", return_value=True), \
+             patch("pathlib.Path.mkdir"):
+            tokens = runner.build_tokens(cfg)
+
+        self.assertEqual(tokens, ["ret"])
+        mock_disassemble.assert_not_called()
+        mock_stream.assert_called_once()
+        self.assertIs(mock_tokenize_lines.call_args[0][0], mock_stream.return_value)
+
+
+@patch("disasm2vec.vectorizer.registry._model_key", lambda path, t: (path, t))
+@patch(
+    "disasm2vec.pipeline.matrix._predefined_macros",
+    # -O1..-O3 predefine the same macros; -O0 and -Os differ
+    lambda compiler, optimize, extra: (
+        "o" * 64 if optimize in ("-O1", "-O2", "-O3") else optimize[1:] * 32
+    ),
+)
+class TestBuildMatrix(unittest.TestCase):
+    def setUp(self):
+        get_model_registry().invalidate()
+        self.cfg = config.PipelineConfig(
+            source_file="",
+            build_dir="build",
+            asm_dir="asm",
+            model_path="model.pkl",
+        )
+
+    def tearDown(self):
+        get_model_registry().invalidate()
+
+    @patch("disasm2vec.pipeline.matrix.preprocess_c")
+    @patch("disasm2vec.pipeline.runner.compile_c")
+    @patch("disasm2vec.pipeline.runner.disassemble")
+    @patch("disasm2vec.pipeline.runner.tokenize")
+    @patch("disasm2vec.vectorizer.Tfidf.load")
+    @patch("disasm2vec.vectorizer.Tfidf.transform")
+    def test_variants_share_preprocessing(self, mock_transform, mock_load, mock_tokenize, mock_disassemble, mock_compile, mock_preprocess):
+        def fake_preprocess(source, unit, flags):
+            if source.name == "bad.c" and flags[0] == "-O0":
+                raise ValueError("bad.c: error")
+
+        mock_preprocess.side_effect = fake_preprocess
+        mock_tokenize.side_effect = lambda path, entry, keep_register: [str(path)]
+        mock_transform.return_value = "matrix"
+
+        with patch("pathlib.Path.exists", return_value=True), \
+             patch("pathlib.Path.mkdir"):
+            result = matrix.run_build_matrix(
+                ["a.c", "bad.c"],
+                self.cfg,
+                variants=["-O0", "-O2", "-O3", "-Os"],
+                workers=1,
+            )
+
+        # a.c and bad.c each preprocessed for -O0, -O2/-O3 and -Os
+        self.assertEqual(mock_preprocess.call_count, 6)
+        self.assertEqual(result.preprocessed, 6)
+
+        units = {
+            call[0][1].parent.name: call[0][1]
+            for call in mock_preprocess.call_args_list
+            if call[0][0].name == "a.c"
+        }
+        self.assertEqual(len(units), 3)
+        self.assertTrue(all(unit.name == "a.i" for unit in units.values()))
+
+        compiled = {
+            (call[0][0], call[0][2][0]) for call in mock_compile.call_args_list
+        }
+        self.assertIn((units["o" * 12], "-O2"), compiled)
+        self.assertIn((units["o" * 12], "-O3"), compiled)
+        self.assertEqual(mock_compile.call_count, 7)
+        self.assertEqual(
+            mock_compile.call_args_list[1][0][1], Path("build") / "a.O2"
+        )
+
+        self.assertEqual(result.X, "matrix")
+        self.assertEqual(
+            result.names(),
+            ["a.c@O0", "a.c@O2", "a.c@O3", "a.c@Os", "bad.c@O2", "bad.c@O3", "bad.c@Os"],
+        )
+        self.assertEqual(list(result.errors), [("bad.c", "O0")])
+
+        documents = mock_transform.call_args[0][0]
+        self.assertEqual(documents[1], [str(Path("asm") / "a.O2.asm")])
+
+    def test_variant_tags(self):
+        self.assertEqual(
+            matrix._variant_tags(["-O0", "-Os"]), {"O0": "-O0", "Os": "-Os"}
+        )
+        self.assertEqual(matrix._variant_tags({"fast": "-O3"}), {"fast": "-O3"})
+
+        with self.assertRaises(ValueError):
+            matrix._variant_tags(["-O2", "-O2"])
+
+        with self.assertRaises(ValueError):
+            matrix._variant_tags([])
+
+
+@patch("disasm2vec.vectorizer.registry._model_key", lambda path, t: (path, t))
+class TestPipelineBatch(unittest.TestCase):
+    def setUp(self):
+        get_model_registry().invalidate()
+        self.cfg = config.PipelineConfig(
+            source_file="",
+            build_dir="build",
+            asm_dir="asm",
+            model_path="model.pkl"
+        )
+
+    @patch("disasm2vec.pipeline.runner.compile_c")
+    @patch("disasm2vec.pipeline.runner.disassemble")
+    @patch("disasm2vec.pipeline.runner.tokenize")
+    @patch("disasm2vec.vectorizer.Tfidf.load")
+    @patch("disasm2vec.vectorizer.Tfidf.transform")
+    def test_run_pipeline_batch_collects_errors(self, mock_transform, mock_load, mock_tokenize, mock_disassemble, mock_compile):
+        def fake_tokenize(path, entry, keep_register):
+            if "b.asm" in str(path):
+                raise ValueError("Function 'main' not found.")
+            return [str(path)]
+
+        mock_tokenize.side_effect = fake_tokenize
+        mock_transform.return_value = "matrix"
+
+        with patch("pathlib.Path.exists", return_value=True), \
+             patch("pathlib.Path.mkdir"):
+
+            result = batch.run_pipeline_batch(
+                ["c.c", "b.c", "a.c"], self.cfg, workers=1
+            )
+
+        self.assertEqual(result.X, "matrix")
+        self.assertEqual(result.sources, ["c.c", "a.c"])
+        self.assertIn("b.c", result.errors)
+        self.assertIn("not found", result.errors["b.c"])
+
+        mock_load.assert_called_once_with("model.pkl")
+        documents = mock_transform.call_args[0][0]
+        self.assertEqual(len(documents), 2)
+        self.assertTrue(documents[0][0].endswith("c.asm"))
+        self.assertTrue(documents[1][0].endswith("a.asm"))
+
+    @patch("disasm2vec.pipeline.runner.compile_c")
+    @patch("disasm2vec.pipeline.runner.disassemble")
+    @patch("disasm2vec.pipeline.runner.tokenize")
+    @patch("disasm2vec.vectorizer.Tfidf.load")
+    @patch("disasm2vec.vectorizer.Tfidf.transform")
+    def test_run_pipeline_batch_vectorizes_duplicates_once(self, mock_transform, mock_load, mock_tokenize, mock_disassemble, mock_compile):
+        mock_tokenize.side_effect = lambda path, entry, keep_register: (
+            ["b"] if "b.asm" in str(path) else ["a"]
+        )
+        mock_transform.side_effect = lambda documents: np.arange(len(documents))
+
+        with patch("pathlib.Path.exists", return_value=True), \
+             patch("pathlib.Path.mkdir"):
+
+            result = batch.run_pipeline_batch(
+                ["a.c", "b.c", "c.c"], self.cfg, workers=1
+            )
+
+        mock_transform.assert_called_once_with([["a"], ["b"]])
+        self.assertEqual(result.X.tolist(), [0, 1, 0])
+        self.assertEqual(result.duplicates, 1)
+
+    @patch("disasm2vec.pipeline.runner.compile_c")
+    @patch("disasm2vec.pipeline.runner.disassemble")
+    @patch("disasm2vec.vectorizer.Tfidf.load")
+    @patch("disasm2vec.vectorizer.Tfidf.transform")
+    def test_run_pipeline_batch_function_cache(self, mock_transform, mock_load, mock_disassemble, mock_compile):
+        def fake_disassemble(binary, output, arch, full, relocatable=False):
+            Path(output).write_text(SAMPLE_ASM)
+
+        mock_disassemble.side_effect = fake_disassemble
+        mock_transform.side_effect = lambda documents: np.arange(len(documents))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cfg = dataclasses.replace(
+                self.cfg,
+                build_dir=tmp,
+                asm_dir=tmp,
+                cache_dir=str(Path(tmp) / "cache"),
+                function_cache=True,
+            )
+            sources = []
+            for name in ("a", "b", "c"):
+                sources.append(Path(tmp) / f"{name}.c")
+                sources[-1].write_text(f"int {name};")
+
+            result = batch.run_pipeline_batch(sources[:2], cfg, workers=1)
+
+            self.assertEqual(result.errors, {})
+            function_cache = runner._function_cache(cfg)
+            self.assertEqual(function_cache.stats().hits, 2)
+            self.assertEqual(result.duplicates, 1)
+            self.assertTrue(
+                (Path(tmp) / "cache" / runner.FUNCTION_CACHE_FILE).exists()
+            )
+
+            metrics = PipelineMetrics()
+            runner.build_tokens(
+                dataclasses.replace(cfg, source_file=str(sources[2])), metrics
+            )
+            self.assertEqual(metrics.function_cache_hits, 2)
+            self.assertEqual(metrics.function_cache_misses, 0)
+
+    def tearDown(self):
+        get_model_registry().invalidate()
+
+    def test_run_pipeline_batch_duplicate_stems(self):
+        with self.assertRaisesRegex(ValueError, "Duplicate source stem"):
+            batch.run_pipeline_batch(["x/a.c", "y/a.cpp"], self.cfg, workers=1)
+
+    def test_run_pipeline_batch_missing_model_path(self):
+        cfg = config.PipelineConfig(
+            source_file="",
+            build_dir="build",
+            asm_dir="asm",
+        )
+        with self.assertRaisesRegex(ValueError, "model_path is required"):
+            batch.run_pipeline_batch(["a.c"], cfg, workers=1)
+
+@patch("disasm2vec.pipeline.cache._compiler_version", return_value="gcc 1.0")
+class TestBuildCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.source = self.root / "a.c"
+        self.source.write_text("int main() { return 0; }")
+        self.asm = self.root / "a.asm"
+        self.asm.write_text("x" * 100)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_depends_on_settings(self, _):
+        build_cache = cache.BuildCache(self.root / "cache")
+        base = build_cache.key(self.source, "gcc", "-O0")
+
+        self.assertEqual(base, build_cache.key(self.source, "gcc", "-O0"))
+        self.assertNotEqual(base, build_cache.key(self.source, "gcc", "-O2"))
+        self.assertNotEqual(base, build_cache.key(self.source, "gcc", "-O0", full=True))
+        self.assertNotEqual(base, build_cache.key(self.source, "gcc", "-O0", arch="i386"))
+
+        self.source.write_text("int main() { return 1; }")
+        self.assertNotEqual(base, build_cache.key(self.source, "gcc", "-O0"))
+
+    def test_get_put_stats(self, _):
+        build_cache = cache.BuildCache(self.root / "cache")
+        key = build_cache.key(self.source, "gcc", "-O0")
+
+        self.assertIsNone(build_cache.get(key))
+        build_cache.put(key, self.asm)
+        cached = build_cache.get(key)
+
+        self.assertEqual(cached.read_text(), "x" * 100)
+        self.assertEqual(
+            build_cache.stats(),
+            cache.CacheStats(hits=1, misses=1, stores=1, evictions=0),
+        )
+
+    def test_lru_eviction(self, _):
+        build_cache = cache.BuildCache(self.root / "cache", max_bytes=250)
+
+        for key in ("aa1", "bb2"):
+            build_cache.put(key, self.asm)
+
+        # Make "aa1" the oldest entry, then refresh it with a hit.
+        os.utime(build_cache._entry_path("aa1"), (1, 1))
+        os.utime(build_cache._entry_path("bb2"), (2, 2))
+        build_cache.get("aa1")
+
+        build_cache.put("cc3", self.asm)
+
+        self.assertIsNotNone(build_cache.get("aa1"))
+        self.assertIsNone(build_cache.get("bb2"))
+        self.assertIsNotNone(build_cache.get("cc3"))
+        self.assertEqual(build_cache.stats().evictions, 1)
+        self.assertLessEqual(build_cache.size(), 250)
+
+    @patch("disasm2vec.pipeline.runner.compile_c")
+    @patch("disasm2vec.pipeline.runner.disassemble")
+    @patch("disasm2vec.pipeline.runner.tokenize")
+    def test_build_tokens_uses_cache(self, mock_tokenize, mock_disassemble, mock_compile, _):
+        def fake_disassemble(binary, output, arch, full, relocatable=False):
+            Path(output).write_text("listing")
+
+        mock_disassemble.side_effect = fake_disassemble
+        mock_tokenize.return_value = ["ret"]
+
+        cfg = config.PipelineConfig(
+            source_file=str(self.source),
+            build_dir=str(self.root / "build"),
+            asm_dir=str(self.root / "asm"),
+            cache_dir=str(self.root / "cache"),
+        )
+
+        runner.build_tokens(cfg)
+        (self.root / "asm" / "a.asm").unlink()
+        runner.build_tokens(cfg)
+
+        mock_compile.assert_called_once()
+        mock_disassemble.assert_called_once()
+        self.assertEqual((self.root / "asm" / "a.asm").read_text(), "listing")
+
+        stats = cache.get_build_cache(cfg.cache_dir).stats()
+        self.assertEqual((stats.hits, stats.misses), (1, 1))
+
+
+@patch("disasm2vec.pipeline.corpus._compiler_version", return_value="gcc 1.0")
+@patch("disasm2vec.pipeline.runner.compile_c")
+@patch("disasm2vec.pipeline.runner.disassemble")
+@patch("disasm2vec.pipeline.runner.tokenize")
+class TestCorpus(unittest.TestCase):
+    def setUp(self):
+        get_model_registry().invalidate()
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+        self.src_dir = self.root / "src"
+        self.src_dir.mkdir()
+        for name in ("a", "b", "c"):
+            (self.src_dir / f"{name}.c").write_text(f"int {name};")
+
+        model_path = self.root / "model.pkl"
+        Tfidf().fit([["a.asm"], ["b.asm"], ["c.asm"]]).save(model_path)
+
+        self.cfg = config.PipelineConfig(
+            source_file="",
+            build_dir=str(self.root / "build"),
+            asm_dir=str(self.root / "asm"),
+            model_path=str(model_path),
+        )
+        self.work_dir = str(self.root / "work")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        get_model_registry().invalidate()
+
+    def _mock_stages(self, mock_tokenize, mock_disassemble, mock_compile):
+        def fake_compile(source, output, flags, link=True):
+            Path(output).write_text(f"{Path(source).read_text()}\n{flags}")
+
+        def fake_disassemble(binary, output, arch, full, relocatable=False):
+            # Listing depends only on the source, not on the flags
+            Path(output).write_text(Path(binary).read_text().split("\n")[0])
+
+        def fake_tokenize(path, entry, keep_register):
+            if Path(path).read_text() == "int bad;":
+                raise ValueError("Function 'main' not found.")
+            return [Path(path).name, Path(path).read_text()]
+
+        mock_compile.side_effect = fake_compile
+        mock_disassemble.side_effect = fake_disassemble
+        mock_tokenize.side_effect = fake_tokenize
+
+    def _run(self, cfg=None):
+        return corpus.run_corpus(
+            str(self.src_dir), cfg or self.cfg, self.work_dir, workers=1
+        )
+
+    def test_resume_skips_finished_work(self, mock_tokenize, mock_disassemble, mock_compile, _):
+        self._mock_stages(mock_tokenize, mock_disassemble, mock_compile)
+
+        report = self._run()
+        self.assertEqual(report.ran["compiled"], 3)
+        self.assertEqual(report.ran["vectorized"], 3)
+        self.assertEqual(report.skipped, 0)
+
+        sources, X = report.vectors()
+        self.assertEqual([Path(s).name for s in sources], ["a.c", "b.c", "c.c"])
+        self.assertEqual(X.shape, (3, 3))
+
+        report = self._run()
+        self.assertEqual(report.skipped, 3)
+        self.assertEqual(mock_compile.call_count, 3)
+        self.assertEqual(len(report.store), 3)
+
+    def test_only_changed_entries_rerun(self, mock_tokenize, mock_disassemble, mock_compile, _):
+        self._mock_stages(mock_tokenize, mock_disassemble, mock_compile)
+        self._run()
+
+        (self.src_dir / "b.c").write_text("int bb;")
+        report = self._run()
+
+        self.assertEqual(report.ran["compiled"], 1)
+        self.assertEqual(report.ran["tokenized"], 1)
+        self.assertEqual(report.ran["vectorized"], 1)
+        self.assertEqual(report.skipped, 2)
+
+        # New flags recompile everything, but identical listings
+        # are not tokenized again.
+        report = self._run(dataclasses.replace(self.cfg, optimize="-O2"))
+
+        self.assertEqual(report.ran["compiled"], 3)
+        self.assertEqual(report.ran["disassembled"], 3)
+        self.assertEqual(report.ran["tokenized"], 0)
+        self.assertEqual(report.ran["vectorized"], 0)
+
+    def test_errors_are_recorded_and_retried(self, mock_tokenize, mock_disassemble, mock_compile, _):
+        self._mock_stages(mock_tokenize, mock_disassemble, mock_compile)
+        (self.src_dir / "b.c").write_text("int bad;")
+
+        report = self._run()
+        bad = str(self.src_dir / "b.c")
+
+        self.assertIn("not found", report.errors[bad])
+        self.assertEqual(report.manifest.entries[bad]["stage"], "disassembled")
+        self.assertEqual(len(report.vectors()[0]), 2)
+
+        manifest = corpus.CorpusManifest.load(Path(self.work_dir) / "manifest.json")
+        self.assertEqual(manifest.entries[bad]["error"], report.errors[bad])
+
+        (self.src_dir / "b.c").write_text("int b;")
+        report = self._run()
+
+        self.assertEqual(report.errors, {})
+        self.assertEqual(report.ran["vectorized"], 1)
+        self.assertEqual(len(report.vectors()[0]), 3)
+
+    def test_identical_documents_vectorized_once(self, mock_tokenize, mock_disassemble, mock_compile, _):
+        self._mock_stages(mock_tokenize, mock_disassemble, mock_compile)
+        mock_tokenize.side_effect = lambda path, entry, keep_register: ["a.asm"]
+
+        with patch(
+            "disasm2vec.vectorizer.Tfidf.transform",
+            autospec=True,
+            side_effect=Tfidf.transform,
+        ) as mock_transform:
+            # One document per batch: duplicates span batches
+            report = corpus.run_corpus(
+                str(self.src_dir), self.cfg, self.work_dir, workers=1, batch_size=1
+            )
+
+            self.assertEqual(report.duplicates, 2)
+            mock_transform.assert_called_once()
+            self.assertEqual(len(mock_transform.call_args[0][1]), 1)
+            self.assertEqual(len(report.store), 1)
+
+            _, X = report.vectors()
+            self.assertEqual(X.shape[0], 3)
+            self.assertEqual(abs(X[0] - X[2]).max(), 0.0)
+
+            # A new identical source reuses the row of the previous run
+            (self.src_dir / "d.c").write_text("int d;")
+            report = self._run()
+
+            mock_transform.assert_called_once()
+            self.assertEqual(report.duplicates, 1)
+            self.assertEqual(len(report.store), 1)
+            self.assertEqual(report.vectors()[1].shape[0], 4)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,219 @@
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+
+from disasm2vec.compiler.errors import CompilationError
+from disasm2vec.pipeline import get_build_cache
+from disasm2vec.server import (
+    EmbeddingServer,
+    EmbeddingService,
+    MicroBatcher,
+    ServerConfig,
+)
+from disasm2vec.tokenizer import tokenize_lines
+from disasm2vec.vectorizer import Tfidf, get_model_registry
+
+from tests.test_tokenizer import SAMPLE_ASM
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_batches_concurrent_items(self):
+        calls = []
+        gate = threading.Event()
+
+        def fn(items):
+            gate.wait()
+            calls.append(list(items))
+            return [item * 2 for item in items]
+
+        with MicroBatcher(fn, max_batch_size=8, max_latency=0.01) as batcher:
+            first = batcher.submit(0)
+            time.sleep(0.05)
+
+            # These queue up while the first batch is running
+            futures = [batcher.submit(i) for i in range(1, 6)]
+            gate.set()
+
+            self.assertEqual(first.result(), 0)
+            self.assertEqual([f.result() for f in futures], [2, 4, 6, 8, 10])
+
+        self.assertEqual(calls, [[0], [1, 2, 3, 4, 5]])
+        self.assertEqual(batcher.batches, 2)
+
+    def test_max_batch_size(self):
+        calls = []
+
+        def fn(items):
+            calls.append(len(items))
+            return items
+
+        batcher = MicroBatcher(fn, max_batch_size=2, max_latency=1.0)
+        futures = [batcher.submit(i) for i in range(5)]
+        self.assertEqual([f.result() for f in futures], list(range(5)))
+        batcher.close()
+
+        self.assertEqual(calls[:2], [2, 2])
+        self.assertEqual(sum(calls), 5)
+
+    def test_error_fails_batch(self):
+        def fn(items):
+            raise RuntimeError("boom")
+
+        with MicroBatcher(fn) as batcher:
+            future = batcher.submit(1)
+            with self.assertRaisesRegex(RuntimeError, "boom"):
+                future.result()
+
+        with self.assertRaises(RuntimeError):
+            batcher.submit(2)
+
+
+class TestEmbeddingServer(unittest.TestCase):
+    def setUp(self):
+        get_model_registry().invalidate()
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.tmp.name, "model.pkl")
+
+        self.tokens = tokenize_lines(SAMPLE_ASM.splitlines(keepends=True))
+        self.model = Tfidf().fit([self.tokens, ["nop", "ret"]])
+        self.model.save(self.model_path)
+
+        config = ServerConfig(model_path=self.model_path, port=0, workers=2)
+        self.server = EmbeddingServer(config, quiet=True)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+        host, port = self.server.server_address
+        self.url = f"http://{host}:{port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.tmp.cleanup()
+        get_model_registry().invalidate()
+
+    def _post(self, payload):
+        request = urllib.request.Request(
+            self.url + "/embed",
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_embed_asm(self):
+        status, body = self._post({"asm": SAMPLE_ASM})
+        self.assertEqual(status, 200)
+
+        expected = self.model.transform_one(self.tokens)
+        expected.sort_indices()
+
+        self.assertEqual(body["shape"], list(expected.shape))
+        self.assertEqual(body["indices"], expected.indices.tolist())
+        for value, ref in zip(body["values"], expected.data):
+            self.assertAlmostEqual(value, ref)
+        self.assertEqual(body["n_tokens"], len(self.tokens))
+
+    def test_concurrent_requests(self):
+        results = []
+
+        def worker():
+            results.append(self._post({"asm": SAMPLE_ASM, "entry": "helper"}))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual([status for status, _ in results], [200] * 8)
+        self.assertEqual(len({json.dumps(body) for _, body in results}), 1)
+
+        with urllib.request.urlopen(self.url + "/health") as response:
+            health = json.loads(response.read())
+
+        self.assertEqual(health["requests"], 8)
+        self.assertLessEqual(health["batches"], 8)
+
+    def test_bad_requests(self):
+        status, body = self._post({"asm": SAMPLE_ASM, "source": "int main;"})
+        self.assertEqual(status, 400)
+
+        status, body = self._post({"asm": SAMPLE_ASM, "entry": "missing"})
+        self.assertEqual(status, 400)
+        self.assertIn("not found", body["error"])
+
+        status, body = self._post({"source": "", "language": "rust"})
+        self.assertEqual(status, 400)
+
+        status, body = self._post({"asm": ["not", "a", "string"]})
+        self.assertEqual(status, 400)
+        self.assertIn("must be a string", body["error"])
+
+    def test_bad_content_length(self):
+        host, port = self.server.server_address
+
+        for length in ("abc", "-1", "1e3"):
+            with self.subTest(length=length):
+                conn = http.client.HTTPConnection(host, port, timeout=5)
+                try:
+                    conn.putrequest("POST", "/embed")
+                    conn.putheader("Content-Length", length)
+                    conn.endheaders()
+                    response = conn.getresponse()
+
+                    self.assertEqual(response.status, 400)
+                    self.assertIn("Content-Length", json.loads(response.read())["error"])
+                finally:
+                    conn.close()
+
+    @patch("disasm2vec.pipeline.runner.compile_c")
+    def test_compile_error(self, mock_compile):
+        mock_compile.side_effect = CompilationError("failed", stderr="error: x")
+
+        status, body = self._post({"source": "int main(", "language": "c"})
+
+        self.assertEqual(status, 422)
+        self.assertEqual(body["stderr"], "error: x")
+
+    @patch("disasm2vec.pipeline.runner.compile_c")
+    @patch("disasm2vec.pipeline.runner.disassemble_stream")
+    def test_source_build_cache(self, mock_stream, mock_compile):
+        mock_stream.side_effect = lambda *args, **kwargs: iter(
+            SAMPLE_ASM.splitlines(keepends=True)
+        )
+        cache_dir = os.path.join(self.tmp.name, "cache")
+
+        service = EmbeddingService(
+            ServerConfig(model_path=self.model_path, cache_dir=cache_dir)
+        )
+        try:
+            request = {"source": "int main(void) { return 0; }"}
+            first = service.tokens(request)
+            second = service.tokens(request)
+        finally:
+            service.close()
+
+        self.assertEqual(first, self.tokens)
+        self.assertEqual(second, self.tokens)
+        mock_compile.assert_called_once()
+        mock_stream.assert_called_once()
+
+        stats = get_build_cache(cache_dir).stats()
+        self.assertEqual((stats.hits, stats.misses, stats.stores), (1, 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
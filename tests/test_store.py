@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from scipy import sparse
+
+from disasm2vec.store import VectorStore, hash_model
+
+
+class TestVectorStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "store")
+
+        self.X = sparse.random(25, 40, density=0.2, format="csr", random_state=0)
+        self.names = [f"f{i}.c" for i in range(25)]
+
+        store = VectorStore(self.path, model_hash="abc")
+        store.append(self.names[:10], self.X[:10])
+        store.append(self.names[10:12], self.X[10:12])
+        store.append(self.names[12:], self.X[12:])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assertSameRows(self, A, B):
+        self.assertEqual(A.shape, B.shape)
+        self.assertEqual(abs(A - B).sum(), 0)
+
+    def test_reopen_and_slice(self):
+        store = VectorStore(self.path)
+
+        self.assertEqual(store.shape, (25, 40))
+        self.assertEqual(store.model_hash, "abc")
+        self.assertEqual(store.names(), self.names)
+
+        self.assertSameRows(store.to_csr(), self.X)
+        self.assertSameRows(store[5:15], self.X[5:15])
+        self.assertSameRows(store[3], self.X[3])
+        self.assertSameRows(store[-1], self.X[24])
+        self.assertSameRows(store[::4], self.X[::4])
+        self.assertEqual(store[30:40].shape, (0, 40))
+
+        with self.assertRaises(IndexError):
+            store[25]
+
+    def test_random_access(self):
+        store = VectorStore(self.path)
+
+        self.assertSameRows(store.take([20, 0, 11]), self.X[[20, 0, 11]])
+        self.assertSameRows(store.get(["f11.c", "f2.c"]), self.X[[11, 2]])
+        self.assertIn("f24.c", store)
+
+        chunks = list(store.iter_chunks())
+        self.assertEqual([len(names) for names, _ in chunks], [10, 2, 13])
+
+    def test_append_after_reopen(self):
+        store = VectorStore(self.path, model_hash="abc")
+        extra = sparse.random(3, 40, density=0.5, format="csr", random_state=1)
+        store.append(["x", "y", "z"], extra)
+
+        store = VectorStore(self.path)
+        self.assertEqual(len(store), 28)
+        self.assertSameRows(store.get("y"), extra[1])
+
+        with self.assertRaises(ValueError):
+            store.append(["x"], extra[:1])
+        with self.assertRaises(ValueError):
+            store.append(["w"], sparse.csr_matrix((1, 7)))
+
+    def test_model_hash_mismatch(self):
+        with self.assertRaises(ValueError):
+            VectorStore(self.path, model_hash="other")
+
+    def test_incomplete_chunk_is_ignored(self):
+        # Chunk files without a manifest entry (an interrupted append)
+        np.save(os.path.join(self.path, "chunk-00003.data.npy"), np.zeros(3))
+
+        store = VectorStore(self.path)
+        self.assertEqual(len(store), 25)
+
+        store.append(["new"], self.X[:1])
+        self.assertSameRows(VectorStore(self.path).get("new"), self.X[0])
+
+    def test_hash_model(self):
+        model = os.path.join(self.tmp.name, "model.pkl")
+        with open(model, "wb") as f:
+            f.write(b"model")
+
+        digest = hash_model(model)
+        self.assertEqual(len(digest), 64)
+
+        with open(model, "wb") as f:
+            f.write(b"model2")
+        self.assertNotEqual(hash_model(model), digest)
+
+
+if __name__ == "__main__":
+    unittest.main()
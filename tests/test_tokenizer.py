@@ -1,5 +1,56 @@
+import re
+import tempfile
+import numpy as np
 import unittest
-from disasm2vec.tokenizer import core, cleaner, normalizer
+from pathlib import Path
+from unittest.mock import patch
+from disasm2vec.tokenizer import core, cleaner, normalizer, encoded, function_cache
+
+
+SAMPLE_ASM = """
+0000000000001129 <helper>:
+    1129:	f3 0f 1e fa          	endbr64 
+    112d:	55                   	push   %rbp
+    112e:	48 89 e5             	mov    %rsp,%rbp
+    1131:	89 7d fc             	mov    %edi,-0x4(%rbp)
+    1134:	8b 45 fc             	mov    -0x4(%rbp),%eax
+    1137:	83 c0 01             	add    $0x1,%eax
+    113a:	5d                   	pop    %rbp
+    113b:	c3                   	ret    
+
+000000000000113c <main>:
+    113c:	f3 0f 1e fa          	endbr64 
+    1140:	55                   	push   %rbp
+    1141:	48 89 e5             	mov    %rsp,%rbp
+    1144:	bf 05 00 00 00       	mov    $0x5,%edi
+    1149:	e8 db ff ff ff       	call   1129 <helper>
+    114e:	bf 06 00 00 00       	mov    $0x6,%edi
+    1153:	e8 d1 ff ff ff       	call   1129 <helper>
+    1158:	e8 c3 fe ff ff       	call   1020 <puts@plt>
+    115d:	b8 00 00 00 00       	mov    $0x0,%eax
+    1162:	5d                   	pop    %rbp
+    1163:	c3                   	ret    
+"""
+
+# (line, tokens, tokens with keep_register=True) as produced by the
+# original token-by-token tokenizer.
+GOLDEN_INSTRUCTIONS = [
+    ("    1149:\tf3 0f 1e fa          \tendbr64 ", ["endbr64"], ["endbr64"]),
+    ("    1151:\t48 83 ec 20          \tsub    $0x20,%rsp", ["sub", "MEM", "REG"], ["sub", "MEM", "rsp"]),
+    ("    1158:\t64 48 8b 04 25 28 00 \tmov    %fs:0x28,%rax", ["mov", "MEM", "REG"], ["mov", "MEM", "rax"]),
+    ("    115f:\t00 00 ", None, None),
+    ("    116f:\t48 8d 05 8e 0e 00 00 \tlea    0xe8e(%rip),%rax        # 2004 <_IO_stdin_used+0x4>", ["lea", "MEM", "REG"], ["lea", "MEM", "rax"]),
+    ("    117b:\t83 c0 05             \tadd    $5,%eax", ["add", "IMM", "REG"], ["add", "IMM", "eax"]),
+    ("    1034:\tf2 ff 25 9d 2f 00 00 \tbnd jmp *0x2f9d(%rip)        # 3fd8 <printf@GLIBC_2.2.5>", ["bnd", "MEM"], ["bnd", "MEM"]),
+    ("    1072:\t66 2e 0f 1f 84 00 00 \tcs nopw 0x0(%rax,%rax,1)", ["cs", "MEM", "REG", "1)"], ["cs", "MEM", "rax", "1)"]),
+    ("    11a0:\tf3 48 ab             \trep stos %rax,%es:(%rdi)", ["rep", "REG", "MEM"], ["rep", "rax", "MEM"]),
+    ("    11b0:\tff                   \t(bad)  ", None, None),
+    ("    1149:\tendbr64", ["endbr64"], ["endbr64"]),
+    ("    1149: 55 push %rbp", ["push", "REG"], ["push", "rbp"]),
+    ("    114d:\t55                   \tpush   %rbp\n", ["push", "REG"], ["push", "rbp"]),
+    ("0000000000001149 <main>:", None, None),
+]
+
 
 class TestTokenizer(unittest.TestCase):
     def test_is_instruction_line(self):
@@ -46,9 +97,374 @@ class TestTokenizer(unittest.TestCase):
         tokens = core.tokenize_instruction(line)
         self.assertEqual(tokens, ["jmp", "JMP"])
 
+    def test_tokenize_instruction_golden(self):
+        for line, expected, expected_keep in GOLDEN_INSTRUCTIONS:
+            with self.subTest(line=line):
+                self.assertEqual(core.tokenize_instruction(line), expected)
+                self.assertEqual(
+                    core.tokenize_instruction(line, keep_register=True),
+                    expected_keep,
+                )
+
+    def test_lexer_matches_generic_parser(self):
+        for line in SAMPLE_ASM.splitlines():
+            if ":" not in line:
+                continue
+
+            body = line.split(":", 1)[1]
+            for keep_register in (False, True):
+                expected = core._parse_generic(body.split(), keep_register)
+                self.assertEqual(
+                    core.tokenize_instruction(line, keep_register),
+                    list(expected) if expected else None,
+                )
+
     def test_tokenize_invalid_lines(self):
         self.assertIsNone(core.tokenize_instruction("invalid line"))
         self.assertIsNone(core.tokenize_instruction("    1149: ")) 
 
+    def test_tokenize_lines_matches_tokenize(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sample.asm"
+            path.write_text(SAMPLE_ASM)
+
+            expected = core.tokenize(path)
+
+        self.assertEqual(core.tokenize_lines(SAMPLE_ASM.splitlines(True)), expected)
+        self.assertEqual(expected[:3], ["endbr64", "push REG", "mov REG REG"])
+        self.assertIn("add MEM REG", expected)
+        self.assertIn("call FUNC", expected)
+
+        with self.assertRaises(ValueError):
+            core.tokenize_lines(SAMPLE_ASM.splitlines(), entry="missing")
+
+    def test_tokenize_stats(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sample.asm"
+            path.write_text(SAMPLE_ASM)
+
+            stats = core.TokenizeStats()
+            tokens = core.tokenize(path, stats=stats)
+
+            self.assertEqual(tokens, core.tokenize(path))
+
+        self.assertEqual(stats.asm_bytes, len(SAMPLE_ASM))
+        self.assertEqual(stats.functions, 2)
+        self.assertEqual(stats.instructions, 19)
+        self.assertEqual(stats.tokens, len(tokens))
+        # helper is inlined at the first call only
+        self.assertEqual(stats.inlined_calls, 1)
+        self.assertEqual(stats.inline_depth, 2)
+        self.assertGreaterEqual(stats.split_wall, 0.0)
+
+        lines_stats = core.TokenizeStats()
+        core.tokenize_lines(SAMPLE_ASM.splitlines(True), stats=lines_stats)
+        self.assertEqual(lines_stats.asm_bytes, stats.asm_bytes)
+        self.assertEqual(lines_stats.instructions, stats.instructions)
+
+    def test_tokenize_stats_counts_encoded_bytes(self):
+        asm = SAMPLE_ASM.replace("helper", "h\u00e9lper")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sample.asm"
+            path.write_text(asm, encoding="utf-8")
+
+            stats = core.TokenizeStats()
+            core.tokenize(path, stats=stats)
+
+        lines_stats = core.TokenizeStats()
+        core.tokenize_lines(asm.splitlines(True), stats=lines_stats)
+
+        self.assertEqual(stats.asm_bytes, len(asm.encode()))
+        self.assertEqual(lines_stats.asm_bytes, stats.asm_bytes)
+
+    def test_function_table_tokenizes_once(self):
+        functions = core._split_function_lines(SAMPLE_ASM.splitlines())
+        table = core._FunctionTable(functions, keep_register=False)
+
+        with patch(
+            "disasm2vec.tokenizer.core.tokenize_instruction",
+            wraps=core.tokenize_instruction,
+        ) as mock_tokenize:
+            first = core._expand_function("main", table, visited=set())
+            second = core._expand_function("main", table, visited=set())
+
+        self.assertEqual(first, second)
+        self.assertEqual(
+            mock_tokenize.call_count,
+            len(functions["main"]) + len(functions["helper"]),
+        )
+
+        body = table.body("main")
+        self.assertEqual(body.calls, [(4, "helper"), (6, "helper")])
+        self.assertIs(table.body("main"), body)
+
+    def test_tokenize_functions(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sample.asm"
+            path.write_text(
+                SAMPLE_ASM
+                + "\n0000000000001000 <_start>:\n"
+                + "    1000:\tf3 0f 1e fa          \tendbr64\n"
+            )
+
+            documents = core.tokenize_functions(path)
+
+            self.assertEqual(list(documents), ["helper", "main"])
+            for name, tokens in documents.items():
+                self.assertEqual(tokens, core.tokenize(path, entry=name))
+
+            documents = core.tokenize_functions(path, entries=["main"], keep_register=True)
+            self.assertEqual(list(documents), ["main"])
+            self.assertEqual(
+                documents["main"],
+                core.tokenize(path, keep_register=True, entry="main"),
+            )
+
+            with self.assertRaises(ValueError):
+                core.tokenize_functions(path, entries=["missing"])
+
+    def test_tokenize_batch_workers_and_errors(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("c.asm", "a.asm", "b.asm"):
+                (Path(tmp) / name).write_text(SAMPLE_ASM)
+            (Path(tmp) / "broken.asm").write_text("no functions here\n")
+
+            serial = core.tokenize_batch(tmp, on_error="collect")
+            parallel = core.tokenize_batch(tmp, workers=2, chunksize=1, on_error="collect")
+
+            self.assertEqual(list(serial), ["a.asm", "b.asm", "c.asm"])
+            self.assertEqual(serial, parallel)
+            self.assertEqual(list(parallel), list(serial))
+            self.assertEqual(list(serial.errors), ["broken.asm"])
+            self.assertEqual(parallel.errors, serial.errors)
+
+            skipped = core.tokenize_batch(tmp, on_error="skip")
+            self.assertEqual(skipped, serial)
+            self.assertEqual(skipped.errors, {})
+
+            with self.assertRaises(ValueError):
+                core.tokenize_batch(tmp)
+            with self.assertRaises(ValueError):
+                core.tokenize_batch(tmp, workers=2)
+            with self.assertRaises(ValueError):
+                core.tokenize_batch(tmp, on_error="ignore")
+
+    def test_iter_tokenize_and_corpus(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("b.asm", "a.asm"):
+                (Path(tmp) / name).write_text(SAMPLE_ASM)
+            (Path(tmp) / "broken.asm").write_text("no functions here\n")
+
+            expected = core.tokenize_batch(tmp, on_error="skip")
+
+            stream = core.iter_tokenize(tmp, on_error="skip")
+            self.assertNotIsInstance(stream, (list, dict))
+            self.assertEqual(dict(stream), expected)
+
+            with self.assertRaises(ValueError):
+                list(core.iter_tokenize(tmp))
+
+            corpus = core.AsmCorpus(tmp, on_error="skip")
+            self.assertEqual(list(corpus), list(expected.values()))
+            self.assertEqual(list(corpus), list(expected.values()))
+            self.assertEqual(corpus.names(), ["a.asm", "b.asm", "broken.asm"])
+
+            with self.assertRaises(ValueError):
+                core.AsmCorpus(tmp, on_error="collect")
+
+
+# SAMPLE_ASM linked at another address: every address, call target
+# and rel32 displacement differs, the instructions do not.
+SHIFTED_ASM = re.sub(r"\b11([0-9a-f]{2})\b", r"21\1", SAMPLE_ASM).replace(
+    "e8 db ff ff ff", "e8 0b ee ff ff"
+)
+
+
+class TestFunctionCache(unittest.TestCase):
+    def _key(self, asm, name, keep_register=False):
+        functions = core._split_function_lines(asm.splitlines())
+        return function_cache.function_key(functions[name], keep_register)
+
+    def test_function_key_masks_addresses(self):
+        self.assertNotEqual(SHIFTED_ASM, SAMPLE_ASM)
+        for name in ("main", "helper"):
+            self.assertEqual(self._key(SAMPLE_ASM, name), self._key(SHIFTED_ASM, name))
+
+        self.assertNotEqual(self._key(SAMPLE_ASM, "main"), self._key(SAMPLE_ASM, "helper"))
+        self.assertNotEqual(
+            self._key(SAMPLE_ASM, "main"),
+            self._key(SAMPLE_ASM, "main", keep_register=True),
+        )
+
+        # Anything that changes tokens or call sites changes the key.
+        for old, new in (
+            ("<helper>\n", "<other>\n"),
+            ("$0x5,%edi", "%eax,%edi"),
+            ("puts@plt", "puts"),
+        ):
+            changed = SAMPLE_ASM.replace(old, new, 1)
+            self.assertNotEqual(self._key(SAMPLE_ASM, "main"), self._key(changed, "main"))
+
+        line = "    1152:\tff 15 a0 2e 00 00 \tcall   *0x2ea0(%rip)        # 3ff8 <{}>"
+        self.assertNotEqual(
+            function_cache.function_key([line.format("f")], False),
+            function_cache.function_key([line.format("g")], False),
+        )
+
+    def test_tokenize_reuses_bodies(self):
+        cache = function_cache.FunctionCache()
+
+        first = core.tokenize_lines(SAMPLE_ASM.splitlines(True), function_cache=cache)
+        self.assertEqual(first, core.tokenize_lines(SAMPLE_ASM.splitlines(True)))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats().hits, 0)
+
+        with patch(
+            "disasm2vec.tokenizer.core.tokenize_instruction",
+            wraps=core.tokenize_instruction,
+        ) as mock_tokenize:
+            second = core.tokenize_lines(SHIFTED_ASM.splitlines(True), function_cache=cache)
+
+        self.assertEqual(second, first)
+        mock_tokenize.assert_not_called()
+
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses), (2, 2))
+        self.assertEqual(stats.instructions_saved, 11 + 8)
+
+    def test_save_load_and_eviction(self):
+        cache = function_cache.FunctionCache(max_entries=1)
+        core.tokenize_lines(SAMPLE_ASM.splitlines(True), function_cache=cache)
+
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.stats().evictions, 1)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "functions.json"
+            cache = function_cache.FunctionCache(path)
+            expected = core.tokenize_lines(SAMPLE_ASM.splitlines(True), function_cache=cache)
+            cache.save()
+
+            loaded = function_cache.FunctionCache(path)
+            self.assertEqual(len(loaded), 2)
+            self.assertEqual(
+                core.tokenize_lines(SHIFTED_ASM.splitlines(True), function_cache=loaded),
+                expected,
+            )
+            self.assertEqual(loaded.stats().misses, 0)
+
+            path.write_text('{"format": "other"}')
+            with self.assertRaises(ValueError):
+                function_cache.FunctionCache(path)
+
+    def test_tokenize_batch_shares_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "a.asm").write_text(SAMPLE_ASM)
+            (Path(tmp) / "b.asm").write_text(SHIFTED_ASM)
+            expected = core.tokenize_batch(tmp)
+
+            cache = function_cache.FunctionCache()
+            self.assertEqual(core.tokenize_batch(tmp, function_cache=cache), expected)
+            self.assertEqual(cache.stats().hits, 2)
+
+            # Bodies tokenized in worker processes come back to the parent.
+            cache = function_cache.FunctionCache()
+            parallel = core.tokenize_batch(tmp, workers=2, function_cache=cache)
+            self.assertEqual(parallel, expected)
+            self.assertEqual(len(cache), 2)
+            # ... and so do their lookup counters (hits depend on how
+            # the files were split between workers, lookups do not).
+            stats = cache.stats()
+            self.assertEqual(stats.hits + stats.misses, 4)
+            self.assertEqual(stats.instructions_saved > 0, stats.hits > 0)
+            cache.reset_stats()
+
+            corpus = core.AsmCorpus(tmp, function_cache=cache)
+            self.assertEqual(list(corpus), list(expected.values()))
+            self.assertEqual(cache.stats().hits, 4)
+
+
+class TestEncodedCorpus(unittest.TestCase):
+    def setUp(self):
+        self.documents = [
+            ["mov REG REG", "call FUNC", "ret"],
+            [],
+            ["push REG", "mov REG REG", "ret"],
+        ]
+
+    def test_write_and_reopen(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            written = encoded.EncodedCorpus.write(
+                tmp, self.documents, names=["a", "b", "c"]
+            )
+            corpus = encoded.EncodedCorpus(tmp)
+
+            self.assertEqual(len(corpus), 3)
+            self.assertEqual(list(corpus), self.documents)
+            self.assertEqual(list(written), self.documents)
+            self.assertEqual(corpus.names(), ["a", "b", "c"])
+            self.assertEqual(corpus.vocab.tokens, written.vocab.tokens)
+            np.testing.assert_array_equal(corpus.ids(0), [0, 1, 2])
+
+            # Little-endian on disk and in the memory map, on any host
+            self.assertEqual(corpus.tokens.dtype, np.dtype("<i4"))
+            self.assertEqual(
+                (Path(tmp) / encoded.TOKENS_FILE).read_bytes()[:8],
+                b"\x00\x00\x00\x00\x01\x00\x00\x00",
+            )
+
+    def test_ids_indexing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            corpus = encoded.EncodedCorpus.write(tmp, self.documents)
+
+            np.testing.assert_array_equal(corpus.ids(-1), corpus.ids(2))
+            self.assertEqual(corpus[-3], self.documents[0])
+            self.assertEqual(corpus.names(), ["0", "1", "2"])
+
+            for index in (3, -4):
+                with self.assertRaises(IndexError):
+                    corpus.ids(index)
+
+    def test_empty_corpus(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            corpus = encoded.EncodedCorpus.write(tmp, [[], []])
+
+            self.assertEqual(len(corpus), 2)
+            self.assertEqual(len(corpus.tokens), 0)
+            self.assertEqual(corpus.tokens.dtype, np.dtype("<i4"))
+            self.assertEqual(list(corpus), [[], []])
+            self.assertEqual(len(corpus.vocab), 0)
+
+    def test_bad_input(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaisesRegex(ValueError, "2 names for 3 documents"):
+                encoded.EncodedCorpus.write(tmp, self.documents, names=["a", "b"])
+
+            with self.assertRaises(TypeError):
+                encoded.EncodedCorpus.write(tmp, ["mov REG REG"])
+
+    def test_vocab_save_load(self):
+        vocab = encoded.InstructionVocab(["mov REG REG", "ret"])
+        self.assertEqual(vocab.intern("ret"), 1)
+        self.assertEqual(vocab.intern("push REG"), 2)
+
+        with self.assertRaises(ValueError):
+            vocab.intern("mov\nret")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "vocab.txt"
+            vocab.save(path)
+            loaded = encoded.InstructionVocab.load(path)
+
+            encoded.InstructionVocab().save(path)
+            empty = encoded.InstructionVocab.load(path)
+
+        self.assertEqual(loaded.tokens, vocab.tokens)
+        self.assertEqual(loaded.ids, vocab.ids)
+        self.assertEqual(loaded.decode([2, 0]), ["push REG", "mov REG REG"])
+        self.assertEqual(len(empty), 0)
+
+
 if __name__ == '__main__':
     unittest.main()
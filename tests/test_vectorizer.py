@@ -2,10 +2,13 @@ import unittest
 from unittest.mock import MagicMock, patch
 import tempfile
 import os
-from disasm2vec.vectorizer import tfidf
+from disasm2vec.vectorizer import tfidf, hashing, registry, unique_documents
 from disasm2vec.vectorizer.factory import get_vectorizer, load_vectorizer, DEFAULT_MODEL_PATH
 from disasm2vec.vectorizer.base import VectorizerBase
 import pickle
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from disasm2vec.tokenizer import EncodedCorpus
 
 class TestVectorizer(unittest.TestCase):
     def setUp(self):
@@ -13,6 +16,19 @@ class TestVectorizer(unittest.TestCase):
         self.doc2 = ["add", "REG", "IMM"]
         self.documents = [self.doc1, self.doc2]
         
+    def test_unique_documents(self):
+        documents = [self.doc1, self.doc2, list(self.doc1), self.doc1]
+        unique, inverse = unique_documents(documents)
+
+        self.assertEqual(unique, self.documents)
+        self.assertEqual(inverse.tolist(), [0, 1, 0, 0])
+
+        vectorizer = tfidf.Tfidf().fit(self.documents)
+        X = vectorizer.transform(unique)[inverse]
+        self.assertAlmostEqual(
+            abs(X - vectorizer.transform(documents)).max(), 0.0
+        )
+
     def test_init(self):
         vectorizer = tfidf.Tfidf(max_features=100)
         self.assertFalse(vectorizer._fitted)
@@ -80,13 +96,395 @@ class TestVectorizer(unittest.TestCase):
         self.assertEqual(vectorizer.vectorizer, mock_loaded_vec)
         self.assertTrue(vectorizer._fitted)
 
+    def test_fit_stream_matches_list_fit(self):
+        documents = [
+            ["mov REG REG", "push REG", "call FUNC", "ret"],
+            ["mov REG MEM", "push REG", "ret"],
+            ["add REG IMM", "mov REG REG", "mov REG REG", "ret"],
+            ["jmp JMP", "push REG", "pop REG", "ret"],
+        ]
+
+        for kwargs in ({}, {"min_df": 2}, {"max_features": 3}, {"max_df": 0.5}):
+            with self.subTest(**kwargs):
+                expected = tfidf.Tfidf(**kwargs).fit(documents)
+                streamed = tfidf.Tfidf(**kwargs).fit(d for d in documents)
+
+                self.assertEqual(
+                    streamed.vectorizer.vocabulary_,
+                    expected.vectorizer.vocabulary_,
+                )
+                self.assertTrue(
+                    (streamed.vectorizer.idf_ == expected.vectorizer.idf_).all()
+                )
+
+                X = streamed.transform(d for d in documents)
+                self.assertAlmostEqual(
+                    abs(X - expected.transform(documents)).max(), 0.0
+                )
+
+    def test_fit_matches_sklearn(self):
+        documents = [
+            ["mov REG REG", "push REG", "call FUNC", "ret"],
+            ["mov REG MEM", "push REG", "ret"],
+            ["add REG IMM", "mov REG REG", "mov REG REG", "ret"],
+            ["jmp JMP", "push REG", "pop REG", "ret"],
+            ["push REG", "push REG", "call FUNC", "pop REG", "ret"],
+        ]
+
+        variants = (
+            {},
+            {"min_df": 2},
+            {"max_df": 0.5},
+            {"max_df": 3},
+            {"max_features": 4},
+            {"ngram_range": (1, 3), "min_df": 2, "max_features": 6},
+        )
+        for kwargs in variants:
+            reference = TfidfVectorizer(
+                tokenizer=tfidf.identity,
+                preprocessor=tfidf.identity,
+                token_pattern=None,
+                lowercase=False,
+                **{"ngram_range": (1, 2), **kwargs},
+            ).fit(documents)
+
+            fits = {
+                "list": tfidf.Tfidf(**kwargs).fit(documents),
+                "stream": tfidf.Tfidf(**kwargs).fit(d for d in documents),
+                "keep_stats": tfidf.Tfidf(keep_stats=True, **kwargs).fit(documents),
+                "partial_fit": tfidf.Tfidf(**kwargs).partial_fit(documents),
+            }
+            for name, model in fits.items():
+                with self.subTest(name, **kwargs):
+                    self.assertEqual(model.vectorizer.vocabulary_, reference.vocabulary_)
+                    self.assertTrue(np.allclose(model.vectorizer.idf_, reference.idf_))
+
+    def test_keep_stats(self):
+        self.assertIsNone(tfidf.Tfidf().fit(self.documents)._stats)
+        self.assertIsNone(tfidf.Tfidf().fit(iter(self.documents))._stats)
+
+        kept = tfidf.Tfidf(keep_stats=True).fit(self.documents)
+        self.assertEqual(kept._stats.n_documents, 2)
+
+    def test_fit_transform_two_pass(self):
+        class Corpus:
+            def __init__(self, docs):
+                self.docs = docs
+                self.passes = 0
+
+            def __iter__(self):
+                self.passes += 1
+                return iter(self.docs)
+
+        corpus = Corpus([self.doc1, self.doc2])
+        X = tfidf.Tfidf().fit_transform(corpus)
+
+        self.assertEqual(corpus.passes, 2)
+        self.assertEqual(X.shape[0], 2)
+
+        with self.assertRaises(TypeError):
+            tfidf.Tfidf().fit_transform(iter([self.doc1, self.doc2]))
+
+    def test_fit_stream_rejects_invalid_docs(self):
+        with self.assertRaises(TypeError):
+            tfidf.Tfidf().fit(d for d in ["invalid doc"])
+
+    def test_partial_fit_matches_full_fit(self):
+        documents = [
+            ["mov REG REG", "push REG", "call FUNC", "ret"],
+            ["mov REG MEM", "push REG", "ret"],
+            ["add REG IMM", "mov REG REG", "mov REG REG", "ret"],
+            ["jmp JMP", "push REG", "pop REG", "ret"],
+        ]
+
+        incremental = tfidf.Tfidf(min_df=2)
+        incremental.partial_fit(documents[:2])
+        incremental.partial_fit(documents[2:])
+
+        full = tfidf.Tfidf(min_df=2).fit(documents)
+
+        self.assertEqual(
+            incremental.vectorizer.vocabulary_, full.vectorizer.vocabulary_
+        )
+        self.assertTrue(
+            np.allclose(incremental.vectorizer.idf_, full.vectorizer.idf_)
+        )
+
+    def test_partial_fit_after_list_fit(self):
+        more = [["nop"], ["mov", "nop"]]
+
+        with self.assertRaisesRegex(ValueError, "keep_stats=True"):
+            tfidf.Tfidf().fit(self.documents).partial_fit(more)
+
+        incremental = tfidf.Tfidf(keep_stats=True).fit(self.documents)
+        incremental.partial_fit(more)
+        full = tfidf.Tfidf().fit(self.documents + more)
 
+        self.assertEqual(
+            incremental.vectorizer.vocabulary_, full.vectorizer.vocabulary_
+        )
+        self.assertTrue(
+            np.allclose(incremental.vectorizer.idf_, full.vectorizer.idf_)
+        )
+
+    def test_partial_fit_frozen_vocabulary(self):
+        vectorizer = tfidf.Tfidf().fit(self.documents)
+        features = vectorizer.features()
+        idf = vectorizer.vectorizer.idf_.copy()
+
+        with self.assertRaises(ValueError):
+            vectorizer.partial_fit([["nop"]], grow_vocabulary=False)
+
+        vectorizer.partial_fit([["nop"], ["mov", "nop"]], grow_vocabulary=False, n_documents=2)
+
+        self.assertEqual(vectorizer.features(), features)
+        self.assertEqual(vectorizer._stats.n_documents, 4)
+        self.assertEqual(vectorizer._stats.df["mov"], 2)
+        self.assertFalse(np.allclose(vectorizer.vectorizer.idf_, idf))
+
+        with self.assertRaises(ValueError):
+            vectorizer.partial_fit([["nop"]])
+
+    def test_partial_fit_stats_survive_save_load(self):
+        vectorizer = tfidf.Tfidf().partial_fit(self.documents)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.pkl")
+            vectorizer.save(path)
+
+            # The model file itself is a plain TfidfVectorizer
+            with open(path, "rb") as f:
+                self.assertEqual(vars(pickle.load(f)).keys(), vars(vectorizer.vectorizer).keys())
+
+            loaded = tfidf.Tfidf().load(path)
+            # Statistics are only read when needed
+            self.assertIsNone(loaded._stats)
+
+            loaded.partial_fit([["nop"]])
+            self.assertEqual(loaded._stats.n_documents, 3)
+            self.assertIn("nop", loaded.features())
+
+            # Saving a model without statistics drops the old sidecar
+            tfidf.Tfidf().fit(self.documents).save(path)
+            self.assertFalse(os.path.exists(path + tfidf.STATS_SUFFIX))
+
+    def test_encoded_corpus_matches_list(self):
+        documents = [
+            ["mov REG REG", "push REG", "call FUNC", "ret"],
+            ["mov REG MEM", "push REG", "ret"],
+            [],
+            ["add REG IMM", "mov REG REG", "mov REG REG", "ret"],
+            ["jmp JMP", "push REG", "pop REG", "ret"],
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            corpus = EncodedCorpus.write(os.path.join(tmp, "corpus"), documents)
+
+            for kwargs in ({}, {"ngram_range": (1, 3)}, {"min_df": 2}, {"max_features": 4}):
+                # Small blocks exercise n-grams across block boundaries
+                for block in (1 << 22, 3):
+                    with self.subTest(block=block, **kwargs), \
+                         patch("disasm2vec.vectorizer.encoded._BLOCK_TOKENS", block):
+                        expected = tfidf.Tfidf(**kwargs).fit(documents)
+                        encoded = tfidf.Tfidf(**kwargs).fit(corpus)
+
+                        self.assertEqual(encoded.features(), expected.features())
+                        self.assertTrue(np.allclose(
+                            encoded.vectorizer.idf_, expected.vectorizer.idf_
+                        ))
+                        self.assertAlmostEqual(
+                            abs(encoded.transform(corpus) - expected.transform(documents)).max(),
+                            0.0,
+                        )
+
+    def test_native_save_load(self):
+        vectorizer = tfidf.Tfidf(max_features=5, ngram_range=(1, 3))
+        X = vectorizer.fit_transform(self.documents)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model")
+            metadata = {"note": "test", "dataset": {"num_documents": 2}}
+            vectorizer.save(path, format="native", metadata=metadata)
+
+            with open(os.path.join(path, "vocabulary.txt")) as f:
+                self.assertEqual(f.read().split("\n"), vectorizer.features())
+
+            loaded = load_vectorizer(path)
+
+            self.assertIsInstance(loaded, tfidf.Tfidf)
+            self.assertIsInstance(loaded.vectorizer.idf_, np.memmap)
+            self.assertEqual(loaded.vectorizer.ngram_range, (1, 3))
+            self.assertEqual(loaded.metadata["note"], "test")
+            self.assertEqual(loaded.features(), vectorizer.features())
+            self.assertAlmostEqual(
+                abs(loaded.transform(self.documents) - X).max(), 0.0
+            )
+
+            # n_documents comes from meta.json
+            loaded.partial_fit([["nop"]], grow_vocabulary=False)
+            self.assertEqual(loaded._stats.n_documents, 3)
+
+    def test_save_unknown_format(self):
+        vectorizer = tfidf.Tfidf().fit(self.documents)
+        with self.assertRaises(ValueError):
+            vectorizer.save("model", format="zip")
+
+
+class TestHashingVectorizer(unittest.TestCase):
+    def setUp(self):
+        self.documents = [
+            ["mov REG REG", "push REG", "call FUNC", "ret"],
+            ["mov REG MEM", "push REG", "ret"],
+            ["add REG IMM", "mov REG REG", "mov REG REG", "ret"],
+            ["jmp JMP", "push REG", "pop REG", "ret"],
+        ]
+
+    def test_matches_tfidf_similarities(self):
+        X = hashing.HashingTfidf().fit_transform(self.documents)
+        Y = tfidf.Tfidf().fit_transform(self.documents)
+
+        self.assertEqual(X.shape[1], 2 ** 20)
+        self.assertAlmostEqual(abs((X @ X.T) - (Y @ Y.T)).max(), 0.0)
+
+    def test_partial_fit_equals_fit(self):
+        full = hashing.HashingTfidf(n_features=2 ** 12).fit(self.documents)
+
+        partial = hashing.HashingTfidf(n_features=2 ** 12)
+        partial.partial_fit(self.documents[:1])
+        partial.partial_fit(d for d in self.documents[1:])
+
+        self.assertEqual(partial.n_documents, 4)
+        self.assertTrue((partial.df == full.df).all())
+        self.assertAlmostEqual(
+            abs(partial.transform(self.documents) - full.transform(self.documents)).max(),
+            0.0,
+        )
+
+    def test_stateless_without_idf(self):
+        vectorizer = hashing.HashingTfidf(n_features=2 ** 10, use_idf=False)
+        X = vectorizer.transform_one(self.documents[0])
+        self.assertEqual(X.shape, (1, 2 ** 10))
+
+        with self.assertRaises(RuntimeError):
+            hashing.HashingTfidf().transform(self.documents)
+
+    def test_save_load(self):
+        vectorizer = hashing.HashingTfidf(n_features=2 ** 10, ngram_range=(1, 3))
+        vectorizer.fit(self.documents)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "hashing.pkl")
+            vectorizer.save(path)
+            loaded = load_vectorizer(path, "hashing")
+
+        self.assertIsInstance(loaded, hashing.HashingTfidf)
+        self.assertEqual(loaded.ngram_range, (1, 3))
+        self.assertEqual(loaded.n_documents, 4)
+        self.assertAlmostEqual(
+            abs(loaded.transform(self.documents) - vectorizer.transform(self.documents)).max(),
+            0.0,
+        )
+
+    def test_unsmoothed_idf_of_unseen_columns_is_finite(self):
+        vectorizer = hashing.HashingTfidf(n_features=2 ** 10, smooth_idf=False)
+        vectorizer.fit(self.documents)
+
+        self.assertTrue(np.isfinite(vectorizer.idf()).all())
+        X = vectorizer.transform([["xor REG REG", "ret"]])
+        self.assertTrue(np.isfinite(X.data).all())
+
+        # Seen columns keep the usual unsmoothed IDF.
+        column = vectorizer.vectorizer.transform([["ret"]]).indices[0]
+        self.assertAlmostEqual(vectorizer.idf()[column], 1.0)
+
+    def test_empty_batches_and_one_shot_iterators(self):
+        vectorizer = hashing.HashingTfidf(n_features=2 ** 10)
+
+        with self.assertRaisesRegex(TypeError, "one-shot iterator"):
+            vectorizer.fit_transform(iter(self.documents))
+
+        with self.assertRaisesRegex(ValueError, "empty corpus"):
+            vectorizer.fit([])
+        self.assertFalse(vectorizer._fitted)
+
+        vectorizer.fit(self.documents)
+        vectorizer.partial_fit([])
+        self.assertEqual(vectorizer.n_documents, 4)
+
+        X = vectorizer.transform([])
+        self.assertEqual(X.shape, (0, 2 ** 10))
+
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "model.pkl")
+        tfidf.Tfidf().fit([["mov REG REG", "ret"], ["push REG"]]).save(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_get_caches_model(self):
+        reg = registry.ModelRegistry()
+
+        first = reg.get(self.path)
+        self.assertIs(reg.get(self.path), first)
+        self.assertEqual(reg.stats().hits, 1)
+        self.assertEqual(reg.stats().misses, 1)
+
+    def test_reload_on_change(self):
+        reg = registry.ModelRegistry()
+        first = reg.get(self.path)
+
+        tfidf.Tfidf().fit([["nop"]]).save(self.path)
+        os.utime(self.path, ns=(0, 0))
+
+        second = reg.get(self.path)
+        self.assertIsNot(second, first)
+        self.assertEqual(second.features(), ["nop"])
+        self.assertEqual(len(reg), 1)
+
+    def test_invalidate_and_preload(self):
+        reg = registry.ModelRegistry()
+        reg.preload([self.path])
+        self.assertEqual(len(reg), 1)
+
+        reg.invalidate(self.path)
+        self.assertEqual(len(reg), 0)
+
+        reg.get(self.path)
+        self.assertEqual(reg.stats().misses, 2)
+
+    def test_lru_eviction(self):
+        reg = registry.ModelRegistry(max_models=1)
+        other = os.path.join(self.tmp.name, "other.pkl")
+        tfidf.Tfidf().fit([["nop"]]).save(other)
+
+        reg.get(self.path)
+        reg.get(other)
+
+        self.assertEqual(len(reg), 1)
+        self.assertEqual(reg.stats().evictions, 1)
+
+
+@patch("disasm2vec.vectorizer.registry._model_key", lambda path, t: (path, t))
 class TestVectorizerFactory(unittest.TestCase):
+    def setUp(self):
+        registry.get_model_registry().invalidate()
+
+    def tearDown(self):
+        registry.get_model_registry().invalidate()
+
     def test_get_vectorizer_tfidf(self):
         vectorizer = get_vectorizer("tfidf", max_features=100)
         self.assertIsInstance(vectorizer, tfidf.Tfidf)
         self.assertEqual(vectorizer.vectorizer.max_features, 100)
 
+    def test_get_vectorizer_hashing(self):
+        vectorizer = get_vectorizer("hashing", n_features=256)
+        self.assertIsInstance(vectorizer, hashing.HashingTfidf)
+        self.assertEqual(vectorizer.n_features, 256)
+
     def test_get_vectorizer_unknown(self):
         with self.assertRaises(ValueError):
             get_vectorizer("unknown")
@@ -96,10 +494,19 @@ class TestVectorizerFactory(unittest.TestCase):
         mock_instance = MagicMock()
         mock_load.return_value = mock_instance
         
-        result = load_vectorizer("model.pkl", "tfidf")
+        result = load_vectorizer("model.pkl", "tfidf", cached=True)
         
         mock_load.assert_called_once_with("model.pkl")
-        self.assertEqual(result, mock_instance)
+        self.assertIsInstance(result, tfidf.Tfidf)
+
+        # Served from the registry the second time
+        self.assertIs(load_vectorizer("model.pkl", "tfidf", cached=True), result)
+        mock_load.assert_called_once()
+
+        # A private copy by default
+        private = load_vectorizer("model.pkl", "tfidf")
+        self.assertIsNot(private, result)
+        self.assertEqual(mock_load.call_count, 2)
 
     @patch("disasm2vec.vectorizer.tfidf.Tfidf.load")
     def test_load_vectorizer_default_path(self, mock_load):
@@ -109,7 +516,7 @@ class TestVectorizerFactory(unittest.TestCase):
         result = load_vectorizer(model_type="tfidf")
         
         mock_load.assert_called_once_with(DEFAULT_MODEL_PATH)
-        self.assertEqual(result, mock_instance)
+        self.assertIsInstance(result, tfidf.Tfidf)
 
     def test_load_vectorizer_unknown(self):
         with self.assertRaises(ValueError):